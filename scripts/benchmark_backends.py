@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Parité et débit des backends d'inférence CPU (torch, torch-int8, onnx)
+Chaque backend traite les dossiers du gold standard ; les métriques de evaluate_ner
+et le recouvrement des entités avec torch fp32 indiquent si un backend rapide est sûr
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+from evaluate_ner import NEREvaluator
+from inference_backends import BACKENDS, load_backend
+from run_ner_pipeline import (
+    DEFAULT_MODEL_PATH,
+    PROJECT_ROOT,
+    DATA_DIR,
+    DEFAULT_BATCH_SIZE,
+    load_gold_folders,
+    prepare_document,
+    process_folder,
+    filter_results,
+    deduplicate_results,
+)
+
+
+def entity_keys(results):
+    """Entités dédupliquées comparables d'un backend à l'autre"""
+    return {(r['Folder'], r['Document'], r['Type'], r['Entity'].lower().strip()) for r in results}
+
+
+def run_backend(model_path, backend, folders, batch_size, gold_standard_path):
+    """Charge un backend, traite les dossiers et évalue le résultat"""
+    start = time.perf_counter()
+    model = load_backend(model_path, backend)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = []
+    for folder_path in folders:
+        results.extend(process_folder(folder_path, model, verbose=False, batch_size=batch_size))
+    elapsed = time.perf_counter() - start
+
+    deduplicated = deduplicate_results(filter_results(results))
+    evaluator = NEREvaluator(gold_standard_path, predictions=deduplicated)
+    evaluator.load_data()
+
+    return {
+        'Backend': backend,
+        'Load': load_time,
+        'Seconds': elapsed,
+        'Metrics': evaluator.evaluate(),
+        'Entities': entity_keys(deduplicated),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare GLiNER CPU backends on the gold folders (metrics parity and throughput)'
+    )
+
+    parser.add_argument('--model', type=Path, default=Path(DEFAULT_MODEL_PATH),
+                        help='Path to GLiNER model')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR,
+                        help='Path to data directory containing OCR results')
+    parser.add_argument('--gold', type=Path, default=PROJECT_ROOT / "data" / "gold_standard_annotations.txt",
+                        help='Path to gold standard annotations file')
+    parser.add_argument('--backends', type=str, default=','.join(BACKENDS),
+                        help='Comma-separated backends, the first one is the reference')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Number of chunks per model call')
+
+    args = parser.parse_args()
+
+    if not args.model.exists():
+        print(f"Error: Model not found: {args.model}")
+        sys.exit(1)
+
+    if not args.gold.exists():
+        print(f"Error: Gold standard file not found: {args.gold}")
+        sys.exit(1)
+
+    folders = sorted(load_gold_folders(args.gold, args.data_dir))
+    if not folders:
+        print(f"Error: No gold standard folders found in: {args.data_dir}")
+        sys.exit(1)
+
+    n_chunks = sum(len(prepare_document(md_file)[1])
+                   for folder_path in folders for md_file in folder_path.glob("*.md"))
+
+    runs = []
+    for backend in args.backends.split(','):
+        print(f"\nBackend: {backend}")
+        runs.append(run_backend(args.model, backend, folders, args.batch_size, args.gold))
+
+    reference = runs[0]
+    print("\n" + "=" * 100)
+    print(f"BACKEND PARITY ({len(folders)} gold folders, {n_chunks} chunks, batch size {args.batch_size})")
+    print("=" * 100)
+    print(f"{'Backend':<12} {'Load (s)':>9} {'Time (s)':>9} {'Chunks/s':>9} {'Speedup':>8} "
+          f"{'P':>7} {'R':>7} {'F1':>7} {'dF1':>7} {'Overlap':>8}")
+    print("-" * 100)
+
+    for run in runs:
+        m = run['Metrics']['OVERALL']
+        f1_ref = reference['Metrics']['OVERALL'].f1
+        union = run['Entities'] | reference['Entities']
+        overlap = len(run['Entities'] & reference['Entities']) / len(union) if union else 1.0
+        print(f"{run['Backend']:<12} {run['Load']:>9.1f} {run['Seconds']:>9.1f} "
+              f"{n_chunks / run['Seconds']:>9.2f} {reference['Seconds'] / run['Seconds']:>7.2f}x "
+              f"{m.precision:>7.3f} {m.recall:>7.3f} {m.f1:>7.3f} {m.f1 - f1_ref:>+7.3f} {overlap:>8.1%}")
+
+    print("-" * 100)
+    print(f"Overlap: Jaccard of deduplicated entities with {reference['Backend']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la déduplication des résultats NER (10^5 à 10^7 lignes)
+Compare l'ancienne implémentation (dict de listes + max par groupe), la version colonne
+(factorize + lexsort) et la version par blocs lue depuis le disque ; vérifie que les lignes
+gardées sont identiques.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import resource
+from pathlib import Path
+from collections import defaultdict
+
+import numpy as np
+
+from results_dataset import ResultsWriter, read_results
+from run_ner_pipeline import ENTITY_TYPES, filter_results, deduplicate_results, deduplicate_dataset
+
+
+def deduplicate_results_dict(results):
+    """Implémentation de référence (avant vectorisation)"""
+    groups = defaultdict(list)
+    for result in results:
+        key = (result['Folder'], result['Document'], result['Type'], result['Entity'].lower().strip())
+        groups[key].append(result)
+    return [max(group, key=lambda x: x['Score']) for group in groups.values()]
+
+
+def synthetic_results(n_rows, seed=0, chunk_rows=1_000_000):
+    """
+    Prédictions brutes synthétiques par blocs : ~40 mentions par document, entités tirées
+    d'un vocabulaire selon une loi de Zipf (répétitions et variantes de casse comme l'OCR)
+    Yields: listes de dicts (Folder, Document, Entity, Type, Score)
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"Entity {i}" for i in range(max(1000, n_rows // 50))], dtype=object)
+    n_documents = max(1, n_rows // 40)
+
+    for start in range(0, n_rows, chunk_rows):
+        size = min(chunk_rows, n_rows - start)
+        documents = np.sort(rng.integers(0, n_documents, size))
+        entities = vocabulary[np.minimum(rng.zipf(1.3, size) - 1, len(vocabulary) - 1)]
+        variants = rng.random(size)
+        types = rng.integers(0, len(ENTITY_TYPES), size)
+        scores = rng.uniform(0.35, 1.0, size)
+
+        chunk = []
+        for document, entity, variant, label_id, score in zip(documents, entities, variants, types, scores):
+            if variant < 0.1:
+                entity = entity.upper()
+            elif variant < 0.2:
+                entity = f" {entity}"
+            chunk.append({'Folder': f"F{document // 20:05d}", 'Document': f"doc{document:07d}",
+                          'Entity': entity, 'Type': ENTITY_TYPES[label_id], 'Score': float(score)})
+        yield chunk
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark dict-based vs columnar vs chunked (from disk) deduplication of NER results'
+    )
+
+    parser.add_argument('--rows', type=str, default='100000,1000000,10000000',
+                        help='Comma-separated numbers of raw result rows')
+    parser.add_argument('--max-in-memory', type=int, default=1_000_000,
+                        help='Above this many rows, only the chunked version runs (the others '
+                             'need all rows as Python dicts in memory)')
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000,
+                        help='Rows per block for the chunked version')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed')
+
+    args = parser.parse_args()
+
+    print(f"{'Rows':>10} {'Method':<28} {'Time (s)':>9} {'Rows/s':>11} {'Kept':>10} {'Same':>5}")
+    print("-" * 78)
+
+    mismatches = 0
+    for n_rows in [int(float(n)) for n in args.rows.split(',')]:
+        with tempfile.TemporaryDirectory() as tmp:
+            results_path = Path(tmp) / "ner_results.jsonl"
+            with ResultsWriter(results_path) as writer:
+                for chunk in synthetic_results(n_rows, args.seed):
+                    writer.write(chunk)
+
+            reference = None
+            timings = []
+            if n_rows <= args.max_in_memory:
+                filtered, seconds = timed(lambda: filter_results(read_results(results_path)))
+                timings.append(('read + filter_results', seconds, None))
+                reference, seconds = timed(deduplicate_results_dict, filtered)
+                timings.append(('dict + max (reference)', seconds, reference))
+                kept, seconds = timed(deduplicate_results, filtered)
+                timings.append(('columnar', seconds, kept))
+                del filtered
+
+            streamed, seconds = timed(deduplicate_dataset, results_path, None, args.chunk_rows)
+            timings.append(('chunked from disk (+ read)', seconds, streamed))
+
+            for method, seconds, kept in timings:
+                if kept is None:
+                    print(f"{n_rows:>10} {method:<28} {seconds:>9.2f} {n_rows / seconds:>11.0f}")
+                    continue
+                same = '-' if reference is None else ('yes' if kept == reference else 'NO')
+                mismatches += same == 'NO'
+                print(f"{n_rows:>10} {method:<28} {seconds:>9.2f} {n_rows / seconds:>11.0f} "
+                      f"{len(kept):>10} {same:>5}")
+
+    print("-" * 78)
+    print(f"Peak RSS: {peak_rss_mb():.0f} MB")
+
+    if mismatches:
+        print("Error: Deduplicated rows differ from the reference implementation")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark d'écriture du rapport Excel (create_excel_report)
+Temps et pic mémoire Python (tracemalloc) de xlsxwriter en mode constant_memory et d'openpyxl,
+sur des résultats dédupliqués synthétiques ; vérifie que les 3 sheets relues sont identiques.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import io
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from pathlib import Path
+
+import pandas as pd
+
+from benchmark_dedup import synthetic_results
+from excel_writer import EXCEL_ENGINES
+from run_ner_pipeline import filter_results, deduplicate_results, create_excel_report
+
+
+def report_rows(n_rows, seed=0):
+    """Environ n_rows lignes dédupliquées (prédictions synthétiques filtrées puis dédupliquées)"""
+    rows = []
+    raw_rows = n_rows * 4
+    while len(rows) < n_rows:
+        rows = deduplicate_results(filter_results(
+            [result for chunk in synthetic_results(raw_rows, seed) for result in chunk]))
+        raw_rows *= 2
+    return rows[:n_rows]
+
+
+def write_report(results, output_path, engine, measure_memory=False):
+    """Écrit le rapport, renvoie (secondes, pic mémoire Python en Mo ou None)"""
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_excel_report(results, output_path, engine)
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Excel report writers (xlsxwriter constant_memory vs openpyxl)'
+    )
+
+    parser.add_argument('--rows', type=str, default='100000',
+                        help='Comma-separated numbers of deduplicated report rows')
+    parser.add_argument('--engines', type=str, default=','.join(EXCEL_ENGINES),
+                        help='Comma-separated Excel engines')
+    parser.add_argument('--memory', action='store_true',
+                        help='Also measure the peak Python memory (second run under tracemalloc)')
+    parser.add_argument('--no-check', action='store_true',
+                        help='Do not read the workbooks back to compare the sheets')
+
+    args = parser.parse_args()
+    engines = args.engines.split(',')
+
+    print(f"{'Rows':>9} {'Engine':<11} {'Write (s)':>10} {'Rows/s':>9} {'Peak MB':>8} {'File MB':>8}")
+    print("-" * 60)
+
+    mismatches = 0
+    for n_rows in [int(float(n)) for n in args.rows.split(',')]:
+        results = report_rows(n_rows)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            sheets = {}
+            for engine in engines:
+                output_path = Path(tmp) / f"report_{engine}.xlsx"
+                seconds, _ = write_report(results, output_path, engine)
+                peak = write_report(results, output_path, engine, True)[1] if args.memory else None
+
+                peak_text = f"{peak:>8.0f}" if peak is not None else f"{'-':>8}"
+                print(f"{len(results):>9} {engine:<11} {seconds:>10.2f} {len(results) / seconds:>9.0f} "
+                      f"{peak_text} {output_path.stat().st_size / 1024 / 1024:>8.1f}")
+
+                if not args.no_check:
+                    sheets[engine] = pd.read_excel(output_path, sheet_name=None)
+
+            if len(sheets) > 1:
+                reference, *others = sheets.values()
+                for other in others:
+                    if reference.keys() != other.keys() or not all(reference[name].equals(other[name])
+                                                                   for name in reference):
+                        mismatches += 1
+
+    if mismatches:
+        print("Error: The engines wrote different sheets")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
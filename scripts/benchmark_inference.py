@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark d'inférence GLiNER
+Compare le débit (chunks/s) de l'inférence chunk par chunk et de l'inférence batch
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from gliner import GLiNER
+
+from run_ner_pipeline import (
+    DEFAULT_MODEL_PATH,
+    DATA_DIR,
+    prepare_document,
+    predict_chunks,
+)
+
+
+def collect_chunks(data_dir, max_chunks):
+    """Collecte des chunks réels depuis le corpus OCR"""
+    chunks = []
+    for md_file in sorted(data_dir.glob("*/*.md")):
+        _, doc_chunks, _ = prepare_document(md_file)
+        chunks.extend(doc_chunks)
+        if len(chunks) >= max_chunks:
+            break
+    return chunks[:max_chunks]
+
+
+def benchmark(model, chunks, batch_size, repeat=1):
+    """Mesure le débit en chunks/s pour une taille de batch donnée"""
+    # Warmup
+    predict_chunks(model, chunks[:min(len(chunks), max(batch_size, 1))], batch_size)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        predict_chunks(model, chunks, batch_size)
+    elapsed = time.perf_counter() - start
+
+    return len(chunks) * repeat / elapsed, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark per-chunk vs batched GLiNER inference on CPU'
+    )
+
+    parser.add_argument('--model', type=Path, default=Path(DEFAULT_MODEL_PATH),
+                        help='Path to GLiNER model')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR,
+                        help='Path to data directory containing OCR results')
+    parser.add_argument('--chunks', type=int, default=64,
+                        help='Number of corpus chunks to benchmark')
+    parser.add_argument('--batch-sizes', type=str, default='1,4,8,16,32',
+                        help='Comma-separated batch sizes (1 = per-chunk loop)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Number of timed repetitions')
+
+    args = parser.parse_args()
+
+    if not args.model.exists():
+        print(f"Error: Model not found: {args.model}")
+        sys.exit(1)
+
+    chunks = collect_chunks(args.data_dir, args.chunks)
+    if not chunks:
+        print(f"Error: No chunks found in: {args.data_dir}")
+        sys.exit(1)
+
+    print(f"Loading GLiNER model from: {args.model}")
+    model = GLiNER.from_pretrained(str(args.model))
+    model.to('cpu')
+
+    batch_sizes = [int(b) for b in args.batch_sizes.split(',')]
+
+    print(f"\nBenchmark on {len(chunks)} chunks (CPU)\n")
+    print(f"{'Batch size':>10} {'Time (s)':>10} {'Chunks/s':>10} {'Speedup':>10}")
+    print("-" * 44)
+
+    baseline = None
+    for batch_size in batch_sizes:
+        rate, elapsed = benchmark(model, chunks, batch_size, args.repeat)
+        if baseline is None:
+            baseline = rate
+        print(f"{batch_size:>10} {elapsed:>10.2f} {rate:>10.2f} {rate / baseline:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark du partage des poids GLiNER entre workers
+Compare GLiNER.from_pretrained par processus et les poids mappés (mmap safetensors) :
+temps de démarrage de N workers et mémoire totale (RSS, pic au chargement, pic, PSS, USS)
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+from pathlib import Path
+
+from inference_backends import load_backend
+from shared_weights import ensure_mmap_weights, memory_usage_mb
+from run_ner_pipeline import DEFAULT_MODEL_PATH, LABELS, INFERENCE_THRESHOLD
+
+
+PROBE_TEXT = "The League of Nations met in Geneva with Edmond Privat."
+
+# Modèle du processus de benchmark
+_share_state = {}
+
+
+def init_share_worker(model_path, mmap_weights, barrier):
+    import torch
+
+    torch.set_num_threads(1)
+    _share_state['model'] = load_backend(model_path, mmap_weights=mmap_weights)
+    # Pic de RSS du chargement seul : la prédiction suivante charge ensuite les poids mappés
+    _share_state['load_peak'] = memory_usage_mb()['peak']
+    _share_state['barrier'] = barrier
+
+
+def probe_task(_):
+    """Une prédiction, puis attente des autres workers (une tâche par worker)"""
+    _share_state['model'].predict_entities(PROBE_TEXT, LABELS, threshold=INFERENCE_THRESHOLD)
+    _share_state['barrier'].wait()
+    return os.getpid(), dict(memory_usage_mb(), load_peak=_share_state['load_peak'])
+
+
+def run_mode(model_path, workers, mmap_weights):
+    """Démarre le pool, attend que chaque worker ait chargé le modèle et prédit une fois"""
+    ctx = multiprocessing.get_context('spawn')
+    barrier = ctx.Barrier(workers)
+
+    start = time.perf_counter()
+    with ctx.Pool(workers, initializer=init_share_worker,
+                  initargs=(model_path, mmap_weights, barrier)) as pool:
+        usages = pool.map(probe_task, range(workers), chunksize=1)
+        elapsed = time.perf_counter() - start
+
+    if len({pid for pid, _ in usages}) != workers:
+        print("Warning: a worker answered twice, memory totals are incomplete")
+
+    totals = {key: sum(usage[key] for _, usage in usages)
+              for key in ('rss', 'load_peak', 'peak', 'pss', 'uss')}
+    return elapsed, totals
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare worker startup time and memory with per-process '
+                    'GLiNER.from_pretrained vs memory-mapped shared weights'
+    )
+
+    parser.add_argument('--model', type=Path, default=Path(DEFAULT_MODEL_PATH),
+                        help='Path to GLiNER model')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Number of worker processes')
+
+    args = parser.parse_args()
+
+    if not args.model.exists():
+        print(f"Error: Model not found: {args.model}")
+        sys.exit(1)
+
+    if memory_usage_mb() is None:
+        print("Error: /proc/self/smaps_rollup is not available (Linux only)")
+        sys.exit(1)
+
+    # Export safetensors hors mesure (fait une seule fois par checkpoint)
+    weights_path = ensure_mmap_weights(args.model)
+    weights_mb = weights_path.stat().st_size / 1024 / 1024
+
+    print(f"\n{args.workers} workers, weights file {weights_mb:.1f} MB\n")
+    print(f"{'Loading':<16} {'Startup (s)':>12} {'RSS (MB)':>10} {'Load peak (MB)':>15} {'Peak (MB)':>10} "
+          f"{'PSS (MB)':>10} {'USS (MB)':>10}")
+    print("-" * 89)
+
+    for name, mmap_weights in (('from_pretrained', False), ('mmap', True)):
+        elapsed, totals = run_mode(args.model, args.workers, mmap_weights)
+        print(f"{name:<16} {elapsed:>12.2f} {totals['rss']:>10.1f} {totals['load_peak']:>15.1f} "
+              f"{totals['peak']:>10.1f} {totals['pss']:>10.1f} {totals['uss']:>10.1f}")
+
+    print("-" * 89)
+    print("RSS counts shared pages once per worker; Load peak is the highest RSS of each worker right "
+          "after loading the model; Peak also includes one prediction; PSS splits shared pages between "
+          "workers; USS is private memory only")
+
+
+if __name__ == '__main__':
+    main()
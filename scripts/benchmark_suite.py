@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmarks hors modèle sur corpus synthétique (régressions de performance)
+Mesure les étapes de run_ner_pipeline.py (avec le modèle factice), validate_ner_quality.py
+et enrich_all_persons.py (règles seules) à plusieurs échelles du corpus, sans checkpoint
+GLiNER ni corpus privé
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+
+import pandas as pd
+
+from synthetic_corpus import ENTITY_FILES, StubModel, generate_corpus, CORPUS_SUBDIR
+from run_ner_pipeline import (
+    DEFAULT_BATCH_SIZE,
+    prepare_document,
+    process_folder,
+    filter_results,
+    deduplicate_results,
+    create_excel_report,
+)
+
+
+class Timer:
+    """Temps de chaque étape, dans l'ordre d'exécution"""
+
+    def __init__(self):
+        self.timings = []
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        yield
+        self.timings.append((name, time.perf_counter() - start))
+
+
+def bench_pipeline(timer, corpus_dir, work_dir, batch_size):
+    """Étapes de run_ner_pipeline.py ; le temps passé dans le modèle factice est retiré"""
+    folders = sorted(f for f in corpus_dir.iterdir() if f.is_dir())
+
+    with timer.measure('pipeline: read + clean + chunk'):
+        for md_file in sorted(corpus_dir.glob("*/*.md")):
+            prepare_document(md_file)
+
+    model = StubModel()
+    start = time.perf_counter()
+    results = []
+    for folder_path in folders:
+        results.extend(process_folder(folder_path, model, verbose=False, batch_size=batch_size))
+    timer.timings.append(('pipeline: process_folder (excl. model)',
+                          time.perf_counter() - start - model.seconds))
+
+    with timer.measure('pipeline: filter_results'):
+        filtered = filter_results(results)
+
+    with timer.measure('pipeline: deduplicate_results'):
+        deduplicated = deduplicate_results(filtered)
+
+    with timer.measure('pipeline: create_excel_report'), contextlib.redirect_stdout(io.StringIO()):
+        create_excel_report(deduplicated, work_dir / "ner_results_benchmark.xlsx")
+
+
+def bench_validation(timer, corpus_dir, project_dir):
+    """Étapes de validate_ner_quality.py (échantillonnage stratifié, 5 validations par entité)"""
+    import validate_ner_quality as vnq
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with timer.measure('validate: load_corpus'):
+            corpus = vnq.load_corpus(corpus_dir)
+
+        with timer.measure('validate: load_entities + sample'):
+            samples = pd.concat([
+                vnq.stratified_sample(vnq.load_entities(project_dir / path, entity_type),
+                                      vnq.SAMPLE_SIZE, vnq.RANDOM_SEED)
+                for entity_type, path in ENTITY_FILES.items()
+            ], ignore_index=True)
+
+        with timer.measure('validate: validate_entity'):
+            validation_results = [vnq.validate_entity(row, corpus) for _, row in samples.iterrows()]
+
+        with timer.measure('validate: compute_metrics'):
+            vnq.compute_metrics(validation_results)
+
+
+def bench_enrichment(timer, corpus_dir, project_dir, max_persons=None):
+    """
+    Étapes de enrich_all_persons.py, extraction par règles seule (sans appel au LLM)
+    max_persons : échantillon fixe de personnes (le coût par personne croît avec le corpus)
+    """
+    try:
+        import enrich_all_persons as eap
+    except ImportError as e:
+        print(f"Warning: Skipping enrich_all_persons benchmark ({e})")
+        return
+
+    eap.CORPUS_DIR = str(corpus_dir)
+    eap.DOCUMENT_CACHE.clear()
+
+    df_person = pd.read_excel(project_dir / ENTITY_FILES['PERSON'])
+    if max_persons and max_persons < len(df_person):
+        df_person = df_person.sample(n=max_persons, random_state=0)
+    with timer.measure('enrich: build_index'):
+        org_index = eap.build_index(pd.read_excel(project_dir / ENTITY_FILES['ORGANIZATION']))
+        gpe_index = eap.build_index(pd.read_excel(project_dir / ENTITY_FILES['GPE']))
+
+    with timer.measure(f"enrich: enrich_person (rules, {len(df_person)} persons)"):
+        for _, row in df_person.iterrows():
+            eap.enrich_person(row, org_index, gpe_index, use_llm=False)
+
+
+def corpus_for_scale(work_dir, scale, seed):
+    """Corpus synthétique de l'échelle demandée, généré une seule fois dans work_dir"""
+    project_dir = work_dir / f"scale_{scale:g}"
+    corpus_dir = project_dir / CORPUS_SUBDIR
+    if not all((project_dir / path).exists() for path in ENTITY_FILES.values()):
+        start = time.perf_counter()
+        generate_corpus(project_dir, scale, seed)
+        print(f"Generated scale {scale:g} corpus in {time.perf_counter() - start:.1f}s: {corpus_dir}")
+    return project_dir, corpus_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the non-model parts of the NER pipeline, validation and enrichment '
+                    'scripts on a synthetic corpus with a deterministic stub model'
+    )
+
+    parser.add_argument('--scales', type=str, default='1,10',
+                        help='Comma-separated corpus scales (1 = 666 documents)')
+    parser.add_argument('--benchmarks', type=str, default='pipeline,validate,enrich',
+                        help='Comma-separated benchmarks to run')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Number of chunks per (stub) model call')
+    parser.add_argument('--enrich-persons', type=int, default=20,
+                        help='Number of persons enriched by the enrich benchmark (0 = all)')
+    parser.add_argument('--work-dir', type=Path,
+                        help='Keep the generated corpora here and reuse them across runs '
+                             '(default: temporary directory)')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Synthetic corpus seed')
+    parser.add_argument('--json', type=Path,
+                        help='Write the timings to this JSON file')
+    parser.add_argument('--baseline', type=Path,
+                        help='Previous --json output to compare against')
+
+    args = parser.parse_args()
+
+    benchmarks = {
+        'pipeline': lambda timer, corpus_dir, project_dir: bench_pipeline(timer, corpus_dir, project_dir,
+                                                                          args.batch_size),
+        'validate': bench_validation,
+        'enrich': lambda timer, corpus_dir, project_dir: bench_enrichment(timer, corpus_dir, project_dir,
+                                                                          args.enrich_persons or None),
+    }
+    selected = args.benchmarks.split(',')
+    unknown = [name for name in selected if name not in benchmarks]
+    if unknown:
+        print(f"Error: Unknown benchmarks: {', '.join(unknown)} (choose from {', '.join(benchmarks)})")
+        sys.exit(1)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = {(run['scale'], run['benchmark']): run['seconds'] for run in json.load(f)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = args.work_dir or Path(tmp)
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        runs = []
+        for scale in [float(s) for s in args.scales.split(',')]:
+            project_dir, corpus_dir = corpus_for_scale(work_dir, scale, args.seed)
+            n_docs = sum(1 for _ in corpus_dir.glob("*/*.md"))
+
+            timer = Timer()
+            for name in selected:
+                benchmarks[name](timer, corpus_dir, project_dir)
+
+            runs.extend({'scale': scale, 'documents': n_docs, 'benchmark': name, 'seconds': seconds}
+                        for name, seconds in timer.timings)
+
+    print("\n" + "=" * 88)
+    print("BENCHMARK SUITE (synthetic corpus, stub model)")
+    print("=" * 88)
+    print(f"{'Scale':>6} {'Docs':>7} {'Benchmark':<42} {'Time (s)':>9} {'Docs/s':>9} {'vs base':>8}")
+    print("-" * 88)
+    for run in runs:
+        reference = baseline.get((run['scale'], run['benchmark']))
+        ratio = f"{run['seconds'] / reference:>7.2f}x" if reference else f"{'-':>8}"
+        rate = run['documents'] / run['seconds'] if run['seconds'] > 0 else float('inf')
+        print(f"{run['scale']:>6g} {run['documents']:>7} {run['benchmark']:<42} {run['seconds']:>9.3f} "
+              f"{rate:>9.0f} {ratio}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(runs, f, indent=2)
+        print(f"\nTimings saved: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark de scalabilité multi-processus du pipeline NER
+Mesure le débit (documents/s) pour 1/2/4/8 workers sur les mêmes dossiers
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+from run_ner_pipeline import (
+    DEFAULT_MODEL_PATH,
+    DATA_DIR,
+    DEFAULT_BATCH_SIZE,
+    process_corpus_parallel,
+    threads_per_worker,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark NER pipeline scaling with the number of worker processes'
+    )
+
+    parser.add_argument('--model', type=Path, default=Path(DEFAULT_MODEL_PATH),
+                        help='Path to GLiNER model')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR,
+                        help='Path to data directory containing OCR results')
+    parser.add_argument('--folders', type=int, default=4,
+                        help='Number of folders to process for each configuration')
+    parser.add_argument('--workers', type=str, default='1,2,4,8',
+                        help='Comma-separated worker counts')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Number of chunks per model call')
+
+    args = parser.parse_args()
+
+    if not args.model.exists():
+        print(f"Error: Model not found: {args.model}")
+        sys.exit(1)
+
+    folders = sorted(f for f in args.data_dir.iterdir() if f.is_dir())[:args.folders]
+    if not folders:
+        print(f"Error: No folders found in: {args.data_dir}")
+        sys.exit(1)
+
+    n_docs = sum(len(list(f.glob("*.md"))) for f in folders)
+    print(f"Benchmark on {len(folders)} folders, {n_docs} documents (cache disabled)\n")
+    print(f"{'Workers':>8} {'Threads':>8} {'Time (s)':>10} {'Docs/s':>10} {'Speedup':>10}")
+    print("-" * 50)
+
+    baseline = None
+    reference = None
+    for workers in [int(w) for w in args.workers.split(',')]:
+        # Le temps inclut le démarrage des workers et le chargement du modèle
+        start = time.perf_counter()
+        results = [result
+                   for _, folder_results in process_corpus_parallel(folders, args.model, workers,
+                                                                    verbose=False,
+                                                                    batch_size=args.batch_size)
+                   for result in folder_results]
+        elapsed = time.perf_counter() - start
+
+        if reference is None:
+            reference = results
+        elif results != reference:
+            print(f"Warning: results differ with {workers} workers")
+
+        rate = n_docs / elapsed
+        if baseline is None:
+            baseline = rate
+        print(f"{workers:>8} {threads_per_worker(workers):>8} {elapsed:>10.2f} {rate:>10.2f} "
+              f"{rate / baseline:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
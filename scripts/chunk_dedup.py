@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Élimination des chunks dupliqués entre documents (en-têtes, pieds de page, tampons)
+Chaque chunk est normalisé ; les doublons exacts (hash) et quasi-doublons (shingles + MinHash,
+index LSH) d'un chunk déjà vu réutilisent ses prédictions au lieu d'appeler le modèle.
+Les mentions sont repositionnées dans le texte de chaque occurrence, via le texte normalisé ;
+une copie dont une mention est introuvable passe par le modèle, de même qu'un quasi-doublon
+contenant des mots capitalisés absents du représentant hors de ces mentions.
+L'index est propre au processus et dépend de l'ordre des chunks : avec un seuil < 1, les runs
+multi-workers, repris, incrémentaux ou répartis peuvent différer légèrement d'un run complet.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import bisect
+import hashlib
+import unicodedata
+import numpy as np
+
+from gazetteer import WORD_RE, uncovered_words
+
+
+# Similarité de Jaccard (estimée) minimale pour un quasi-doublon (>= 1 : doublons exacts seulement)
+DEFAULT_NEAR_DUP_THRESHOLD = 0.9
+
+# MinHash : NUM_PERM permutations, LSH en BANDS bandes de NUM_PERM / BANDS lignes
+NUM_PERM = 64
+BANDS = 16
+
+# Taille des shingles (en mots)
+SHINGLE_SIZE = 3
+
+# Hachage universel (a * x + b) mod p, p premier < 2^32 : pas de dépassement en uint64
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def normalize_with_offsets(text):
+    """
+    Normalisation Unicode (NFKC, par caractère et ses marques combinantes) et des espaces
+    (sauts de ligne OCR) ; chaque caractère normalisé garde sa plage [début, fin) dans le texte
+    Returns: (texte normalisé, débuts, fins)
+    """
+    chars, starts, ends = [], [], []
+    space_start = None
+    i = 0
+    while i < len(text):
+        j = i + 1
+        while j < len(text) and unicodedata.combining(text[j]):
+            j += 1
+        for char in unicodedata.normalize('NFKC', text[i:j]):
+            if char.isspace():
+                if chars and space_start is None:
+                    space_start = i
+                continue
+            if space_start is not None:
+                chars.append(' ')
+                starts.append(space_start)
+                ends.append(i)
+                space_start = None
+            chars.append(char)
+            starts.append(i)
+            ends.append(j)
+        i = j
+    return ''.join(chars), starts, ends
+
+
+def normalize_chunk(text):
+    """Normalisation Unicode (NFKC) et des espaces (sauts de ligne OCR)"""
+    return normalize_with_offsets(text)[0]
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def shingles(normalized, size=SHINGLE_SIZE):
+    """Shingles de mots (en minuscules) d'un chunk normalisé"""
+    words = normalized.lower().split()
+    if len(words) <= size:
+        return {' '.join(words)}
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def anchor_entities(entities, normalized):
+    """
+    Positions des mentions d'un chunk représentant dans son texte normalisé
+    normalized : résultat de normalize_with_offsets ; Returns: [(mention, début, texte normalisé)]
+    """
+    norm_text, starts, ends = normalized
+    anchored = []
+    for entity in entities:
+        start = bisect.bisect_left(starts, entity['start'])
+        end = bisect.bisect_right(ends, entity['end'])
+        anchored.append((entity, start, norm_text[start:end]))
+    return anchored
+
+
+def remap_entities(anchored, text, normalized):
+    """
+    Repositionne les mentions d'un chunk représentant dans le texte d'une occurrence
+    La mention est cherchée dans le texte normalisé (occurrence la plus proche de sa position
+    d'origine), puis ramenée aux positions du texte de l'occurrence.
+    Returns: mentions repositionnées, None si l'une d'elles est introuvable (quasi-doublon)
+    """
+    norm_text, starts, ends = normalized
+    remapped = []
+    for entity, norm_start, norm_entity in anchored:
+        if not norm_entity:
+            return None
+        if norm_text.startswith(norm_entity, norm_start):
+            pos = norm_start
+        else:
+            positions = []
+            pos = norm_text.find(norm_entity)
+            while pos != -1:
+                positions.append(pos)
+                pos = norm_text.find(norm_entity, pos + 1)
+            if not positions:
+                return None
+            pos = min(positions, key=lambda p: abs(p - norm_start))
+
+        start, end = starts[pos], ends[pos + len(norm_entity) - 1]
+        if start == entity['start'] and end == entity['end'] and text[start:end] == entity['text']:
+            remapped.append(entity)
+        else:
+            remapped.append(dict(entity, start=start, end=end, text=text[start:end]))
+
+    return remapped
+
+
+class ChunkIndex:
+    """Index des chunks représentants : hash exact + LSH sur les signatures MinHash"""
+
+    def __init__(self, threshold=DEFAULT_NEAR_DUP_THRESHOLD, num_perm=NUM_PERM, bands=BANDS, seed=1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self.b = rng.randint(0, MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+
+        self.exact = {}
+        self.buckets = {}
+        self.signatures = {}
+        self.size = 0
+
+    def _new_id(self):
+        self.size += 1
+        return self.size - 1
+
+    def signature(self, normalized):
+        """Signature MinHash du chunk"""
+        values = np.array([_hash64(s) % MERSENNE_PRIME for s in shingles(normalized)], dtype=np.uint64)
+        hashed = (np.outer(self.a, values) + self.b[:, None]) % MERSENNE_PRIME
+        return hashed.min(axis=1)
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.bands)]
+
+    def lookup(self, text, normalized=None):
+        """
+        Cherche un représentant pour un chunk (normalized : normalize_chunk(text) déjà calculé),
+        sinon l'enregistre
+        Returns: (id du représentant ou None, 'exact' | 'near' | None, id attribué si nouveau)
+        """
+        if normalized is None:
+            normalized = normalize_chunk(text)
+        digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+
+        rep = self.exact.get(digest)
+        if rep is not None:
+            return rep, 'exact', None
+
+        if self.threshold >= 1:
+            self.exact[digest] = self._new_id()
+            return None, None, self.exact[digest]
+
+        signature = self.signature(normalized)
+        keys = self._band_keys(signature)
+
+        best, best_sim = None, self.threshold
+        for key in keys:
+            for candidate in self.buckets.get(key, ()):
+                similarity = float(np.mean(self.signatures[candidate] == signature))
+                if similarity >= best_sim:
+                    best, best_sim = candidate, similarity
+
+        if best is not None:
+            # Les copies exactes de ce chunk retrouvent directement le même représentant
+            self.exact[digest] = best
+            return best, 'near', None
+
+        new_id = self._new_id()
+        self.exact[digest] = new_id
+        self.signatures[new_id] = signature
+        for key in keys:
+            self.buckets.setdefault(key, []).append(new_id)
+        return None, None, new_id
+
+
+class DedupModel:
+    """
+    Enveloppe un modèle GLiNER : chaque chunk unique (à la normalisation près, ou quasi-doublon)
+    n'est prédit qu'une fois sur tout le run ; ses prédictions sont redistribuées aux copies
+    """
+
+    def __init__(self, model, threshold=DEFAULT_NEAR_DUP_THRESHOLD):
+        self.model = model
+        self.index = ChunkIndex(threshold)
+        self.predictions = []
+        # Mots du texte normalisé de chaque représentant (quasi-doublons)
+        self.words = []
+        self.chunks = 0
+        self.exact = 0
+        self.near = 0
+
+    def __getattr__(self, name):
+        # config, data_processor... du modèle enveloppé
+        return getattr(self.model, name)
+
+    def predict_entities(self, text, labels, threshold=0.5):
+        return self.batch_predict_entities([text], labels, threshold=threshold)[0]
+
+    def batch_predict_entities(self, texts, labels, threshold=0.5):
+        # Représentant de chaque chunk (les doublons internes au batch sont aussi détectés)
+        normalized = [normalize_with_offsets(text) for text in texts]
+        assignments = []
+        kinds = []
+        missing = []
+        for i, text in enumerate(texts):
+            rep, kind, new_id = self.index.lookup(text, normalized[i][0])
+            if new_id is not None:
+                self.predictions.append(None)
+                self.words.append(None)
+                missing.append(i)
+                rep = new_id
+            assignments.append(rep)
+            kinds.append(kind)
+
+        self.chunks += len(texts)
+
+        predictions = [None] * len(texts)
+        for i, entities in zip(missing, self._predict([texts[i] for i in missing], labels, threshold)):
+            predictions[i] = entities
+            self.predictions[assignments[i]] = anchor_entities(entities, normalized[i])
+            if self.index.threshold < 1:
+                self.words[assignments[i]] = set(WORD_RE.findall(normalized[i][0]))
+
+        # Copies : mentions du représentant repositionnées, le modèle si l'une est introuvable
+        # ou si un quasi-doublon a ses propres mots capitalisés (entités absentes du représentant)
+        fallback = []
+        for i, (rep, kind) in enumerate(zip(assignments, kinds)):
+            if kind is None:
+                continue
+            predictions[i] = remap_entities(self.predictions[rep], texts[i], normalized[i])
+            if predictions[i] is None:
+                fallback.append(i)
+            elif kind == 'exact':
+                self.exact += 1
+            elif self._new_words(texts[i], predictions[i], self.words[rep]):
+                fallback.append(i)
+            else:
+                self.near += 1
+
+        for i, entities in zip(fallback, self._predict([texts[i] for i in fallback], labels, threshold)):
+            predictions[i] = entities
+
+        return predictions
+
+    @staticmethod
+    def _new_words(text, entities, rep_words):
+        """Mots capitalisés de la copie, hors des mentions repositionnées, absents du représentant"""
+        spans = sorted((e['start'], e['end']) for e in entities)
+        return [word for word in uncovered_words(text, spans)
+                if unicodedata.normalize('NFKC', word) not in rep_words]
+
+    def _predict(self, texts, labels, threshold):
+        """Appel au modèle enveloppé (predict_entities pour un seul chunk)"""
+        if len(texts) == 1:
+            return [self.model.predict_entities(texts[0], labels, threshold=threshold)]
+        if texts:
+            return self.model.batch_predict_entities(texts, labels, threshold=threshold)
+        return []
+
+    def summary(self):
+        """Résumé des passes du modèle évitées"""
+        avoided = self.exact + self.near
+        share = avoided / self.chunks if self.chunks else 0.0
+        return (f"Chunk dedup: {self.chunks} chunks, {self.exact} exact + {self.near} near duplicates, "
+                f"{avoided} forward passes avoided ({share:.1%})")
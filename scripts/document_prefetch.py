@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Préparation anticipée des documents (lecture, nettoyage, découpage) pendant l'inférence
+Un pool de threads prépare les documents à venir dans une file bornée ; le thread principal
+les consomme dans l'ordre et garde le modèle occupé. La profondeur de la file et le temps
+d'attente du thread principal (inférence affamée) sont comptés.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import run_metrics
+from stage_profiler import stage
+
+
+DEFAULT_PREFETCH_DEPTH = 8
+DEFAULT_PREFETCH_THREADS = 2
+
+
+class DocumentPrefetcher:
+    """
+    Documents préparés à l'avance, rendus dans l'ordre de md_files
+    prepare(md_file) -> document préparé (appelé dans les threads du pool)
+    """
+
+    def __init__(self, md_files, prepare, depth=DEFAULT_PREFETCH_DEPTH, threads=DEFAULT_PREFETCH_THREADS):
+        self.depth = max(1, depth)
+        self._files = iter(md_files)
+        self._prepare = prepare
+        self._pending = deque()
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='prefetch')
+
+        # Statistiques
+        self.documents = 0
+        self.ready_total = 0   # documents déjà prêts à chaque demande (profondeur utile de la file)
+        self.ready_min = None
+        self.stalls = 0
+        self.stall_seconds = 0.0
+
+        self._fill()
+
+    def _fill(self):
+        """Soumet des documents jusqu'à la profondeur de la file"""
+        while len(self._pending) < self.depth:
+            md_file = next(self._files, None)
+            if md_file is None:
+                break
+            self._pending.append((md_file, self._pool.submit(self._prepare, md_file)))
+
+    def get(self, md_file):
+        """Document préparé suivant ; md_file doit être le prochain document de la liste"""
+        if not self._pending or self._pending[0][0] != md_file:
+            raise ValueError(f"Prefetch order mismatch: expected {self._pending[0][0] if self._pending else None}, "
+                             f"got {md_file}")
+
+        _, future = self._pending.popleft()
+        ready = sum(1 for _, pending in self._pending if pending.done()) + future.done()
+        self.documents += 1
+        self.ready_total += ready
+        self.ready_min = ready if self.ready_min is None else min(self.ready_min, ready)
+
+        waited = 0.0
+        if not future.done():
+            self.stalls += 1
+            start = time.perf_counter()
+            with stage('prefetch_wait', md_file.stem):
+                future.result()
+            waited = time.perf_counter() - start
+            self.stall_seconds += waited
+        run_metrics.observe_queue_wait(waited)
+
+        self._fill()
+        return future.result()
+
+    def close(self):
+        """Arrête le pool (documents non consommés abandonnés)"""
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=True)
+
+    def summary(self):
+        if not self.documents:
+            return "Prefetch: no documents"
+        return (f"Prefetch: {self.documents} documents, ready queue avg "
+                f"{self.ready_total / self.documents:.1f} / min {self.ready_min} (depth {self.depth}), "
+                f"inference stalled on {self.stalls} documents for {self.stall_seconds:.2f}s")
@@ -418,6 +418,18 @@ def enrich_person(row: pd.Series, org_index: Dict, gpe_index: Dict, use_llm: boo
     return enriched_row
 
 
+def build_index(df: pd.DataFrame) -> Dict:
+    """Index alias (minuscules) -> entité canonique"""
+    index = {}
+    for _, row in df.iterrows():
+        entity = row['entity_normalized']
+        index[entity.lower()] = entity
+        if pd.notna(row['aliases']):
+            for alias in row['aliases'].split(', '):
+                index[alias.lower()] = entity
+    return index
+
+
 def enrich_person_wrapper(args):
     """Wrapper pour parallélisation"""
     idx, row, org_index, gpe_index, llm_count = args
@@ -446,21 +458,8 @@ def main():
 
     # Construire index
     print("🔍 Construction des index...")
-    org_index = {}
-    for _, row in df_org.iterrows():
-        entity = row['entity_normalized']
-        org_index[entity.lower()] = entity
-        if pd.notna(row['aliases']):
-            for alias in row['aliases'].split(', '):
-                org_index[alias.lower()] = entity
-
-    gpe_index = {}
-    for _, row in df_gpe.iterrows():
-        entity = row['entity_normalized']
-        gpe_index[entity.lower()] = entity
-        if pd.notna(row['aliases']):
-            for alias in row['aliases'].split(', '):
-                gpe_index[alias.lower()] = entity
+    org_index = build_index(df_org)
+    gpe_index = build_index(df_gpe)
 
     print(f"   ✅ Index ORG: {len(org_index)} entrées, GPE: {len(gpe_index)} entrées")
 
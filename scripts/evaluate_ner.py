@@ -10,10 +10,20 @@ import sys
 import argparse
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Tuple, Set, Union
 import pandas as pd
 
 
+ENTITY_TYPES = ['PERSON', 'ORGANIZATION', 'LOCATION']
+
+# Type mapping from pipeline types / Excel sheets to gold standard types
+TYPE_MAPPING = {
+    'PERSON': 'PERSON',
+    'ORGANIZATION': 'ORGANIZATION',
+    'GPE': 'LOCATION'  # Geographic Political Entity -> LOCATION
+}
+
+
 class NERAnnotation:
     """Represents a single NER annotation"""
     def __init__(self, folder: str, document: str, entity_type: str, entity_text: str):
@@ -123,7 +133,43 @@ class GoldStandardLoader:
 
 
 class GLiNERResultsLoader:
-    """Load GLiNER predictions from Excel file"""
+    """Load GLiNER predictions from an Excel file or from in-memory records"""
+
+    @staticmethod
+    def from_records(records: Union[pd.DataFrame, List[Dict]],
+                     folder_filter: Set[str] = None) -> Dict[str, List[NERAnnotation]]:
+        """
+        Load GLiNER predictions from pipeline records (Folder, Document, Entity, Type)
+        Returns: dict mapping folder names to lists of annotations
+        """
+        annotations_by_folder = defaultdict(list)
+
+        df = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+        if df.empty:
+            return dict(annotations_by_folder)
+
+        if not {'Folder', 'Document', 'Entity', 'Type'}.issubset(df.columns):
+            print("Warning: Predictions missing required columns")
+            return dict(annotations_by_folder)
+
+        df = df[df['Type'].isin(TYPE_MAPPING.keys())]
+        folders = df['Folder'].astype(str)
+
+        # Skip if not in filter
+        if folder_filter:
+            mask = folders.isin(folder_filter)
+            df, folders = df[mask], folders[mask]
+
+        # Normalize document name: extract just "doc01" from "R1048-13C-23516-23516_doc01"
+        documents = df['Document'].astype(str)
+        has_doc = documents.str.contains('_doc', regex=False)
+        documents = documents.where(~has_doc, 'doc' + documents.str.split('_doc').str[1].fillna(''))
+
+        for folder, document, entity_type, entity_text in zip(
+                folders, documents, df['Type'].map(TYPE_MAPPING), df['Entity'].astype(str)):
+            annotations_by_folder[folder].append(NERAnnotation(folder, document, entity_type, entity_text))
+
+        return dict(annotations_by_folder)
 
     @staticmethod
     def load(filepath: Path, folder_filter: Set[str] = None) -> Dict[str, List[NERAnnotation]]:
@@ -133,13 +179,6 @@ class GLiNERResultsLoader:
         """
         annotations_by_folder = defaultdict(list)
 
-        # Type mapping from Excel sheets to gold standard types
-        type_mapping = {
-            'PERSON': 'PERSON',
-            'ORGANIZATION': 'ORGANIZATION',
-            'GPE': 'LOCATION'  # Geographic Political Entity -> LOCATION
-        }
-
         # Try to load Excel file
         try:
             excel_file = pd.ExcelFile(filepath)
@@ -149,10 +188,9 @@ class GLiNERResultsLoader:
 
         # Read each sheet
         for sheet_name in excel_file.sheet_names:
-            if sheet_name not in type_mapping:
+            if sheet_name not in TYPE_MAPPING:
                 continue
 
-            entity_type = type_mapping[sheet_name]
             df = pd.read_excel(excel_file, sheet_name=sheet_name)
 
             # Expected columns: Folder, Document, Entity (at minimum)
@@ -160,23 +198,10 @@ class GLiNERResultsLoader:
                 print(f"Warning: Sheet {sheet_name} missing required columns")
                 continue
 
-            for _, row in df.iterrows():
-                folder = str(row['Folder'])
-                document_full = str(row['Document'])
-                entity_text = str(row['Entity'])
-
-                # Skip if not in filter
-                if folder_filter and folder not in folder_filter:
-                    continue
-
-                # Normalize document name: extract just "doc01" from "R1048-13C-23516-23516_doc01"
-                if '_doc' in document_full:
-                    document = 'doc' + document_full.split('_doc')[1]
-                else:
-                    document = document_full
-
-                annotation = NERAnnotation(folder, document, entity_type, entity_text)
-                annotations_by_folder[folder].append(annotation)
+            # The sheet name gives the type
+            df = df.assign(Type=sheet_name)
+            for folder, annotations in GLiNERResultsLoader.from_records(df, folder_filter).items():
+                annotations_by_folder[folder].extend(annotations)
 
         return dict(annotations_by_folder)
 
@@ -184,9 +209,18 @@ class GLiNERResultsLoader:
 class NEREvaluator:
     """Main evaluation class"""
 
-    def __init__(self, gold_standard_path: Path, predictions_path: Path):
+    def __init__(self, gold_standard_path: Path, predictions_path: Path = None,
+                 predictions: Union[pd.DataFrame, List[Dict]] = None):
+        """
+        Predictions come either from an Excel file (predictions_path) or from
+        in-memory pipeline records (predictions: DataFrame or list of dicts)
+        """
+        if predictions_path is None and predictions is None:
+            raise ValueError("Either predictions_path or predictions is required")
+
         self.gold_standard_path = gold_standard_path
         self.predictions_path = predictions_path
+        self.predictions = predictions
         self.gold_annotations = {}
         self.pred_annotations = {}
 
@@ -199,8 +233,12 @@ class NEREvaluator:
         gold_folders = set(self.gold_annotations.keys())
         print(f"Found {len(gold_folders)} folders in gold standard")
 
-        print(f"Loading predictions from: {self.predictions_path}")
-        self.pred_annotations = GLiNERResultsLoader.load(self.predictions_path, gold_folders)
+        if self.predictions is not None:
+            print(f"Loading {len(self.predictions)} in-memory predictions")
+            self.pred_annotations = GLiNERResultsLoader.from_records(self.predictions, gold_folders)
+        else:
+            print(f"Loading predictions from: {self.predictions_path}")
+            self.pred_annotations = GLiNERResultsLoader.load(self.predictions_path, gold_folders)
         print(f"Found {len(self.pred_annotations)} folders in predictions")
 
     def evaluate(self) -> Dict[str, NERMetrics]:
@@ -258,7 +296,7 @@ class NEREvaluator:
             f.write("=" * 80 + "\n\n")
 
             f.write(f"Gold Standard: {self.gold_standard_path}\n")
-            f.write(f"Predictions:   {self.predictions_path}\n")
+            f.write(f"Predictions:   {self.predictions_path or 'in-memory records'}\n")
             f.write(f"Generated:     {pd.Timestamp.now()}\n\n")
 
             # Summary table
@@ -320,6 +358,27 @@ class NEREvaluator:
         print(f"\nReport saved to: {output_path}")
 
 
+def print_summary(metrics: Dict[str, NERMetrics]):
+    """Print summary metrics to console"""
+    print("\n" + "=" * 80)
+    print("EVALUATION SUMMARY")
+    print("=" * 80)
+    print(f"{'Type':<15} {'Precision':>10} {'Recall':>10} {'F1':>10}")
+    print("-" * 80)
+
+    for entity_type in ENTITY_TYPES:
+        m = metrics[entity_type]
+        print(f"{entity_type:<15} {m.precision:>10.3f} {m.recall:>10.3f} {m.f1:>10.3f}")
+
+    print("-" * 80)
+    m = metrics['OVERALL']
+    print(f"{'MICRO-AVG':<15} {m.precision:>10.3f} {m.recall:>10.3f} {m.f1:>10.3f}")
+
+    macro_f1 = sum(metrics[t].f1 for t in ENTITY_TYPES) / 3
+    print(f"{'MACRO-AVG F1':<15} {macro_f1:>32.3f}")
+    print("=" * 80 + "\n")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Evaluate NER predictions against gold standard',
@@ -375,23 +434,7 @@ Example usage:
     evaluator.generate_report(metrics, args.output)
 
     # Print summary to console
-    print("\n" + "=" * 80)
-    print("EVALUATION SUMMARY")
-    print("=" * 80)
-    print(f"{'Type':<15} {'Precision':>10} {'Recall':>10} {'F1':>10}")
-    print("-" * 80)
-
-    for entity_type in ['PERSON', 'ORGANIZATION', 'LOCATION']:
-        m = metrics[entity_type]
-        print(f"{entity_type:<15} {m.precision:>10.3f} {m.recall:>10.3f} {m.f1:>10.3f}")
-
-    print("-" * 80)
-    m = metrics['OVERALL']
-    print(f"{'MICRO-AVG':<15} {m.precision:>10.3f} {m.recall:>10.3f} {m.f1:>10.3f}")
-
-    macro_f1 = sum(metrics[t].f1 for t in ['PERSON', 'ORGANIZATION', 'LOCATION']) / 3
-    print(f"{'MACRO-AVG F1':<15} {macro_f1:>32.3f}")
-    print("=" * 80 + "\n")
+    print_summary(metrics)
 
 
 if __name__ == '__main__':
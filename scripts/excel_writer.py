@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Écriture des rapports Excel
+xlsxwriter en mode constant_memory : les lignes (déjà triées) sont écrites une à une sur disque,
+la mémoire ne dépend pas du nombre de lignes. openpyxl (via pandas) reste disponible en secours.
+Avec xlsxwriter, la date de création est fixe : mêmes feuilles, même fichier octet pour octet
+(openpyxl date le classeur et ses entrées zip de l'heure d'écriture).
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+
+EXCEL_ENGINES = ['xlsxwriter', 'openpyxl']
+DEFAULT_EXCEL_ENGINE = 'xlsxwriter' if xlsxwriter is not None else 'openpyxl'
+
+# Date de création/modification écrite dans docProps/core.xml (l'heure courante par défaut)
+REPORT_CREATED = datetime(2025, 11, 16)
+
+
+def write_sheets(sheets, output_path, engine=DEFAULT_EXCEL_ENGINE):
+    """
+    Écrit un classeur : sheets = [(nom de la feuille, DataFrame trié)], index non écrit
+    Les textes sont écrits comme textes (pas de formule pour '=...' ni de lien pour les URL)
+    """
+    if engine == 'xlsxwriter' and xlsxwriter is None:
+        print("Warning: xlsxwriter not installed, writing the Excel report with openpyxl")
+        engine = 'openpyxl'
+
+    if engine == 'openpyxl':
+        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+            for sheet_name, df in sheets:
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        return
+
+    workbook = xlsxwriter.Workbook(str(output_path), {
+        'constant_memory': True,
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+    })
+    workbook.set_properties({'created': REPORT_CREATED})
+    try:
+        for sheet_name, df in sheets:
+            worksheet = workbook.add_worksheet(sheet_name)
+            worksheet.write_row(0, 0, [str(column) for column in df.columns])
+            # Cellules vides pour les valeurs manquantes (comme pandas)
+            values = df.astype(object).where(df.notna(), None)
+            # constant_memory : chaque ligne doit être complète avant de passer à la suivante
+            for row, row_values in enumerate(values.itertuples(index=False, name=None), 1):
+                worksheet.write_row(row, 0, row_values)
+    finally:
+        workbook.close()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Gazetteer des entités connues et étiqueteur en cascade
+Un automate Aho-Corasick construit sur les alias des listes curées (person/org/gpe_FINAL_CLEAN.xlsx)
+étiquette chaque chunk ; GLiNER n'est appelé que sur les chunks contenant des mots
+capitalisés que le gazetteer ne couvre pas.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import re
+import hashlib
+from bisect import bisect_right
+from collections import deque
+from pathlib import Path
+import pandas as pd
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Listes curées (entity_normalized + aliases séparés par ', ') et label GLiNER correspondant
+GAZETTEER_FILES = {
+    'person': PROJECT_ROOT / "outputs/person_FINAL_CLEAN.xlsx",
+    'organization': PROJECT_ROOT / "outputs/org_FINAL_CLEAN.xlsx",
+    'location': PROJECT_ROOT / "outputs/gpe_FINAL_CLEAN.xlsx",
+}
+
+# Score attribué aux mentions trouvées par le gazetteer
+GAZETTEER_SCORE = 1.0
+
+# Alias plus courts ignorés (initiales, sigles ambigus)
+MIN_ALIAS_LENGTH = 3
+
+WORD_RE = re.compile(r"\w+(?:['’-]\w+)*")
+QID_RE = re.compile(r'\s*\(Q\d+\)\s*$')
+
+# Mots capitalisés qui ne sont pas des entités (débuts de phrase, titres, dates)
+STOPWORDS = {
+    # en
+    'the', 'a', 'an', 'this', 'that', 'these', 'those', 'in', 'on', 'at', 'for', 'with', 'from',
+    'to', 'of', 'by', 'as', 'and', 'but', 'or', 'if', 'we', 'i', 'it', 'he', 'she', 'they',
+    'you', 'my', 'our', 'your', 'his', 'her', 'their', 'there', 'dear', 'yours', 'sir',
+    'madam', 'mr', 'mrs', 'miss', 'ms', 'dr', 'prof', 'professor', 'no', 'ref', 're', 'subject',
+    # fr
+    'le', 'la', 'les', 'l', 'un', 'une', 'des', 'du', 'de', 'd', 'ce', 'cet', 'cette', 'ces',
+    'je', 'j', 'nous', 'vous', 'il', 'elle', 'ils', 'elles', 'on', 'en', 'dans', 'pour', 'par',
+    'sur', 'avec', 'et', 'mais', 'ou', 'si', 'mon', 'ma', 'mes', 'notre', 'votre', 'son', 'sa',
+    'monsieur', 'madame', 'mademoiselle', 'messieurs', 'cher', 'chère', 'chers', 'm', 'mm',
+    'mme', 'mlle', 'me', 'objet', 'réf',
+    # de / it / es
+    'der', 'die', 'das', 'ein', 'eine', 'und', 'ich', 'wir', 'sie', 'es', 'herr', 'frau',
+    'sehr', 'geehrter', 'lo', 'gli', 'di', 'il', 'el', 'los', 'las', 'y', 'signor', 'señor',
+    # dates
+    'january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september',
+    'october', 'november', 'december', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday',
+    'saturday', 'sunday', 'janvier', 'février', 'mars', 'avril', 'mai', 'juin', 'juillet',
+    'août', 'septembre', 'octobre', 'novembre', 'décembre', 'lundi', 'mardi', 'mercredi',
+    'jeudi', 'vendredi', 'samedi', 'dimanche',
+}
+
+
+def fold_case(text):
+    """Minuscules caractère par caractère (les positions restent celles du texte d'origine)"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def gazetteer_fingerprint(files=None):
+    """Hash du contenu des listes curées, dans l'ordre des labels (fichiers absents ignorés)"""
+    digest = hashlib.sha256()
+    for label, path in (files or GAZETTEER_FILES).items():
+        path = Path(path)
+        if path.exists():
+            digest.update(label.encode('utf-8'))
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()[:16]
+
+
+def load_aliases(files=None):
+    """
+    Lit les alias des listes curées, en ignorant les fichiers absents
+    Returns: liste de (alias, label)
+    """
+    aliases = []
+    for label, path in (files or GAZETTEER_FILES).items():
+        path = Path(path)
+        if not path.exists():
+            print(f"Warning: Gazetteer file not found, skipping {label}: {path}")
+            continue
+
+        df = pd.read_excel(path)
+        for _, row in df.iterrows():
+            names = [QID_RE.sub('', str(row['entity_normalized']))]
+            if 'aliases' in df.columns and pd.notna(row['aliases']):
+                names.extend(str(row['aliases']).split(', '))
+            aliases.extend((name.strip(), label) for name in names)
+
+    return aliases
+
+
+def uncovered_words(text, matches):
+    """
+    Mots capitalisés hors des mentions (candidats pour GLiNER)
+    matches : plages (début, fin, ...) triées et disjointes
+    """
+    starts = [m[0] for m in matches]
+    lower_words = None
+    uncovered = []
+
+    for m in WORD_RE.finditer(text):
+        word = m.group()
+        if len(word) < 2 or not word[0].isupper():
+            continue
+
+        i = bisect_right(starts, m.start()) - 1
+        if i >= 0 and m.end() <= matches[i][1]:
+            continue
+
+        folded = word.lower()
+        if folded in STOPWORDS:
+            continue
+
+        # Mot courant capitalisé en début de phrase : il apparaît aussi en minuscules
+        if lower_words is None:
+            lower_words = {w for w in WORD_RE.findall(text) if w.islower()}
+        if folded in lower_words:
+            continue
+
+        uncovered.append(word)
+
+    return uncovered
+
+
+class Gazetteer:
+    """Automate Aho-Corasick sur les alias (insensible à la casse, bornes de mots)"""
+
+    def __init__(self, aliases):
+        # goto[state] : dict caractère -> état ; out[state] : (longueur, label) les plus longs d'abord
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        self.size = 0
+
+        for alias, label in aliases:
+            if len(alias) >= MIN_ALIAS_LENGTH:
+                self._add(fold_case(alias), label)
+
+        self._build()
+
+    def _add(self, pattern, label):
+        state = 0
+        for char in pattern:
+            nxt = self.goto[state].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+
+        # Un alias présent dans plusieurs listes garde le premier label
+        if not self.out[state]:
+            self.out[state].append((len(pattern), label))
+            self.size += 1
+
+    def _build(self):
+        """Liens d'échec (parcours en largeur)"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find(self, text):
+        """
+        Mentions du gazetteer dans le texte : plus longues à gauche, sans chevauchement,
+        alignées sur des mots entiers et contenant au moins une majuscule
+        Returns: liste de (start, end, label) triée
+        """
+        folded = fold_case(text)
+        candidates = []
+        state = 0
+
+        for i, char in enumerate(folded):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+
+            for length, label in self.out[state]:
+                start, end = i + 1 - length, i + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end < len(text) and text[end].isalnum():
+                    continue
+                if text[start:end].islower():
+                    continue
+                candidates.append((start, end, label))
+
+        matches = []
+        for start, end, label in sorted(candidates, key=lambda m: (m[0], m[0] - m[1])):
+            if not matches or start >= matches[-1][1]:
+                matches.append((start, end, label))
+        return matches
+
+    def tag(self, text):
+        """
+        Étiquette un chunk
+        Returns: (prédictions au format GLiNER, True si tous les mots capitalisés sont couverts)
+        """
+        matches = self.find(text)
+        entities = [{'start': start, 'end': end, 'text': text[start:end],
+                     'label': label, 'score': GAZETTEER_SCORE}
+                    for start, end, label in matches]
+        return entities, not uncovered_words(text, matches)
+
+
+def load_gazetteer(files=None):
+    """Construit le gazetteer à partir des listes curées"""
+    return Gazetteer(load_aliases(files))
+
+
+class CascadeModel:
+    """
+    Enveloppe un modèle GLiNER : les chunks entièrement couverts par le gazetteer
+    reçoivent ses mentions, les autres passent par le modèle
+    """
+
+    def __init__(self, model, gazetteer: Gazetteer):
+        self.model = model
+        self.gazetteer = gazetteer
+        self.chunks = 0
+        self.skipped = 0
+
+    def __getattr__(self, name):
+        # config, data_processor... du modèle enveloppé
+        return getattr(self.model, name)
+
+    def predict_entities(self, text, labels, threshold=0.5):
+        return self.batch_predict_entities([text], labels, threshold=threshold)[0]
+
+    def batch_predict_entities(self, texts, labels, threshold=0.5):
+        predictions = []
+        missing = []
+        for i, text in enumerate(texts):
+            entities, covered = self.gazetteer.tag(text)
+            predictions.append([e for e in entities if e['label'] in labels] if covered else None)
+            if not covered:
+                missing.append(i)
+
+        self.chunks += len(texts)
+        self.skipped += len(texts) - len(missing)
+
+        if len(missing) == 1:
+            i = missing[0]
+            predictions[i] = self.model.predict_entities(texts[i], labels, threshold=threshold)
+        elif missing:
+            computed = self.model.batch_predict_entities(
+                [texts[i] for i in missing], labels, threshold=threshold
+            )
+            for i, entities in zip(missing, computed):
+                predictions[i] = entities
+
+        return predictions
+
+    def summary(self):
+        """Résumé des chunks traités par le gazetteer"""
+        share = self.skipped / self.chunks if self.chunks else 0.0
+        return (f"Cascade: {self.skipped}/{self.chunks} chunks skipped by the gazetteer "
+                f"({share:.1%}), {self.gazetteer.size} aliases")
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Daemon local d'inférence GLiNER
+Garde le modèle chargé en mémoire et sert des prédictions par batch en HTTP sur localhost.
+load_gliner() utilise le daemon s'il tourne avec le même modèle, sinon charge GLiNER en local.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import os
+import sys
+import json
+import argparse
+import threading
+import http.client
+import urllib.request
+import urllib.error
+from pathlib import Path
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from inference_backends import BACKENDS, DEFAULT_BACKEND, load_backend
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_DAEMON_URL = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+
+# Délai max pour détecter le daemon (s) : le repli en local doit rester immédiat
+HEALTH_TIMEOUT = 0.5
+
+
+def daemon_url():
+    """URL du daemon (variable GLINER_DAEMON_URL), None si désactivé (GLINER_DAEMON=0)"""
+    if os.environ.get("GLINER_DAEMON", "1") == "0":
+        return None
+    return os.environ.get("GLINER_DAEMON_URL", DEFAULT_DAEMON_URL)
+
+
+def _request(url, payload=None, timeout=None):
+    """Requête JSON (GET si payload est None, POST sinon)"""
+    data = None
+    headers = {}
+    if payload is not None:
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers['Content-Type'] = 'application/json'
+
+    req = urllib.request.Request(url, data=data, headers=headers)
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+# Erreurs de transport (daemon arrêté, connexion coupée, erreur du modèle côté daemon)
+TRANSPORT_ERRORS = (urllib.error.URLError, http.client.HTTPException, OSError, ValueError, KeyError)
+
+
+class DaemonModel:
+    """
+    Client du daemon : même interface que GLiNER pour predict_entities / batch_predict_entities
+    Si le daemon ne répond plus en cours de run, le modèle est chargé dans le processus et
+    sert toutes les requêtes suivantes.
+    """
+
+    def __init__(self, url, info, mmap_weights=False):
+        self.url = url.rstrip('/')
+        self.model_path = info['model']
+        self.backend = info.get('backend', DEFAULT_BACKEND)
+        self.mmap_weights = mmap_weights
+        # Exposé pour le chunker tokenizer (make_token_chunker)
+        self.config = SimpleNamespace(max_len=info.get('max_len', 384))
+        self.local = None
+
+    def predict_entities(self, text, labels, threshold=0.5):
+        return self.batch_predict_entities([text], labels, threshold=threshold)[0]
+
+    def batch_predict_entities(self, texts, labels, threshold=0.5):
+        if self.local is None:
+            try:
+                response = _request(f"{self.url}/predict",
+                                    {'texts': list(texts), 'labels': list(labels), 'threshold': threshold})
+                return response['predictions']
+            except TRANSPORT_ERRORS as e:
+                print(f"Warning: GLiNER daemon at {self.url} failed ({e}), loading the model in-process")
+                self.local = load_backend(self.model_path, self.backend, self.mmap_weights)
+
+        if len(texts) == 1:
+            return [self.local.predict_entities(texts[0], labels, threshold=threshold)]
+        return self.local.batch_predict_entities(texts, labels, threshold=threshold)
+
+
+def connect_daemon(model_path, url=None, backend=DEFAULT_BACKEND, mmap_weights=False):
+    """Renvoie un DaemonModel si un daemon sert ce modèle avec ce backend, None sinon"""
+    url = url or daemon_url()
+    if url is None:
+        return None
+
+    try:
+        info = _request(f"{url.rstrip('/')}/health", timeout=HEALTH_TIMEOUT)
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+    if Path(info.get('model', '')).resolve() != Path(model_path).resolve():
+        print(f"Warning: GLiNER daemon at {url} serves {info.get('model')}, not {model_path}")
+        return None
+
+    if info.get('backend', DEFAULT_BACKEND) != backend:
+        print(f"Warning: GLiNER daemon at {url} uses the {info.get('backend')} backend, not {backend}")
+        return None
+
+    return DaemonModel(url, info, mmap_weights)
+
+
+def load_gliner(model_path, use_daemon=True, backend=DEFAULT_BACKEND, mmap_weights=False):
+    """Modèle GLiNER : via le daemon s'il tourne, sinon chargé dans le processus"""
+    if use_daemon:
+        model = connect_daemon(model_path, backend=backend, mmap_weights=mmap_weights)
+        if model is not None:
+            print(f"Using GLiNER daemon at {model.url}")
+            return model
+
+    return load_backend(model_path, backend, mmap_weights)
+
+
+def make_handler(model, model_path, backend=DEFAULT_BACKEND):
+    """Handler HTTP lié au modèle chargé (les appels au modèle sont sérialisés)"""
+    lock = threading.Lock()
+    info = {
+        'model': str(Path(model_path).resolve()),
+        'max_len': getattr(getattr(model, 'config', None), 'max_len', 384),
+        'backend': backend,
+    }
+
+    class PredictHandler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False, default=float).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send(200, info)
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path != '/predict':
+                self._send(404, {'error': 'not found'})
+                return
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length).decode('utf-8'))
+                texts = request['texts']
+                labels = request['labels']
+                threshold = float(request.get('threshold', 0.5))
+            except (ValueError, KeyError) as e:
+                self._send(400, {'error': f'bad request: {e}'})
+                return
+
+            try:
+                with lock:
+                    if len(texts) == 1:
+                        predictions = [model.predict_entities(texts[0], labels, threshold=threshold)]
+                    else:
+                        predictions = model.batch_predict_entities(texts, labels, threshold=threshold)
+            except Exception as e:
+                self._send(500, {'error': f'{type(e).__name__}: {e}'})
+                return
+
+            self._send(200, {'predictions': predictions})
+
+        def log_message(self, format, *args):
+            # Pas de log par requête
+            pass
+
+    return PredictHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Local GLiNER inference daemon (keeps the model loaded between runs)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example usage:
+  python gliner_daemon.py --model models/checkpoints/gliner_multi-v2.1 &
+  python run_ner_pipeline.py --folder R1048-13C-23516-23516   # uses the daemon
+
+The client looks for the daemon at GLINER_DAEMON_URL (default http://127.0.0.1:8765);
+set GLINER_DAEMON=0 to always load the model in-process.
+        """
+    )
+
+    parser.add_argument('--model', type=Path, required=True, help='Path to GLiNER model')
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST, help='Bind address (localhost only by default)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port')
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help='Inference backend (torch, torch-int8 dynamic quantization, onnx runtime)')
+
+    args = parser.parse_args()
+
+    if not args.model.exists():
+        print(f"Error: Model not found: {args.model}")
+        sys.exit(1)
+
+    print(f"Loading GLiNER model from: {args.model} ({args.backend})")
+    model = load_backend(args.model, args.backend)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(model, args.model, args.backend))
+    print(f"GLiNER daemon listening on http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Mode incrémental du pipeline NER
+Un manifeste (chemin du document, hash du contenu, empreinte modèle/config) et les prédictions
+brutes du run précédent sont gardés dans outputs/incremental/ : seuls les documents nouveaux ou
+modifiés repassent dans le modèle, les documents supprimés sont retirés, les autres reprennent
+leurs résultats stockés.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from collections import defaultdict
+
+from results_dataset import ResultsWriter, read_results
+
+
+MANIFEST_FILE = "manifest.json"
+RESULTS_FILE = "results.jsonl"
+
+
+def content_hash(file_path):
+    """Hash du contenu d'un document OCR"""
+    return hashlib.blake2b(Path(file_path).read_bytes(), digest_size=16).hexdigest()
+
+
+def run_fingerprint(config):
+    """Empreinte de la configuration qui détermine les prédictions (modèle, labels, seuil, chunker...)"""
+    payload = json.dumps(config, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def document_key(folder_name, document):
+    """Clé d'un document dans le manifeste : <DOSSIER>/<document>.md"""
+    return f"{folder_name}/{document}.md"
+
+
+def scan_documents(folders):
+    """Documents .md des dossiers : {clé: chemin}, dans l'ordre d'un run complet"""
+    documents = {}
+    for folder_path in sorted(folders):
+        for md_file in sorted(folder_path.glob("*.md")):
+            documents[document_key(folder_path.name, md_file.stem)] = md_file
+    return documents
+
+
+def merge_documents(folder_results, documents, processed, stored):
+    """
+    Fusionne les résultats des documents traités pendant ce run avec des résultats déjà connus
+    folder_results : (dossier, résultats) des seuls documents traités, dossiers dans l'ordre
+    documents : {clé: chemin} de tous les documents du run ; processed : clés traitées ce run
+    stored : {clé: résultats} des autres documents
+    Yields: (dossier, résultats de tous ses documents), dans l'ordre d'un run complet
+    """
+    documents_by_folder = defaultdict(list)
+    for key, md_file in documents.items():
+        documents_by_folder[key.split('/', 1)[0]].append((md_file.name, key))
+
+    def folder_merged(folder_name, new_results):
+        by_document = defaultdict(list)
+        for result in new_results:
+            by_document[document_key(result['Folder'], result['Document'])].append(result)
+
+        merged = []
+        for _, key in sorted(documents_by_folder[folder_name]):
+            merged.extend(by_document[key] if key in processed else stored.get(key, []))
+        return merged
+
+    pending = sorted(documents_by_folder)
+    for folder_name, new_results in folder_results:
+        # Dossiers jusqu'à celui-ci (les précédents n'ont aucun document traité)
+        while pending and pending[0] <= folder_name:
+            pending_name = pending.pop(0)
+            yield pending_name, folder_merged(pending_name,
+                                              new_results if pending_name == folder_name else [])
+
+    for folder_name in pending:
+        yield folder_name, folder_merged(folder_name, [])
+
+
+class IncrementalPlan:
+    """Documents à traiter, repris ou supprimés pour ce run"""
+
+    def __init__(self):
+        self.documents = {}   # clé -> chemin du .md, tous les documents du périmètre
+        self.hashes = {}      # clé -> hash du contenu
+        self.changed = set()  # clés à (re)traiter
+        self.new = 0
+        self.deleted = []
+
+    @property
+    def to_process(self):
+        """Chemins des documents à passer dans le modèle"""
+        return {self.documents[key] for key in self.changed}
+
+    def summary(self):
+        unchanged = len(self.documents) - len(self.changed)
+        return (f"Incremental: {len(self.documents)} documents, {self.new} new, "
+                f"{len(self.changed) - self.new} changed, {unchanged} unchanged, "
+                f"{len(self.deleted)} deleted")
+
+
+class IncrementalState:
+    """Manifeste + prédictions brutes stockées du dernier run incrémental"""
+
+    def __init__(self, state_dir, fingerprint):
+        self.state_dir = Path(state_dir)
+        self.fingerprint = fingerprint
+        self.manifest_path = self.state_dir / MANIFEST_FILE
+        self.results_path = self.state_dir / RESULTS_FILE
+        # Dossiers couverts par le run (None = tout le corpus)
+        self.scope = None
+
+        self.manifest = {}
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+
+    def plan(self, folders, full_scope=True):
+        """
+        Compare les documents des dossiers au manifeste
+        full_scope : les dossiers couvrent tout le corpus (sinon, les documents des autres
+        dossiers sont conservés tels quels et ne comptent pas comme supprimés)
+        """
+        plan = IncrementalPlan()
+        plan.documents = scan_documents(folders)
+        for key, md_file in plan.documents.items():
+            plan.hashes[key] = content_hash(md_file)
+
+            entry = self.manifest.get(key)
+            if entry is None:
+                plan.changed.add(key)
+                plan.new += 1
+            elif entry['hash'] != plan.hashes[key] or entry['fingerprint'] != self.fingerprint:
+                plan.changed.add(key)
+
+        scope = {folder_path.name for folder_path in folders}
+        plan.deleted = sorted(key for key in self.manifest
+                              if key not in plan.documents
+                              and (full_scope or key.split('/', 1)[0] in scope))
+        self.scope = None if full_scope else scope
+        return plan
+
+    def stored_results(self):
+        """Prédictions brutes stockées, groupées par clé de document"""
+        stored = defaultdict(list)
+        if self.results_path.exists():
+            for result in read_results(self.results_path):
+                stored[document_key(result['Folder'], result['Document'])].append(result)
+        return stored
+
+    def merge(self, folder_results, plan):
+        """
+        Fusionne les résultats des documents traités avec les résultats stockés (merge_documents) ;
+        le nouvel état est écrit au fil de l'eau puis validé par commit()
+        """
+        stored = self.stored_results()
+        self._tmp_results = self.results_path.with_suffix(f".{os.getpid()}.tmp")
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self._tmp_results.unlink(missing_ok=True)
+
+        with ResultsWriter(self._tmp_results) as writer:
+            for folder_name, merged in merge_documents(folder_results, plan.documents, plan.changed, stored):
+                writer.write(merged)
+                yield folder_name, merged
+
+            # Documents hors du périmètre de ce run : conservés dans l'état
+            if self.scope is not None:
+                for key, results in stored.items():
+                    if key.split('/', 1)[0] not in self.scope:
+                        writer.write(results)
+
+    def commit(self, plan):
+        """Valide le nouvel état (résultats puis manifeste) une fois le run terminé"""
+        manifest = {key: entry for key, entry in self.manifest.items()
+                    if key not in plan.deleted and key not in plan.documents}
+        for key in plan.documents:
+            manifest[key] = {'hash': plan.hashes[key], 'fingerprint': self.fingerprint}
+
+        os.replace(self._tmp_results, self.results_path)
+
+        tmp = self.manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(manifest.items())), f, indent=1)
+        os.replace(tmp, self.manifest_path)
+        self.manifest = manifest
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Backends d'inférence CPU pour GLiNER
+- torch : modèle fp32 (GLiNER.from_pretrained)
+- torch-int8 : quantification dynamique int8 des couches Linear (encodeur compris)
+- onnx : session ONNX Runtime, modèle exporté une fois et gardé à côté du checkpoint
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import os
+from pathlib import Path
+
+from inference_cache import model_fingerprint
+
+
+BACKENDS = ['torch', 'torch-int8', 'onnx']
+DEFAULT_BACKEND = 'torch'
+
+# Export ONNX, relatif au dossier du checkpoint (sous-dossier : n'entre pas dans model_fingerprint)
+ONNX_MODEL_FILE = "onnx/model.onnx"
+ONNX_OPSET = 14
+
+
+def backend_fingerprint(model_path, backend=DEFAULT_BACKEND):
+    """Identifiant modèle + backend (clé du cache de prédictions)"""
+    fingerprint = model_fingerprint(model_path)
+    if backend == DEFAULT_BACKEND:
+        return fingerprint
+    return f"{fingerprint}-{backend}"
+
+
+def onnx_model_path(model_path):
+    return Path(model_path) / ONNX_MODEL_FILE
+
+
+def export_onnx(model, onnx_path):
+    """Exporte le réseau GLiNER en ONNX (axes batch / longueur dynamiques)"""
+    import torch
+
+    if hasattr(model, 'export_to_onnx'):
+        # Exporteur intégré des versions récentes de GLiNER
+        tmp_name = f"model.{os.getpid()}.tmp.onnx"
+        model.export_to_onnx(onnx_path.parent, onnx_filename=tmp_name)
+        os.replace(onnx_path.parent / tmp_name, onnx_path)
+        return
+
+    text = "The League of Nations met in Geneva with Edmond Privat."
+    labels = ["person", "organization", "location"]
+    inputs, _ = model.prepare_model_inputs([text], labels)
+
+    input_names = ['input_ids', 'attention_mask', 'words_mask', 'text_lengths']
+    dynamic_axes = {
+        'input_ids': {0: 'batch_size', 1: 'sequence_length'},
+        'attention_mask': {0: 'batch_size', 1: 'sequence_length'},
+        'words_mask': {0: 'batch_size', 1: 'sequence_length'},
+        'text_lengths': {0: 'batch_size', 1: 'value'},
+        'logits': {0: 'position', 1: 'batch_size', 2: 'sequence_length', 3: 'num_classes'},
+    }
+    if model.config.span_mode != 'token_level':
+        input_names += ['span_idx', 'span_mask']
+        dynamic_axes['span_idx'] = {0: 'batch_size', 1: 'num_spans', 2: 'idx'}
+        dynamic_axes['span_mask'] = {0: 'batch_size', 1: 'num_spans'}
+
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = onnx_path.with_suffix(f".{os.getpid()}.tmp")
+    torch.onnx.export(model.model, tuple(inputs[name] for name in input_names), str(tmp),
+                      input_names=input_names, output_names=['logits'],
+                      dynamic_axes=dynamic_axes, opset_version=ONNX_OPSET)
+    os.replace(tmp, onnx_path)
+
+
+def ensure_onnx_model(model_path):
+    """Exporte le modèle ONNX s'il n'est pas déjà à côté du checkpoint"""
+    onnx_path = onnx_model_path(model_path)
+    if not onnx_path.exists():
+        from gliner import GLiNER
+
+        print(f"Exporting ONNX model to: {onnx_path}")
+        export_onnx(GLiNER.from_pretrained(str(model_path)), onnx_path)
+    return onnx_path
+
+
+def load_backend(model_path, backend=DEFAULT_BACKEND, mmap_weights=False):
+    """
+    Charge GLiNER dans le processus avec le backend demandé
+    mmap_weights : poids fp32 mappés depuis un fichier safetensors (pages partagées entre workers)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    if mmap_weights and backend != 'torch':
+        raise ValueError("Memory-mapped weights require the torch backend")
+
+    from gliner import GLiNER
+
+    if backend == 'onnx':
+        ensure_onnx_model(model_path)
+        return GLiNER.from_pretrained(str(model_path), load_onnx_model=True, load_tokenizer=True,
+                                      onnx_model_file=ONNX_MODEL_FILE)
+
+    if mmap_weights:
+        from shared_weights import load_mmap_model
+        model = load_mmap_model(model_path)
+    else:
+        model = GLiNER.from_pretrained(str(model_path))
+
+    if backend == 'torch-int8':
+        import torch
+
+        model.eval()
+        torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    return model
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Cache disque des prédictions GLiNER
+Les prédictions brutes de chaque chunk sont stockées sous une clé
+hash(texte du chunk, modèle, labels, seuil d'inférence)
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+
+
+def model_fingerprint(model_path):
+    """Identifie la révision d'un modèle local (chemin + taille/date des fichiers)"""
+    model_path = Path(model_path).resolve()
+    parts = [str(model_path)]
+
+    if model_path.is_dir():
+        for f in sorted(model_path.iterdir()):
+            if f.is_file():
+                stat = f.stat()
+                parts.append(f"{f.name}:{stat.st_size}:{int(stat.st_mtime)}")
+
+    return hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+class InferenceCache:
+    """Cache LRU sur disque, borné en taille, une entrée JSON par chunk"""
+
+    def __init__(self, cache_dir: Path, model_id: str, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.model_id = model_id
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.rescan()
+
+    def rescan(self):
+        """Recalcule la taille du cache (entrées écrites par d'autres processus)"""
+        self.total_bytes = sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        """(mtime, taille, chemin) des entrées, sauf celles évincées entre-temps par un autre processus"""
+        entries = []
+        for f in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = f.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, f))
+        return entries
+
+    def key(self, text, labels, threshold):
+        """Clé de contenu d'un chunk pour ce modèle, ces labels et ce seuil"""
+        payload = json.dumps([self.model_id, list(labels), threshold, text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Renvoie les prédictions en cache ou None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entities = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        # Mise à jour de la date d'accès pour l'éviction LRU (l'entrée lue reste valide
+        # si un autre processus vient de l'évincer)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return entities
+
+    def put(self, key, entities):
+        """Stocke les prédictions d'un chunk (écriture atomique)"""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entities, f, ensure_ascii=False)
+
+        try:
+            old_size = path.stat().st_size
+        except FileNotFoundError:
+            old_size = 0
+        new_size = tmp_path.stat().st_size
+        os.replace(tmp_path, path)
+        self.total_bytes += new_size - old_size
+
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Supprime les entrées les moins récemment utilisées jusqu'à 90% de la taille max"""
+        entries = sorted(self._entries())
+
+        target = int(self.max_bytes * 0.9)
+        self.total_bytes = sum(size for _, size, _ in entries)
+        for _, size, f in entries:
+            if self.total_bytes <= target:
+                break
+            try:
+                f.unlink()
+                self.evictions += 1
+            except FileNotFoundError:
+                pass  # déjà évincée par un autre processus
+            self.total_bytes -= size
+
+    def summary(self):
+        """Résumé des compteurs du cache"""
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return (f"Cache: {self.hits} hits, {self.misses} misses ({hit_rate:.1%} hit rate), "
+                f"{self.evictions} evictions, {self.total_bytes / 1024 / 1024:.1f} MB in {self.cache_dir}")
+
+
+class CachedModel:
+    """Enveloppe un modèle GLiNER : ne l'appelle que pour les chunks absents du cache"""
+
+    def __init__(self, model, cache: InferenceCache):
+        self.model = model
+        self.cache = cache
+
+    def __getattr__(self, name):
+        # config, data_processor... du modèle enveloppé
+        return getattr(self.model, name)
+
+    def predict_entities(self, text, labels, threshold=0.5):
+        key = self.cache.key(text, labels, threshold)
+        entities = self.cache.get(key)
+        if entities is None:
+            entities = self.model.predict_entities(text, labels, threshold=threshold)
+            self.cache.put(key, entities)
+        return entities
+
+    def batch_predict_entities(self, texts, labels, threshold=0.5):
+        keys = [self.cache.key(text, labels, threshold) for text in texts]
+        predictions = [self.cache.get(key) for key in keys]
+
+        missing = [i for i, entities in enumerate(predictions) if entities is None]
+        if missing:
+            computed = self.model.batch_predict_entities(
+                [texts[i] for i in missing], labels, threshold=threshold
+            )
+            for i, entities in zip(missing, computed):
+                self.cache.put(keys[i], entities)
+                predictions[i] = entities
+
+        return predictions
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Dataset de résultats NER écrit au fil du run
+Chaque lot (un dossier) est ajouté dès qu'il est traité : un crash ne perd que le dossier en cours.
+Formats : JSONL (un fichier, une ligne par mention) ou Parquet (un répertoire, un fichier par lot)
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import os
+import json
+import shutil
+import itertools
+from pathlib import Path
+import pandas as pd
+
+
+RESULT_FORMATS = ['jsonl', 'parquet']
+
+
+def dataset_path(output_dir: Path, name: str, fmt: str) -> Path:
+    """Chemin du dataset pour un format donné"""
+    return output_dir / f"{name}.{fmt}"
+
+
+def remove_dataset(path: Path):
+    """Supprime un dataset (fichier JSONL ou répertoire Parquet) s'il existe"""
+    path = Path(path)
+    if path.is_dir():
+        shutil.rmtree(path)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def create_results_dataset(output_dir: Path, timestamp: str, fmt: str, suffix: str = ''):
+    """
+    Crée le dataset ner_results_<horodatage><suffixe> d'un run ; si un run lancé dans la même
+    seconde l'a déjà créé, prend l'horodatage libre suivant (<horodatage>_2, _3...)
+    Returns: (horodatage retenu, ResultsWriter)
+    """
+    stamp = timestamp
+    for n in itertools.count(2):
+        try:
+            return stamp, ResultsWriter(dataset_path(output_dir, f"ner_results_{stamp}{suffix}", fmt), fmt)
+        except FileExistsError:
+            stamp = f"{timestamp}_{n}"
+
+
+class ResultsWriter:
+    """
+    Ajoute les résultats par lots à un nouveau dataset JSONL ou Parquet
+    Raises: FileExistsError si le dataset existe déjà (jamais complété par un second run)
+    """
+
+    def __init__(self, path: Path, fmt: str = 'jsonl'):
+        if fmt not in RESULT_FORMATS:
+            raise ValueError(f"Unknown results format: {fmt}")
+
+        self.path = Path(path)
+        self.fmt = fmt
+        self.rows = 0
+        self.batches = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == 'parquet':
+            self.path.mkdir()
+            self._file = None
+        else:
+            self._file = open(self.path, 'x', encoding='utf-8')
+
+    def write(self, results):
+        """Ajoute un lot de résultats et le rend durable sur disque"""
+        if not results:
+            return
+
+        if self.fmt == 'parquet':
+            part = self.path / f"part-{self.batches:05d}.parquet"
+            tmp = part.with_suffix('.tmp')
+            pd.DataFrame(results).to_parquet(tmp, index=False)
+            os.replace(tmp, part)
+        else:
+            for result in results:
+                self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+        self.rows += len(results)
+        self.batches += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_results(path: Path):
+    """
+    Relit un dataset de résultats (JSONL ou répertoire Parquet)
+    Returns: liste de dicts, dans l'ordre d'écriture
+    """
+    path = Path(path)
+
+    if path.is_dir():
+        parts = sorted(path.glob("part-*.parquet"))
+        if not parts:
+            return []
+        df = pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+        return df.to_dict('records')
+
+    results = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Dernière ligne tronquée par un crash
+                break
+    return results
+
+
+def iter_results(path: Path, chunk_rows: int = 1_000_000):
+    """
+    Relit un dataset de résultats par blocs d'au plus chunk_rows lignes (mémoire bornée)
+    Yields: listes de dicts, dans l'ordre d'écriture
+    """
+    path = Path(path)
+
+    if path.is_dir():
+        for part in sorted(path.glob("part-*.parquet")):
+            records = pd.read_parquet(part).to_dict('records')
+            for start in range(0, len(records), chunk_rows):
+                yield records[start:start + chunk_rows]
+        return
+
+    chunk = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                chunk.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Dernière ligne tronquée par un crash
+                break
+            if len(chunk) == chunk_rows:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
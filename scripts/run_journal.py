@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Journal d'un run NER, document par document (reprise après interruption)
+Fichier append-only : une ligne JSON par document terminé (ses prédictions brutes), écrite
+en un seul write puis fsync. Une ligne tronquée par un crash est ignorée puis coupée à la reprise.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import os
+import json
+from pathlib import Path
+
+from incremental import document_key
+
+
+JOURNAL_VERSION = 1
+
+JOURNAL_PREFIX = "ner_journal_"
+
+
+def journal_path(output_dir, timestamp):
+    return Path(output_dir) / f"{JOURNAL_PREFIX}{timestamp}.jsonl"
+
+
+def journal_timestamp(path):
+    """Horodatage (suffixe de shard compris) du run qui a écrit ce journal, None si nom non standard"""
+    name = Path(path).stem
+    return name[len(JOURNAL_PREFIX):] if name.startswith(JOURNAL_PREFIX) else None
+
+
+def latest_journal(output_dir, suffix=''):
+    """
+    Journal le plus récent du dossier de sortie (run interrompu), None s'il n'y en a pas
+    suffix : suffixe de shard ('_shard<i>of<N>'), les journaux des autres shards sont ignorés
+    """
+    journals = sorted(path for path in Path(output_dir).glob(f"{JOURNAL_PREFIX}*{suffix}.jsonl")
+                      if suffix or '_shard' not in path.stem)
+    return journals[-1] if journals else None
+
+
+class RunJournal:
+    """Documents terminés d'un run ; documents : ceux relus par load() {clé: prédictions brutes}"""
+
+    def __init__(self, path, fingerprint):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.documents = {}
+        self._file = None
+
+    def load(self):
+        """
+        Relit les documents journalisés et coupe une éventuelle ligne tronquée en fin de fichier
+        Raises: ValueError si le journal vient d'une autre configuration modèle
+        """
+        valid_size = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                if not line.endswith(b"\n"):
+                    break
+
+                if 'fingerprint' in record:
+                    if record['fingerprint'] != self.fingerprint:
+                        raise ValueError(f"Journal {self.path} was written with another model/config")
+                else:
+                    self.documents[document_key(record['folder'], record['document'])] = record['results']
+                valid_size += len(line)
+
+        if valid_size < self.path.stat().st_size:
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_size)
+        return self.documents
+
+    def open(self):
+        """Ouvre le journal en ajout (en-tête écrit à la création)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        new = not self.path.exists() or self.path.stat().st_size == 0
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if new:
+            self._append({'journal': JOURNAL_VERSION, 'fingerprint': self.fingerprint})
+        return self
+
+    def _append(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record(self, folder_name, document, results):
+        """Journalise un document terminé (même sans entité)"""
+        self._append({'folder': folder_name, 'document': document, 'results': results})
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Run terminé : le dataset de résultats fait foi"""
+        self.close()
+        self.path.unlink(missing_ok=True)
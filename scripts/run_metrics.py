@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Métriques de débit du pipeline NER (--metrics, --progress)
+Compteurs (documents, chunks, tokens, entités par label) et histogrammes (latence d'inférence
+par appel au modèle, attente de la file de préchargement), écrits au format texte Prometheus
+(collecteur textfile de node_exporter) ; ligne tqdm optionnelle avec débit et ETA.
+Désactivé, les fonctions observe_* ne font rien.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import os
+import time
+from pathlib import Path
+from collections import defaultdict
+
+
+# Métriques actives du processus (None = désactivées)
+_active = None
+
+INFERENCE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+
+# Écriture du fichier au plus toutes les WRITE_INTERVAL secondes pendant le run
+WRITE_INTERVAL = 15
+
+
+class Histogram:
+    """Histogramme cumulatif au sens Prometheus (compte par borne supérieure, somme, total)"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def merge(self, counts, total, count):
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.sum += total
+        self.count += count
+
+    def snapshot(self):
+        return list(self.counts), self.sum, self.count
+
+
+class RunMetrics:
+    """Métriques d'un run ; les workers renvoient les leurs via drain(), fusionnées par merge()"""
+
+    def __init__(self):
+        self.start = time.time()
+        self.expected_documents = 0
+        self.documents = 0
+        self.chunks = 0
+        self.tokens = 0
+        self.entities = defaultdict(int)
+        self.inference_seconds = Histogram(INFERENCE_BUCKETS)
+        self.queue_wait_seconds = Histogram(QUEUE_WAIT_BUCKETS)
+
+        self.path = None
+        self.labels = {}
+        self.completed = False
+        self._last_write = 0.0
+        self._progress = None
+
+    def enable_progress(self):
+        """Ligne tqdm (documents, débit, ETA) mise à jour à chaque document terminé"""
+        try:
+            from tqdm import tqdm
+        except ImportError:
+            print("Warning: tqdm not installed, no progress line")
+            return
+        self._progress = tqdm(total=self.expected_documents or None, unit='doc', desc='NER',
+                              dynamic_ncols=True)
+
+    def record_document(self, results):
+        """Document terminé (processus principal, tous modes) : entités par label"""
+        self.documents += 1
+        for result in results:
+            self.entities[result['Type']] += 1
+
+        if self._progress is not None:
+            elapsed = max(time.time() - self.start, 1e-9)
+            self._progress.set_postfix_str(f"{self.chunks / elapsed:.1f} chunks/s, "
+                                           f"{self.tokens / elapsed:.0f} tokens/s", refresh=False)
+            self._progress.update(1)
+
+        if self.path is not None and time.time() - self._last_write >= WRITE_INTERVAL:
+            self.write()
+
+    def merge(self, snapshot):
+        """Ajoute les compteurs d'un worker (drain())"""
+        chunks, tokens, inference, queue_wait = snapshot
+        self.chunks += chunks
+        self.tokens += tokens
+        self.inference_seconds.merge(*inference)
+        self.queue_wait_seconds.merge(*queue_wait)
+
+    def rates(self):
+        """(documents/s, chunks/s, tokens/s, ETA en secondes ou None) depuis le début du run"""
+        elapsed = max(time.time() - self.start, 1e-9)
+        docs_per_second = self.documents / elapsed
+        eta = None
+        if self.expected_documents and docs_per_second > 0:
+            eta = max(self.expected_documents - self.documents, 0) / docs_per_second
+        return docs_per_second, self.chunks / elapsed, self.tokens / elapsed, eta
+
+    def render(self):
+        """Métriques au format texte Prometheus"""
+        base_labels = ','.join(f'{key}="{value}"' for key, value in sorted(self.labels.items()))
+
+        def sample(name, value, **labels):
+            pairs = ','.join(filter(None, [base_labels] + [f'{k}="{v}"' for k, v in labels.items()]))
+            return f"{name}{{{pairs}}} {value}" if pairs else f"{name} {value}"
+
+        def metric(name, metric_type, description, samples):
+            return [f"# HELP {name} {description}", f"# TYPE {name} {metric_type}"] + samples
+
+        def histogram(name, description, hist):
+            samples = []
+            cumulative = 0
+            for bound, count in zip(hist.buckets, hist.counts):
+                cumulative += count
+                samples.append(sample(f"{name}_bucket", cumulative, le=bound))
+            samples.append(sample(f"{name}_bucket", hist.count, le='+Inf'))
+            samples.append(sample(f"{name}_sum", round(hist.sum, 6)))
+            samples.append(sample(f"{name}_count", hist.count))
+            return metric(name, 'histogram', description, samples)
+
+        docs_per_second, chunks_per_second, tokens_per_second, eta = self.rates()
+        lines = []
+        lines += metric('ner_documents_total', 'counter', 'Documents processed',
+                        [sample('ner_documents_total', self.documents)])
+        lines += metric('ner_chunks_total', 'counter', 'Chunks sent to the model',
+                        [sample('ner_chunks_total', self.chunks)])
+        lines += metric('ner_tokens_total', 'counter', 'Whitespace tokens in the chunks sent to the model',
+                        [sample('ner_tokens_total', self.tokens)])
+        lines += metric('ner_entities_total', 'counter', 'Raw predicted entities by label',
+                        [sample('ner_entities_total', count, label=label)
+                         for label, count in sorted(self.entities.items())])
+        lines += histogram('ner_inference_batch_seconds', 'Model call latency (one batch or one chunk)',
+                           self.inference_seconds)
+        lines += histogram('ner_queue_wait_seconds', 'Wait for the next prefetched document',
+                           self.queue_wait_seconds)
+        lines += metric('ner_documents_expected', 'gauge', 'Documents selected for this run',
+                        [sample('ner_documents_expected', self.expected_documents)])
+        lines += metric('ner_documents_per_second', 'gauge', 'Average documents/s since the run started',
+                        [sample('ner_documents_per_second', round(docs_per_second, 4))])
+        lines += metric('ner_chunks_per_second', 'gauge', 'Average chunks/s since the run started',
+                        [sample('ner_chunks_per_second', round(chunks_per_second, 4))])
+        lines += metric('ner_tokens_per_second', 'gauge', 'Average tokens/s since the run started',
+                        [sample('ner_tokens_per_second', round(tokens_per_second, 2))])
+        if eta is not None:
+            lines += metric('ner_eta_seconds', 'gauge', 'Estimated time left at the average rate',
+                            [sample('ner_eta_seconds', round(eta, 1))])
+        lines += metric('ner_run_start_time_seconds', 'gauge', 'Run start (Unix time)',
+                        [sample('ner_run_start_time_seconds', round(self.start, 3))])
+        lines += metric('ner_run_last_update_time_seconds', 'gauge', 'Last metrics update (Unix time)',
+                        [sample('ner_run_last_update_time_seconds', round(time.time(), 3))])
+        lines += metric('ner_run_completed', 'gauge', '1 once all documents are written',
+                        [sample('ner_run_completed', int(self.completed))])
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        """Écrit le fichier (remplacement atomique : le collecteur ne lit jamais un fichier partiel)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp, self.path)
+        self._last_write = time.time()
+
+    def close(self):
+        """Fin du run : ligne de progression fermée, fichier écrit une dernière fois"""
+        self.completed = True
+        if self._progress is not None:
+            self._progress.close()
+            self._progress = None
+        if self.path is not None:
+            self.write()
+
+    def summary(self):
+        docs_per_second, chunks_per_second, tokens_per_second, _ = self.rates()
+        inference = self.inference_seconds
+        mean_ms = inference.sum / inference.count * 1000 if inference.count else 0.0
+        return (f"Throughput: {self.documents} documents ({docs_per_second:.2f}/s), "
+                f"{self.chunks} chunks ({chunks_per_second:.1f}/s), {tokens_per_second:.0f} tokens/s, "
+                f"{inference.count} model calls ({mean_ms:.1f} ms avg)")
+
+
+def enable(path=None, labels=None):
+    """Active les métriques dans ce processus (path : fichier .prom, None = pas de fichier)"""
+    global _active
+    if _active is None:
+        _active = RunMetrics()
+    _active.path = Path(path) if path is not None else None
+    _active.labels = labels or {}
+    return _active
+
+
+def active():
+    """Métriques actives, None si désactivées"""
+    return _active
+
+
+def observe_inference(seconds, chunks):
+    """Un appel au modèle (un batch ou un chunk) sur la liste de chunks donnée"""
+    if _active is None:
+        return
+    _active.chunks += len(chunks)
+    _active.tokens += sum(len(chunk.split()) for chunk in chunks)
+    _active.inference_seconds.observe(seconds)
+
+
+def observe_queue_wait(seconds):
+    """Attente du thread principal pour le document préchargé suivant"""
+    if _active is not None:
+        _active.queue_wait_seconds.observe(seconds)
+
+
+def drain():
+    """Compteurs enregistrés depuis le dernier appel (renvoyés par les workers au processus principal)"""
+    global _active
+    if _active is None:
+        return None
+    snapshot = (_active.chunks, _active.tokens, _active.inference_seconds.snapshot(),
+                _active.queue_wait_seconds.snapshot())
+    _active = RunMetrics()
+    return snapshot
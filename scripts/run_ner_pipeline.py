@@ -6,14 +6,35 @@ Author: Claude Code
 Date: 2025-11-16
 """
 
+import os
 import re
 import sys
+import time
+import resource
+import multiprocessing
 import argparse
 from pathlib import Path
-from collections import defaultdict
+from functools import partial
 from datetime import datetime
+import numpy as np
 import pandas as pd
-from gliner import GLiNER
+
+from gliner_daemon import load_gliner
+from chunk_dedup import DedupModel, DEFAULT_NEAR_DUP_THRESHOLD
+from gazetteer import CascadeModel, gazetteer_fingerprint, load_gazetteer
+from inference_backends import BACKENDS, DEFAULT_BACKEND, backend_fingerprint, ensure_onnx_model
+from inference_cache import InferenceCache, CachedModel
+from shared_weights import ensure_mmap_weights
+from incremental import IncrementalState, run_fingerprint, scan_documents, merge_documents
+from run_journal import RunJournal, journal_path, journal_timestamp, latest_journal
+from document_prefetch import DocumentPrefetcher, DEFAULT_PREFETCH_DEPTH, DEFAULT_PREFETCH_THREADS
+import run_metrics
+import stage_profiler
+from stage_profiler import stage
+from excel_writer import EXCEL_ENGINES, DEFAULT_EXCEL_ENGINE, write_sheets
+from results_dataset import (RESULT_FORMATS, ResultsWriter, create_results_dataset, remove_dataset,
+                             read_results, iter_results, dataset_path)
+from threshold_sweep import run_sweep, parse_grid, DEFAULT_GRID
 
 
 # Configuration par défaut
@@ -21,15 +42,50 @@ DEFAULT_MODEL_PATH = "/home/steeven/PycharmProjects/gliner2Tests/models/checkpoi
 PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data/annotated/ocr_results"
 OUTPUT_DIR = PROJECT_ROOT / "outputs"
+CACHE_DIR = PROJECT_ROOT / "outputs/cache/ner_predictions"
+
+# Taille max du cache de prédictions (Mo)
+DEFAULT_CACHE_SIZE_MB = 512
 
 # Labels NER à extraire
 LABELS = ["person", "organization", "location"]
 
+# Identifiant numérique de chaque label et type correspondant dans les rapports
+LABEL_IDS = {label: i for i, label in enumerate(LABELS)}
+ENTITY_TYPES = ['PERSON', 'ORGANIZATION', 'GPE']
+
+# Seuil passé au modèle (le filtrage fin se fait ensuite par type)
+INFERENCE_THRESHOLD = 0.35
+
+# Taille de batch par défaut (1 = un appel au modèle par chunk)
+DEFAULT_BATCH_SIZE = 1
+
+# Chunker par défaut : 'words' (smart_chunk, 400 mots) ou 'tokens' (tokenizer GLiNER)
+DEFAULT_CHUNKER = 'words'
+
+# Overlap (en tokens) du chunker tokenizer
+TOKEN_CHUNK_OVERLAP = 50
+
+# Découpage en mots de GLiNER (utilisé si le modèle n'expose pas son words splitter)
+GLINER_WORD_RE = re.compile(r'\w+(?:[-_]\w+)*|\S')
+
+# Bornes des buckets de longueur (en mots) pour l'ordonnanceur corpus
+DEFAULT_BUCKET_EDGES = [64, 128, 256]
+
+# Colonnes du rapport Excel dédupliqué (Start/End ne servent qu'au niveau mention)
+REPORT_COLUMNS = ['Folder', 'Document', 'Entity', 'Type', 'Score']
+
 # Scores minimums pour filtrage
 MIN_SCORE_PERSON = 0.60
 MIN_SCORE_ORG = 0.70
 MIN_SCORE_LOC = 0.65
 
+# Score minimum par label id (même ordre que LABELS)
+MIN_SCORES = [MIN_SCORE_PERSON, MIN_SCORE_ORG, MIN_SCORE_LOC]
+
+# Lignes lues par bloc pour dédupliquer un dataset sans le charger en entier
+DEDUP_CHUNK_ROWS = 1_000_000
+
 
 def clean_markdown(text):
     """Nettoie le texte Markdown OCR"""
@@ -79,14 +135,140 @@ def smart_chunk(text, max_length=400, overlap=50):
     return chunks
 
 
+def sentence_spans(text):
+    """Positions (start, end) des phrases, mêmes frontières que smart_chunk"""
+    spans = []
+    start = 0
+    for m in re.finditer(r'(?<=[.!?])\s+', text):
+        spans.append((start, m.start()))
+        start = m.end()
+    spans.append((start, len(text)))
+    return [(s, e) for s, e in spans if e > s]
+
+
+def split_long_span(text, start, end, count_tokens, max_tokens):
+    """Redécoupe au niveau des mots une phrase plus longue que max_tokens"""
+    units = []
+    unit_start = None
+    unit_end = None
+    unit_len = 0
+
+    for m in re.finditer(r'\S+', text[start:end]):
+        n = count_tokens(m.group())
+        if unit_start is not None and unit_len + n > max_tokens:
+            units.append((unit_start, unit_end, unit_len))
+            unit_start = None
+            unit_len = 0
+        if unit_start is None:
+            unit_start = start + m.start()
+        unit_end = start + m.end()
+        unit_len += n
+
+    if unit_start is not None:
+        units.append((unit_start, unit_end, unit_len))
+    return units
+
+
+def token_chunk(text, count_tokens, max_tokens, overlap=TOKEN_CHUNK_OVERLAP):
+    """
+    Découpe en chunks remplis jusqu'à max_tokens (tokens du modèle), avec overlap
+    Chaque chunk est une tranche exacte du texte : text[offset:offset + len(chunk)]
+    Returns: (chunks, offsets)
+    """
+    units = []
+    for start, end in sentence_spans(text):
+        n = count_tokens(text[start:end])
+        if n <= max_tokens:
+            units.append((start, end, n))
+        else:
+            units.extend(split_long_span(text, start, end, count_tokens, max_tokens))
+
+    chunks = []
+    offsets = []
+    current = []
+    current_length = 0
+
+    for unit in units:
+        if current and current_length + unit[2] > max_tokens:
+            chunks.append(text[current[0][0]:current[-1][1]])
+            offsets.append(current[0][0])
+
+            # Overlap
+            overlap_units = []
+            overlap_len = 0
+            for u in reversed(current):
+                if overlap_len + u[2] > overlap:
+                    break
+                overlap_units.insert(0, u)
+                overlap_len += u[2]
+
+            # L'overlap ne doit pas empêcher la phrase courante de tenir dans le chunk
+            while overlap_units and overlap_len + unit[2] > max_tokens:
+                overlap_len -= overlap_units.pop(0)[2]
+
+            current = overlap_units
+            current_length = overlap_len
+
+        current.append(unit)
+        current_length += unit[2]
+
+    if current:
+        chunks.append(text[current[0][0]:current[-1][1]])
+        offsets.append(current[0][0])
+
+    return chunks, offsets
+
+
+def word_chunker(text):
+    """Chunker historique (smart_chunk), sans positions"""
+    return smart_chunk(text, max_length=400, overlap=50), None
+
+
+def make_token_chunker(model, max_tokens=None, overlap=TOKEN_CHUNK_OVERLAP):
+    """
+    Chunker aligné sur le tokenizer GLiNER
+    GLiNER tronque chaque texte à config.max_len tokens de son words splitter :
+    les chunks sont remplis jusqu'à cette limite
+    """
+    data_processor = getattr(model, 'data_processor', None)
+    splitter = getattr(data_processor, 'words_splitter', None)
+
+    if splitter is not None:
+        def count_tokens(text):
+            return sum(1 for _ in splitter(text))
+    else:
+        def count_tokens(text):
+            return len(GLINER_WORD_RE.findall(text))
+
+    if max_tokens is None:
+        max_tokens = getattr(getattr(model, 'config', None), 'max_len', 384)
+
+    def chunker(text):
+        return token_chunk(text, count_tokens, max_tokens, overlap)
+
+    return chunker
+
+
+def get_chunker(name, model):
+    """Renvoie le chunker demandé ('words' ou 'tokens')"""
+    if name == 'tokens':
+        return make_token_chunker(model)
+    return word_chunker
+
+
 def extract_context(entity, full_text, window=150):
     """Extrait contexte autour d'une entité"""
-    text_lower = full_text.lower()
-    entity_lower = entity['text'].lower()
+    start = entity.get('start', -1)
+    if full_text[start:entity.get('end', -1)] == entity['text']:
+        # Position exacte de la mention (offsets absolus du chunker tokenizer)
+        pos = start
+    else:
+        text_lower = full_text.lower()
+        entity_lower = entity['text'].lower()
 
-    pos = text_lower.find(entity_lower)
-    if pos == -1:
-        return ""
+        pos = text_lower.find(entity_lower)
+        if pos == -1:
+            return ""
 
     start = max(0, pos - window)
     end = min(len(full_text), pos + len(entity['text']) + window)
@@ -94,76 +276,309 @@ def extract_context(entity, full_text, window=150):
     return full_text[start:end]
 
 
-def process_document(file_path, folder_name, model, verbose=True):
-    """Traite un document et extrait les entités NER"""
-    if verbose:
-        print(f"  Processing: {file_path.name}")
+def load_model(model_path, cache_dir=None, cache_size_mb=DEFAULT_CACHE_SIZE_MB, use_daemon=True,
+               backend=DEFAULT_BACKEND, mmap_weights=False):
+    """
+    Charge GLiNER avec le backend demandé (via le daemon local s'il tourne), enveloppé
+    par le cache de prédictions si cache_dir est donné
+    """
+    model = load_gliner(model_path, use_daemon, backend, mmap_weights)
+
+    cache = None
+    if cache_dir is not None:
+        cache = InferenceCache(cache_dir, backend_fingerprint(model_path, backend),
+                               max_bytes=cache_size_mb * 1024 * 1024)
+        model = CachedModel(model, cache)
+
+    return model, cache
+
+
+def predict_chunks(model, chunks, batch_size=DEFAULT_BATCH_SIZE, doc=None):
+    """Prédit les entités d'une liste de chunks, une liste de résultats par chunk"""
+    # Latence par appel au modèle (métriques de débit), mesurée seulement si elles sont actives
+    timed = run_metrics.active() is not None
+
+    with stage('inference', doc) as counts:
+        predictions = []
+        if batch_size <= 1:
+            for chunk in chunks:
+                start = time.perf_counter() if timed else None
+                predictions.append(model.predict_entities(chunk, LABELS, threshold=INFERENCE_THRESHOLD))
+                if timed:
+                    run_metrics.observe_inference(time.perf_counter() - start, [chunk])
+        else:
+            for i in range(0, len(chunks), batch_size):
+                batch = chunks[i:i + batch_size]
+                start = time.perf_counter() if timed else None
+                predictions.extend(
+                    model.batch_predict_entities(batch, LABELS, threshold=INFERENCE_THRESHOLD)
+                )
+                if timed:
+                    run_metrics.observe_inference(time.perf_counter() - start, batch)
+
+    if counts is not None:
+        counts['items'] = len(chunks)
+        counts['tokens'] = sum(len(chunk.split()) for chunk in chunks)
+    return predictions
+
+
+def prepare_document(file_path, chunker=word_chunker):
+    """
+    Lit, nettoie et découpe un document en chunks
+    Returns: (text_clean, chunks, offsets) - offsets est None si le chunker ne les conserve pas
+    """
+    doc = file_path.stem
+    with stage('read_document', doc) as read_counts:
+        text = file_path.read_text(encoding='utf-8')
+    with stage('clean_markdown', doc) as clean_counts:
+        text_clean = clean_markdown(text)
+    with stage('chunk', doc) as chunk_counts:
+        chunks, offsets = chunker(text_clean)
+
+    # Compteurs renseignés hors des mesures (les événements gardent une référence au dict)
+    if read_counts is not None:
+        read_counts['bytes'] = clean_counts['bytes'] = len(text.encode('utf-8'))
+        chunk_counts['items'] = len(chunks)
+        chunk_counts['tokens'] = sum(len(chunk.split()) for chunk in chunks)
+    return text_clean, chunks, offsets
+
+
+class Mention:
+    """
+    Mention prédite, enregistrement compact
+    Le texte et le contexte sont résolus à la demande via DocumentStore : start/end sont
+    absolus dans le texte nettoyé si le chunker conserve les positions, relatifs au chunk sinon
+    """
+    __slots__ = ('doc_id', 'chunk_id', 'start', 'end', 'label_id', 'score')
+
+    def __init__(self, doc_id, chunk_id, start, end, label_id, score):
+        self.doc_id = doc_id
+        self.chunk_id = chunk_id
+        self.start = start
+        self.end = end
+        self.label_id = label_id
+        self.score = score
+
+    def __repr__(self):
+        return (f"Mention(doc={self.doc_id}, chunk={self.chunk_id}, {self.start}:{self.end}, "
+                f"{LABELS[self.label_id]}, {self.score:.3f})")
+
+
+class DocumentStore:
+    """Textes nettoyés des documents, partagés par toutes leurs mentions"""
+
+    def __init__(self):
+        self.folders = []
+        self.documents = []
+        self.texts = []
+        # Chunks conservés uniquement si le chunker ne donne pas de positions absolues
+        self.chunks = []
+
+    def add(self, folder_name, document, text_clean, chunks, offsets):
+        """Enregistre un document, renvoie son doc_id"""
+        self.folders.append(folder_name)
+        self.documents.append(document)
+        self.texts.append(text_clean)
+        self.chunks.append(chunks if offsets is None else None)
+        return len(self.documents) - 1
+
+    def has_offsets(self, doc_id):
+        return self.chunks[doc_id] is None
+
+    def text(self, mention):
+        """Texte de la mention"""
+        if self.has_offsets(mention.doc_id):
+            return self.texts[mention.doc_id][mention.start:mention.end]
+        return self.chunks[mention.doc_id][mention.chunk_id][mention.start:mention.end]
+
+    def context(self, mention, window=150):
+        """Contexte autour de la mention dans le texte nettoyé"""
+        full_text = self.texts[mention.doc_id]
+        if self.has_offsets(mention.doc_id):
+            pos = mention.start
+        else:
+            pos = full_text.lower().find(self.text(mention).lower())
+            if pos == -1:
+                return ""
+
+        start = max(0, pos - window)
+        end = min(len(full_text), pos + (mention.end - mention.start) + window)
+        return full_text[start:end]
+
+    def row(self, mention):
+        """Ligne de résultat (Folder, Document, Entity, Type, Score[, Start, End]), score brut"""
+        result = {
+            'Folder': self.folders[mention.doc_id],
+            'Document': self.documents[mention.doc_id],
+            'Entity': self.text(mention),
+            'Type': ENTITY_TYPES[mention.label_id],
+            'Score': mention.score
+        }
+        if self.has_offsets(mention.doc_id):
+            result['Start'] = mention.start
+            result['End'] = mention.end
+        return result
+
+
+def to_mentions(chunk_predictions, doc_id, offsets=None):
+    """Convertit les prédictions brutes (dicts GLiNER) d'un document en Mention"""
+    mentions = []
+    for chunk_id, entities in enumerate(chunk_predictions):
+        shift = offsets[chunk_id] if offsets is not None else 0
+        for entity in entities:
+            mentions.append(Mention(doc_id, chunk_id, entity['start'] + shift, entity['end'] + shift,
+                                    LABEL_IDS[entity['label'].lower()], entity['score']))
+    return mentions
+
+
+def merge_overlapping_spans(mentions, min_scores=None):
+    """
+    Fusionne les mentions prédites deux fois dans les zones d'overlap entre chunks
+    Les spans (positions absolues, --chunker tokens uniquement) d'un même label qui se chevauchent
+    sont fusionnés en un span : union des bornes, meilleur score. Un span plus court contenu dans
+    un autre (mention coupée en bord de chunk) ne remplace donc jamais le span complet.
+    Seuls les spans qui passent le seuil de leur label sont fusionnés :
+    un span sous le seuil (écarté ensuite par filter_results) ne peut pas en masquer un autre.
+    Un seul passage sur les spans triés ; les chunks arrivant dans l'ordre du texte,
+    la liste est presque triée et le tri reste quasi linéaire.
+    """
+    thresholds = min_scores or MIN_SCORES
+    merged = []
+    last_kept = {}   # label_id -> index dans merged du dernier span retenu
+    for mention in sorted(mentions, key=lambda m: (m.start, m.end)):
+        if mention.score >= thresholds[mention.label_id]:
+            i = last_kept.get(mention.label_id)
+            if i is not None and mention.start < merged[i].end:
+                kept = merged[i]
+                if mention.end > kept.end or mention.score > kept.score:
+                    merged[i] = Mention(kept.doc_id, kept.chunk_id, kept.start, max(kept.end, mention.end),
+                                        kept.label_id, max(kept.score, mention.score))
+                continue
+            last_kept[mention.label_id] = len(merged)
+        merged.append(mention)
+    return merged
+
+
+def build_results(chunk_predictions, store, doc_id, offsets=None):
+    """
+    Formate les prédictions brutes d'un document (toutes celles >= INFERENCE_THRESHOLD)
+    Le filtrage par score se fait en post-traitement (filter_results)
+    """
+    with stage('build_results', store.documents[doc_id]) as counts:
+        mentions = to_mentions(chunk_predictions, doc_id, offsets)
+
+        # Positions relatives au chunk avec --chunker words : pas de fusion possible
+        if offsets is not None:
+            mentions = merge_overlapping_spans(mentions)
+
+        results = [store.row(m) for m in mentions]
+
+    if counts is not None:
+        counts['items'] = len(results)
+    return results
 
-    # Lire et nettoyer
-    text = file_path.read_text(encoding='utf-8')
-    text_clean = clean_markdown(text)
 
-    # Découper en chunks
-    chunks = smart_chunk(text_clean, max_length=400, overlap=50)
+def filter_results(results, min_scores=None):
+    """Filtrage par score minimum selon le type, puis arrondi du score"""
+    with stage('filter_results') as counts:
+        thresholds = dict(zip(ENTITY_TYPES, min_scores or MIN_SCORES))
+        filtered = [dict(result, Score=round(result['Score'], 3))
+                    for result in results
+                    if result['Score'] >= thresholds[result['Type']]]
 
-    # Extraire NER sur tous les chunks
-    all_entities = []
+    if counts is not None:
+        counts['items'] = len(results)
+    return filtered
 
-    for chunk in chunks:
-        entities = model.predict_entities(chunk, LABELS, threshold=0.35)
-        for entity in entities:
-            entity['full_text'] = text_clean
-            all_entities.append(entity)
-
-    # Filtrage par score
-    filtered = []
-    for entity in all_entities:
-        label = entity['label'].lower()
-        score = entity['score']
-
-        if label == 'person' and score >= MIN_SCORE_PERSON:
-            filtered.append(entity)
-        elif label == 'organization' and score >= MIN_SCORE_ORG:
-            filtered.append(entity)
-        elif label == 'location' and score >= MIN_SCORE_LOC:
-            filtered.append(entity)
-
-    # Préparer résultats
-    results = []
-    for entity in filtered:
-        # Normaliser le type (GPE pour location)
-        entity_type = entity['label'].upper()
-        if entity_type == 'LOCATION':
-            entity_type = 'GPE'
-
-        results.append({
-            'Folder': folder_name,
-            'Document': file_path.stem,
-            'Entity': entity['text'],
-            'Type': entity_type,
-            'Score': round(entity['score'], 3)
-        })
 
-    return results
+def process_document(file_path, folder_name, model, verbose=True, batch_size=DEFAULT_BATCH_SIZE,
+                     chunker=word_chunker, store=None, prepared=None):
+    """Traite un document et extrait les entités NER (prepared : prepare_document déjà fait)"""
+    if verbose:
+        print(f"  Processing: {file_path.name}")
+
+    if store is None:
+        store = DocumentStore()
+
+    text_clean, chunks, offsets = prepared or prepare_document(file_path, chunker)
+    doc_id = store.add(folder_name, file_path.stem, text_clean, chunks, offsets)
+    chunk_predictions = predict_chunks(model, chunks, batch_size, file_path.stem)
+
+    return build_results(chunk_predictions, store, doc_id, offsets)
 
 
-def process_folder(folder_path, model, verbose=True):
-    """Traite tous les documents d'un dossier"""
+def select_documents(folder_path, documents=None):
+    """Fichiers .md du dossier, triés, restreints à l'ensemble documents s'il est donné"""
+    md_files = sorted(folder_path.glob("*.md"))
+    if documents is not None:
+        md_files = [md_file for md_file in md_files if md_file in documents]
+    return md_files
+
+
+def process_folder(folder_path, model, verbose=True, batch_size=DEFAULT_BATCH_SIZE,
+                   chunker=word_chunker, store=None, documents=None, on_document=None, prefetch=None):
+    """
+    Traite tous les documents d'un dossier (ou seulement ceux de documents, ensemble de chemins)
+    on_document(dossier, document, résultats) est appelé pour chaque document terminé
+    prefetch : DocumentPrefetcher qui prépare les documents à venir pendant l'inférence
+    """
     folder_name = folder_path.name
 
+    if store is None:
+        store = DocumentStore()
+
     if verbose:
         print(f"\nFolder: {folder_name}")
 
     # Trouver tous les fichiers .md
-    md_files = sorted(folder_path.glob("*.md"))
+    md_files = select_documents(folder_path, documents)
 
     if verbose:
         print(f"  Files: {len(md_files)}")
 
-    all_results = []
-    for md_file in md_files:
-        results = process_document(md_file, folder_name, model, verbose)
-        all_results.extend(results)
+    def prepared(md_file):
+        return prefetch.get(md_file) if prefetch is not None else prepare_document(md_file, chunker)
+
+    if batch_size <= 1:
+        all_results = []
+        for md_file in md_files:
+            results = process_document(md_file, folder_name, model, verbose, batch_size, chunker, store,
+                                       prepared(md_file))
+            if on_document is not None:
+                on_document(folder_name, md_file.stem, results)
+            all_results.extend(results)
+    else:
+        # Mode batch : regrouper les chunks de tous les documents du dossier,
+        # puis redistribuer les prédictions à leur document d'origine.
+        # Chaque batch complet part dès que ses documents sont prêts (mêmes batchs qu'en une fois)
+        documents = []
+        n_chunks_total = 0
+        pending = []
+        predictions = []
+        for md_file in md_files:
+            if verbose:
+                print(f"  Processing: {md_file.name}")
+            text_clean, chunks, offsets = prepared(md_file)
+            doc_id = store.add(folder_name, md_file.stem, text_clean, chunks, offsets)
+            documents.append((doc_id, offsets, n_chunks_total, len(chunks)))
+            n_chunks_total += len(chunks)
+            pending.extend(chunks)
+
+            if len(pending) >= batch_size:
+                full = len(pending) - len(pending) % batch_size
+                predictions.extend(predict_chunks(model, pending[:full], batch_size))
+                pending = pending[full:]
+
+        if pending:
+            predictions.extend(predict_chunks(model, pending, batch_size))
+
+        all_results = []
+        for doc_id, offsets, first, n_chunks in documents:
+            chunk_predictions = predictions[first:first + n_chunks]
+            results = build_results(chunk_predictions, store, doc_id, offsets)
+            if on_document is not None:
+                on_document(folder_name, store.documents[doc_id], results)
+            all_results.extend(results)
 
     if verbose:
         print(f"  Entities: {len(all_results)}")
@@ -171,85 +586,575 @@ def process_folder(folder_path, model, verbose=True):
     return all_results
 
 
+def chunk_length(chunk):
+    """Longueur d'un chunk en mots (même mesure que smart_chunk)"""
+    return len(chunk.split())
+
+
+def padding_ratio(lengths, batch_size):
+    """Part de padding si les chunks sont passés au modèle dans cet ordre"""
+    real = sum(lengths)
+    padded = 0
+    for i in range(0, len(lengths), max(batch_size, 1)):
+        batch = lengths[i:i + max(batch_size, 1)]
+        padded += max(batch) * len(batch)
+    if padded == 0:
+        return 0.0
+    return 1 - real / padded
+
+
+def schedule_buckets(chunks, bucket_edges):
+    """
+    Répartit les chunks dans des buckets de longueur
+    Returns: liste de (nom du bucket, indices des chunks triés par longueur)
+    """
+    edges = sorted(bucket_edges)
+    names = [f"<={edge}" for edge in edges] + [f">{edges[-1]}" if edges else "all"]
+    buckets = [[] for _ in names]
+
+    for i, chunk in enumerate(chunks):
+        length = chunk_length(chunk)
+        b = 0
+        while b < len(edges) and length > edges[b]:
+            b += 1
+        buckets[b].append(i)
+
+    scheduled = []
+    for name, indices in zip(names, buckets):
+        if indices:
+            indices.sort(key=lambda i: chunk_length(chunks[i]))
+            scheduled.append((name, indices))
+    return scheduled
+
+
+def predict_bucketed(model, chunks, batch_size, bucket_edges, verbose=True):
+    """Inférence bucket par bucket, prédictions renvoyées dans l'ordre d'origine"""
+    predictions = [None] * len(chunks)
+    stats = []
+
+    for name, indices in schedule_buckets(chunks, bucket_edges):
+        bucket_chunks = [chunks[i] for i in indices]
+        lengths = [chunk_length(c) for c in bucket_chunks]
+
+        start = time.perf_counter()
+        bucket_predictions = predict_chunks(model, bucket_chunks, batch_size)
+        elapsed = time.perf_counter() - start
+
+        for i, entities in zip(indices, bucket_predictions):
+            predictions[i] = entities
+
+        stats.append({
+            'Bucket': name,
+            'Chunks': len(indices),
+            'Words': sum(lengths),
+            'Padding': padding_ratio(lengths, batch_size),
+            'Seconds': elapsed,
+        })
+
+    if verbose:
+        print_bucket_report(stats, chunks, batch_size)
+
+    return predictions
+
+
+def print_bucket_report(stats, chunks, batch_size):
+    """Affiche padding et débit par bucket"""
+    unsorted = padding_ratio([chunk_length(c) for c in chunks], batch_size)
+
+    print("\n" + "=" * 80)
+    print(f"BUCKET SCHEDULER (batch size {batch_size})")
+    print("=" * 80)
+    print(f"{'Bucket':<10} {'Chunks':>8} {'Words':>10} {'Padding':>9} {'Time (s)':>10} {'Chunks/s':>10} {'Words/s':>10}")
+    print("-" * 80)
+    for st in stats:
+        seconds = st['Seconds'] or float('nan')
+        print(f"{st['Bucket']:<10} {st['Chunks']:>8} {st['Words']:>10} {st['Padding']:>9.1%} "
+              f"{st['Seconds']:>10.2f} {st['Chunks'] / seconds:>10.2f} {st['Words'] / seconds:>10.1f}")
+    print("-" * 80)
+    print(f"Padding without bucketing (corpus order): {unsorted:.1%}")
+
+
+def process_corpus(folders, model, verbose=True, batch_size=DEFAULT_BATCH_SIZE,
+                   bucket_edges=DEFAULT_BUCKET_EDGES, chunker=word_chunker, store=None, documents=None,
+                   on_document=None):
+    """
+    Traite tout le corpus avec l'ordonnanceur par buckets de longueur
+    Les chunks de tous les dossiers sont énumérés, regroupés par longueur,
+    puis les résultats sont réassemblés par Folder/Document dans l'ordre d'origine
+    Yields: (nom du dossier, résultats du dossier)
+    """
+    if store is None:
+        store = DocumentStore()
+
+    doc_spans = []
+    all_chunks = []
+
+    for folder_path in sorted(folders):
+        md_files = select_documents(folder_path, documents)
+        if verbose:
+            print(f"Folder: {folder_path.name} ({len(md_files)} files)")
+        for md_file in md_files:
+            text_clean, chunks, offsets = prepare_document(md_file, chunker)
+            doc_id = store.add(folder_path.name, md_file.stem, text_clean, chunks, offsets)
+            doc_spans.append((doc_id, offsets, len(all_chunks), len(chunks)))
+            all_chunks.extend(chunks)
+
+    if verbose:
+        print(f"\nDocuments: {len(doc_spans)}, chunks: {len(all_chunks)}")
+
+    predictions = predict_bucketed(model, all_chunks, batch_size, bucket_edges, verbose)
+
+    folder_name = None
+    folder_results = []
+    for doc_id, offsets, first, n_chunks in doc_spans:
+        if store.folders[doc_id] != folder_name:
+            if folder_name is not None:
+                yield folder_name, folder_results
+            folder_name = store.folders[doc_id]
+            folder_results = []
+        chunk_predictions = predictions[first:first + n_chunks]
+        results = build_results(chunk_predictions, store, doc_id, offsets)
+        if on_document is not None:
+            on_document(folder_name, store.documents[doc_id], results)
+        folder_results.extend(results)
+
+    if folder_name is not None:
+        yield folder_name, folder_results
+
+
+# État propre à chaque processus worker (modèle chargé une seule fois)
+_worker_state = {}
+
+
+def init_worker(model_path, cache_dir, cache_size_mb, num_threads, batch_size, chunker_name,
+                cascade=False, dedup_threshold=None, backend=DEFAULT_BACKEND,
+                mmap_weights=False, trace_stages=False, metrics=False):
+    """
+    Initialise un worker : threads torch limités puis chargement du modèle dans le processus
+    (jamais via le daemon, qui sérialise les requêtes : le pool ne serait plus qu'un seul flux)
+    """
+    import torch
+
+    if trace_stages:
+        stage_profiler.enable()
+    if metrics:
+        run_metrics.enable()
+
+    torch.set_num_threads(num_threads)
+    torch.set_num_interop_threads(1)
+
+    model, cache = load_model(model_path, cache_dir, cache_size_mb, False, backend, mmap_weights)
+    dedup = None
+    if dedup_threshold is not None:
+        model = dedup = DedupModel(model, dedup_threshold)
+    if cascade:
+        model = CascadeModel(model, load_gazetteer())
+    _worker_state.update(model=model, cache=cache, cascade=model if cascade else None,
+                         dedup=dedup, batch_size=batch_size, chunker=get_chunker(chunker_name, model))
+
+
+def worker_counters():
+    """
+    Compteurs du worker : hits, misses du cache, chunks, chunks sautés par la cascade,
+    chunks, doublons exacts, quasi-doublons du dédoublonnage
+    """
+    cache = _worker_state['cache']
+    cascade = _worker_state['cascade']
+    dedup = _worker_state['dedup']
+    counters = [cache.hits, cache.misses] if cache else [0, 0]
+    counters += [cascade.chunks, cascade.skipped] if cascade else [0, 0]
+    counters += [dedup.chunks, dedup.exact, dedup.near] if dedup else [0, 0, 0]
+    return counters
+
+
+def process_document_task(task):
+    """
+    Traite un document dans un worker, renvoie (résultats, deltas des compteurs,
+    événements profilés, métriques de débit)
+    """
+    folder_name, md_file = task
+    before = worker_counters()
+
+    results = process_document(md_file, folder_name, _worker_state['model'],
+                               verbose=False, batch_size=_worker_state['batch_size'],
+                               chunker=_worker_state['chunker'])
+
+    return (results, [after - b for after, b in zip(worker_counters(), before)], stage_profiler.drain(),
+            run_metrics.drain())
+
+
+def threads_per_worker(workers):
+    """Répartit les coeurs entre les workers pour éviter la sur-souscription"""
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def process_corpus_parallel(folders, model_path, workers, verbose=True, batch_size=DEFAULT_BATCH_SIZE,
+                            cache=None, cache_size_mb=DEFAULT_CACHE_SIZE_MB, chunker_name=DEFAULT_CHUNKER,
+                            cascade=None, dedup=None, backend=DEFAULT_BACKEND,
+                            num_threads=None, mmap_weights=False, documents=None, on_document=None):
+    """
+    Répartit les documents de tous les dossiers sur un pool de processus
+    Les résultats sont fusionnés dans l'ordre Folder/Document, comme en séquentiel
+    Yields: (nom du dossier, résultats du dossier), dès que le dossier est terminé
+    """
+    tasks = []
+    for folder_path in sorted(folders):
+        md_files = select_documents(folder_path, documents)
+        if verbose:
+            print(f"Folder: {folder_path.name} ({len(md_files)} files)")
+        tasks.extend((folder_path.name, md_file) for md_file in md_files)
+
+    num_threads = num_threads or threads_per_worker(workers)
+    if verbose:
+        print(f"\nDocuments: {len(tasks)}, workers: {workers} x {num_threads} torch threads")
+
+    cache_dir = cache.cache_dir if cache else None
+    profiler = stage_profiler.active()
+    metrics = run_metrics.active()
+    ctx = multiprocessing.get_context('spawn')
+
+    folder_name = None
+    folder_results = []
+    with ctx.Pool(workers, initializer=init_worker,
+                  initargs=(model_path, cache_dir, cache_size_mb, num_threads, batch_size,
+                            chunker_name, cascade is not None,
+                            dedup.index.threshold if dedup else None, backend,
+                            mmap_weights, profiler is not None, metrics is not None)) as pool:
+        # imap conserve l'ordre des tâches : fusion déterministe
+        for i, (results, counters, events, snapshot) in enumerate(pool.imap(process_document_task, tasks), 1):
+            task_folder = tasks[i - 1][0]
+            if task_folder != folder_name:
+                if folder_name is not None:
+                    yield folder_name, folder_results
+                folder_name = task_folder
+                folder_results = []
+            if on_document is not None:
+                on_document(task_folder, tasks[i - 1][1].stem, results)
+            folder_results.extend(results)
+            hits, misses, chunks, skipped, unique_chunks, exact, near = counters
+            if cache:
+                cache.hits += hits
+                cache.misses += misses
+            if cascade:
+                cascade.chunks += chunks
+                cascade.skipped += skipped
+            if dedup:
+                dedup.chunks += unique_chunks
+                dedup.exact += exact
+                dedup.near += near
+            if profiler is not None:
+                profiler.add_events(events)
+            if metrics is not None:
+                metrics.merge(snapshot)
+            if verbose and i % 50 == 0:
+                print(f"  {i}/{len(tasks)} documents")
+
+    if folder_name is not None:
+        yield folder_name, folder_results
+
+    if cache:
+        cache.rescan()
+
+
+def load_gold_folders(gold_standard_path, data_dir):
+    """Dossiers du gold standard présents dans data_dir"""
+    gold_folders = set()
+    with open(gold_standard_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('## DOSSIER:'):
+                folder_name = line.split(':', 1)[1].strip()
+                gold_folders.add(folder_name)
+
+    return [data_dir / fname for fname in gold_folders if (data_dir / fname).exists()]
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente (Mo) du processus et du plus gros worker"""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss est en Ko sous Linux
+    return own / 1024, children / 1024
+
+
+def batching_mode(workers, batch_size, bucket_edges=None):
+    """
+    Regroupement des chunks en batchs : chunk par chunk, par document (workers), par dossier
+    ou par bucket de longueur. Le padding change les scores au bruit numérique près (~1e-7)
+    """
+    if batch_size <= 1:
+        return 'chunk'
+    if bucket_edges:
+        return f"buckets:{','.join(str(edge) for edge in sorted(bucket_edges))}"
+    return 'document' if workers > 1 else 'folder'
+
+
+def run_config(model_path, backend, chunker_name, cascade=None, dedup=None,
+               batch_size=DEFAULT_BATCH_SIZE, batching='folder'):
+    """Configuration qui détermine les prédictions brutes (empreinte des modes incrémental et reprise)"""
+    return {
+        'model': backend_fingerprint(model_path, backend),
+        'labels': LABELS,
+        'threshold': INFERENCE_THRESHOLD,
+        'chunker': chunker_name,
+        'cascade': gazetteer_fingerprint() if cascade else None,
+        'near_dup_threshold': dedup.index.threshold if dedup else None,
+        'batch_size': batch_size if batching != 'chunk' else 1,
+        'batching': batching,
+    }
+
+
+def write_profile(output_dir, timestamp):
+    """Écrit la trace Chrome du run (--trace-stages) et affiche le récapitulatif par étape"""
+    profiler = stage_profiler.active()
+    trace_path = profiler.write_trace(output_dir / f"profile_{timestamp}.json")
+
+    print("\n" + "=" * 88)
+    print("STAGE PROFILE")
+    print("=" * 88)
+    print(profiler.summary())
+    print(f"\nTrace saved: {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+
+
+def group_codes(columns):
+    """
+    Numéro de groupe de chaque ligne pour la clé formée par les colonnes,
+    groupes numérotés dans l'ordre de leur première apparition
+    """
+    codes = None
+    for column in columns:
+        column_codes, uniques = pd.factorize(np.asarray(column, dtype=object), sort=False)
+        if codes is None:
+            codes = column_codes
+        else:
+            # Combinaison deux à deux, renumérotée : les codes restent < nombre de lignes
+            codes = pd.factorize(codes * len(uniques) + column_codes, sort=False)[0]
+    return codes
+
+
+def best_rows(groups, scores):
+    """Indice de la ligne au meilleur score de chaque groupe (la première en cas d'égalité), par groupe"""
+    order = np.lexsort((np.arange(len(groups)), -scores, groups))
+    sorted_groups = groups[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_groups[1:] != sorted_groups[:-1]
+    return order[first]
+
+
 def deduplicate_results(results):
-    """Déduplique les entités par (Folder, Document, Type, Entity normalisée)"""
-    # Grouper par clé unique
-    groups = defaultdict(list)
-
-    for result in results:
-        key = (
-            result['Folder'],
-            result['Document'],
-            result['Type'],
-            result['Entity'].lower().strip()
-        )
-        groups[key].append(result)
-
-    # Garder celle avec le meilleur score
-    deduplicated = []
-    for key, group in groups.items():
-        best = max(group, key=lambda x: x['Score'])
-        deduplicated.append(best)
+    """
+    Déduplique les entités par (Folder, Document, Type, Entity normalisée)
+    Garde la ligne au meilleur score de chaque entité, entités dans l'ordre de première apparition
+    """
+    with stage('deduplicate_results') as counts:
+        groups = group_codes([
+            [result['Folder'] for result in results],
+            [result['Document'] for result in results],
+            [result['Type'] for result in results],
+            [result['Entity'].lower().strip() for result in results],
+        ])
+        scores = np.fromiter((result['Score'] for result in results), dtype=float, count=len(results))
+        deduplicated = [results[i] for i in best_rows(groups, scores)] if results else []
+
+    if counts is not None:
+        counts['items'] = len(results)
+    return deduplicated
+
 
+def deduplicate_dataset(results_path, min_scores=None, chunk_rows=DEDUP_CHUNK_ROWS):
+    """
+    filter_results puis deduplicate_results sur un dataset lu par blocs de chunk_rows lignes :
+    seules les meilleures lignes vues jusque-là restent en mémoire (mêmes lignes, même ordre)
+    """
+    deduplicated = []
+    for chunk in iter_results(results_path, chunk_rows):
+        # Les meilleures lignes précèdent le bloc : ordre d'apparition et égalités préservés
+        deduplicated = deduplicate_results(deduplicated + filter_results(chunk, min_scores))
     return deduplicated
 
 
-def create_excel_report(results, output_path):
+def create_excel_report(results, output_path, engine=DEFAULT_EXCEL_ENGINE):
     """Crée un fichier Excel avec 3 sheets (PERSON, ORGANIZATION, GPE)"""
-    df = pd.DataFrame(results)
-
-    # Créer ExcelWriter
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-        # Sheet pour chaque type
-        for entity_type in ['PERSON', 'ORGANIZATION', 'GPE']:
-            df_type = df[df['Type'] == entity_type].copy()
-            df_type = df_type.sort_values(['Folder', 'Document', 'Score'], ascending=[True, True, False])
-            df_type.to_excel(writer, sheet_name=entity_type, index=False)
+    with stage('create_excel_report') as counts:
+        df = pd.DataFrame(results, columns=REPORT_COLUMNS)
+
+        # Un seul tri stable (Type, Folder, Document, Score décroissant) : chaque sheet
+        # est une tranche contiguë, dans l'ordre d'un tri par sheet
+        type_codes = pd.Categorical(df['Type'], categories=ENTITY_TYPES).codes
+        order = np.lexsort((
+            -df['Score'].to_numpy(dtype=float),
+            pd.factorize(df['Document'], sort=True)[0],
+            pd.factorize(df['Folder'], sort=True)[0],
+            type_codes,
+        ))
+        df = df.iloc[order]
+        bounds = np.searchsorted(type_codes[order], np.arange(len(ENTITY_TYPES) + 1))
+
+        write_sheets([(entity_type, df.iloc[bounds[i]:bounds[i + 1]])
+                      for i, entity_type in enumerate(ENTITY_TYPES)], output_path, engine)
+
+    if counts is not None:
+        counts['items'] = len(results)
 
     print(f"\nExcel report saved: {output_path}")
 
 
-def run_evaluation(excel_path, gold_standard_path, output_report_path):
-    """Lance l'évaluation en appelant le script evaluate_ner.py"""
-    import subprocess
+def create_mentions_report(results, output_path, engine=DEFAULT_EXCEL_ENGINE):
+    """Crée un fichier Excel niveau mention (une ligne par occurrence, avec positions)"""
+    with stage('create_mentions_report') as counts:
+        df = pd.DataFrame(results)
+        df = df.sort_values(['Folder', 'Document', 'Start'], kind='stable')
+        write_sheets([('MENTIONS', df)], output_path, engine)
+
+    if counts is not None:
+        counts['items'] = len(results)
 
-    eval_script = Path(__file__).parent / "evaluate_ner.py"
+    print(f"Mentions report saved: {output_path}")
 
-    if not eval_script.exists():
-        print(f"\nWarning: Evaluation script not found: {eval_script}")
-        return False
 
+def build_reports(results_path, excel_path, mentions_path=None, verbose=True, engine=DEFAULT_EXCEL_ENGINE):
+    """
+    Post-traitement : relit le dataset de prédictions brutes, filtre par score, déduplique
+    et écrit le rapport Excel (et le rapport niveau mention si les positions sont disponibles)
+    Returns: résultats dédupliqués
+    """
+    with stage('read_results') as counts:
+        raw_results = read_results(results_path)
+    if counts is not None:
+        counts['items'] = len(raw_results)
+    all_results = filter_results(raw_results)
+    deduplicated = deduplicate_results(all_results)
+
+    if verbose:
+        print(f"Raw predictions in {results_path.name}: {len(raw_results)}")
+        print(f"After score filtering: {len(all_results)}")
+        print(f"After deduplication: {len(deduplicated)}")
+
+    create_excel_report(deduplicated, excel_path, engine)
+
+    # Vue niveau mention (positions disponibles avec --chunker tokens)
+    if mentions_path is not None and all_results and 'Start' in all_results[0]:
+        create_mentions_report(all_results, mentions_path, engine)
+
+    if verbose:
+        print("\nStatistics by type:")
+        for entity_type, count in pd.Series([r['Type'] for r in deduplicated]).value_counts().items():
+            print(f"  {entity_type}: {count}")
+
+    return deduplicated
+
+
+def run_threshold_sweep(results_path, gold_standard_path, grid=None):
+    """Balaye les seuils par label sur les prédictions brutes du run (sans ré-inférence)"""
     if not gold_standard_path.exists():
         print(f"\nWarning: Gold standard not found: {gold_standard_path}")
-        return False
+        return None
+
+    print("\n" + "=" * 80)
+    print("THRESHOLD SWEEP")
+    print("=" * 80)
+
+    current = {'PERSON': MIN_SCORE_PERSON, 'ORGANIZATION': MIN_SCORE_ORG, 'LOCATION': MIN_SCORE_LOC}
+    thresholds = parse_grid(grid) if grid else DEFAULT_GRID
+    return run_sweep(read_results(results_path), gold_standard_path, thresholds, current)
 
-    if not excel_path.exists():
-        print(f"\nWarning: Excel results not found: {excel_path}")
-        return False
+
+def run_evaluation(predictions, gold_standard_path, output_report_path):
+    """Évalue les résultats dédupliqués (en mémoire) contre le gold standard"""
+    from evaluate_ner import NEREvaluator, print_summary
+
+    if not gold_standard_path.exists():
+        print(f"\nWarning: Gold standard not found: {gold_standard_path}")
+        return None
 
     print("\n" + "=" * 80)
     print("RUNNING EVALUATION")
     print("=" * 80)
 
-    cmd = [
-        sys.executable,
-        str(eval_script),
-        "--gold", str(gold_standard_path),
-        "--predictions", str(excel_path),
-        "--output", str(output_report_path)
-    ]
+    with stage('evaluation') as counts:
+        evaluator = NEREvaluator(gold_standard_path, predictions=predictions)
+        evaluator.load_data()
+        metrics = evaluator.evaluate()
+        evaluator.generate_report(metrics, output_report_path)
+
+    if counts is not None:
+        counts['items'] = len(predictions)
+    print_summary(metrics)
 
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error running evaluation: {e}")
-        print(e.stderr)
-        return False
+    return metrics
+
+
+def run_cascade_audit(cascade_results, folders, cascade, gold_standard_path,
+                      batch_size=DEFAULT_BATCH_SIZE, chunker=word_chunker):
+    """
+    Compare la cascade à GLiNER seul sur le gold standard
+    Les dossiers sont retraités sans gazetteer : avec le cache, seuls les chunks
+    sautés par la cascade repassent dans le modèle
+    Returns: (métriques GLiNER seul, métriques cascade)
+    """
+    from evaluate_ner import NEREvaluator, ENTITY_TYPES as EVAL_TYPES
+
+    if not gold_standard_path.exists():
+        print(f"\nWarning: Gold standard not found: {gold_standard_path}")
+        return None
+
+    print("\n" + "=" * 80)
+    print("CASCADE AUDIT (gazetteer + GLiNER vs GLiNER only)")
+    print("=" * 80)
+
+    full_results = []
+    for folder_path in sorted(folders):
+        full_results.extend(process_folder(folder_path, cascade.model, False, batch_size, chunker))
+
+    all_metrics = []
+    for results in [full_results, cascade_results]:
+        evaluator = NEREvaluator(gold_standard_path,
+                                 predictions=deduplicate_results(filter_results(results)))
+        evaluator.load_data()
+        all_metrics.append(evaluator.evaluate())
+    full, cascaded = all_metrics
+
+    print(f"\n{cascade.summary()}")
+    print(f"{'Type':<15} {'F1 GLiNER':>10} {'F1 cascade':>11} {'Delta':>8}")
+    print("-" * 80)
+    for entity_type in EVAL_TYPES + ['OVERALL']:
+        f1, f1_cascade = full[entity_type].f1, cascaded[entity_type].f1
+        print(f"{entity_type:<15} {f1:>10.3f} {f1_cascade:>11.3f} {f1_cascade - f1:>+8.3f}")
+
+    return full, cascaded
+
+
+def apply_cpu_profile(args, profile):
+    """
+    Valeurs par défaut de --threads/--workers/--batch-size depuis le profil CPU (jamais à la place
+    d'une option explicite). Le couple workers x threads n'est repris que si aucune des deux options
+    n'est donnée et que le run peut utiliser un pool (pas --folder, --bucket-edges, --cascade-audit
+    ni post-traitement seul) ou que le profil est mono-processus.
+    """
+    if args.batch_size is None:
+        args.batch_size = profile['batch_size'] if profile else DEFAULT_BATCH_SIZE
+
+    pool_compatible = not (args.folder or args.bucket_edges or args.cascade_audit or args.excel_from)
+    if (profile and args.workers is None and args.threads is None
+            and (pool_compatible or profile['workers'] == 1)):
+        args.workers = profile['workers']
+        args.threads = profile['threads']
+    if args.workers is None:
+        args.workers = 1
 
 
 def main():
+    # Subcommand: CPU auto-tuning (writes the profile loaded below)
+    if sys.argv[1:2] == ['tune']:
+        from thread_tuner import main as tune_main
+        tune_main(sys.argv[2:])
+        return
+
+    # Subcommand: merge the per-shard datasets of a multi-node run
+    if sys.argv[1:2] == ['merge']:
+        from sharding import main as merge_main
+        merge_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description='Run complete NER extraction and evaluation pipeline',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -266,6 +1171,73 @@ Examples:
 
   # Skip evaluation
   python run_ner_pipeline.py --no-eval
+
+  # Batched inference (16 chunks per forward pass)
+  python run_ner_pipeline.py --batch-size 16
+
+  # Rerun without the prediction cache
+  python run_ner_pipeline.py --no-cache
+
+  # Shard documents across 8 processes
+  python run_ner_pipeline.py --workers 8
+
+  # Tokenizer-aware chunks packed up to the model max length
+  python run_ner_pipeline.py --chunker tokens
+
+  # Parquet results dataset, Excel built later from it
+  python run_ner_pipeline.py --results-format parquet --no-excel
+  python run_ner_pipeline.py --excel-from ../outputs/ner_results_20251116_151224.parquet
+
+  # Threshold sweep on the gold folders (one inference pass), or on an existing dataset
+  python run_ner_pipeline.py --gold-only --sweep
+  python run_ner_pipeline.py --excel-from ../outputs/ner_results_20251116_151224.jsonl --sweep
+
+  # Keep the model warm between runs with the local daemon (used automatically when running)
+  python gliner_daemon.py --model ../models/checkpoints/gliner_multi-v2.1 &
+  python run_ner_pipeline.py --folder R1048-13C-23516-23516
+
+  # Gazetteer-first cascade (GLiNER only on chunks with unknown capitalized words),
+  # audited against GLiNER alone on the gold folders
+  python run_ner_pipeline.py --cascade
+  python run_ner_pipeline.py --gold-only --cascade --cascade-audit
+
+  # Run the model once per unique chunk (exact and near-duplicate boilerplate)
+  python run_ner_pipeline.py --dedup-chunks --near-dup-threshold 0.9
+
+  # Workers share the model weights through a memory-mapped safetensors file
+  python run_ner_pipeline.py --workers 4 --mmap-weights
+
+  # Incremental run: only new or changed documents go through the model
+  python run_ner_pipeline.py --incremental
+
+  # Journal each finished document; after a crash, resume from the newest journal in --output-dir
+  python run_ner_pipeline.py --workers 4 --journal
+  python run_ner_pipeline.py --workers 4 --resume
+
+  # Read/clean/chunk ahead in 4 threads (queue of 16 documents) while the model runs
+  python run_ner_pipeline.py --prefetch 16 --prefetch-threads 4
+
+  # Multi-node run on a shared filesystem: one stable subset of folders per node, then merge
+  python run_ner_pipeline.py --shard 1/3 --workers 8
+  python run_ner_pipeline.py merge ../outputs/ner_results_*_shard*of3.jsonl
+
+  # Throughput metrics for Prometheus (node_exporter textfile collector) and a live progress line
+  python run_ner_pipeline.py --workers 4 --metrics /var/lib/node_exporter/textfile/ner.prom
+  python run_ner_pipeline.py --quiet --progress
+
+  # Per-stage timings (Chrome trace + summary table)
+  python run_ner_pipeline.py --gold-only --trace-stages
+
+  # Tune torch threads x workers x batch size once; the profile is then loaded at startup
+  python run_ner_pipeline.py tune
+  python run_ner_pipeline.py --no-profile
+
+  # Quantized / ONNX Runtime CPU backends (parity and throughput: benchmark_backends.py)
+  python run_ner_pipeline.py --backend torch-int8
+  python run_ner_pipeline.py --backend onnx
+
+  # Corpus-wide length-bucketed scheduling
+  python run_ner_pipeline.py --batch-size 16 --bucket-edges 64,128,256
         """
     )
 
@@ -308,6 +1280,235 @@ Examples:
         help='Skip evaluation step'
     )
 
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        help='Number of chunks per model call (1 = per-chunk inference; default: CPU profile, else 1)'
+    )
+
+    parser.add_argument(
+        '--chunker',
+        choices=['words', 'tokens'],
+        default=DEFAULT_CHUNKER,
+        help='Chunking strategy: words (smart_chunk, 400 words) or tokens '
+             '(GLiNER tokenizer, packed up to the model max length, keeps offsets; mentions '
+             'predicted twice in chunk overlaps are merged only with tokens)'
+    )
+
+    parser.add_argument(
+        '--bucket-edges',
+        type=str,
+        help='Comma-separated chunk length edges in words (e.g. 64,128,256); '
+             'enables the corpus-wide length-bucketed scheduler'
+    )
+
+    parser.add_argument(
+        '--backend',
+        choices=BACKENDS,
+        default=DEFAULT_BACKEND,
+        help='CPU inference backend: torch (fp32), torch-int8 (dynamic int8 quantization) '
+             'or onnx (ONNX Runtime, exported once under the checkpoint directory)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Number of worker processes (each loads the model once; default: CPU profile when the '
+             'run can use a pool, else 1)'
+    )
+
+    parser.add_argument(
+        '--prefetch',
+        type=int,
+        default=DEFAULT_PREFETCH_DEPTH,
+        help='Documents read, cleaned and chunked ahead by background threads while the model '
+             'runs (single process, without --bucket-edges; 0 = off)'
+    )
+
+    parser.add_argument(
+        '--prefetch-threads',
+        type=int,
+        default=DEFAULT_PREFETCH_THREADS,
+        help='Threads preparing documents for --prefetch'
+    )
+
+    parser.add_argument(
+        '--mmap-weights',
+        action='store_true',
+        help='Map the model weights from a safetensors export next to the checkpoint, '
+             'so worker processes share read-only pages instead of private copies'
+    )
+
+    parser.add_argument(
+        '--threads',
+        type=int,
+        help='Torch intra-op threads (per worker with --workers; default: CPU count / workers)'
+    )
+
+    parser.add_argument(
+        '--no-profile',
+        action='store_true',
+        help='Ignore the CPU profile written by the tune subcommand'
+    )
+
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Always load the model in-process, even if the local GLiNER daemon is running '
+             '(--workers processes always load it in-process)'
+    )
+
+    parser.add_argument(
+        '--cascade',
+        action='store_true',
+        help='Tag chunks with the curated gazetteer first and run GLiNER only on chunks '
+             'with capitalized words it does not cover'
+    )
+
+    parser.add_argument(
+        '--cascade-audit',
+        action='store_true',
+        help='With --cascade, also run GLiNER on the skipped chunks and report the F1 delta '
+             'against the gold standard'
+    )
+
+    parser.add_argument(
+        '--dedup-chunks',
+        action='store_true',
+        help='Run the model once per unique chunk across the corpus and reuse its predictions '
+             'for exact and near-duplicate copies'
+    )
+
+    parser.add_argument(
+        '--near-dup-threshold',
+        type=float,
+        default=DEFAULT_NEAR_DUP_THRESHOLD,
+        help='Minimum MinHash Jaccard similarity for near-duplicate chunks with --dedup-chunks '
+             '(1 = exact duplicates only). The index is per process and depends on chunk order: '
+             'below 1, --workers, --resume, --incremental and --shard runs may differ slightly '
+             'from a full single-process run'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=CACHE_DIR,
+        help='Directory of the on-disk prediction cache'
+    )
+
+    parser.add_argument(
+        '--cache-size-mb',
+        type=int,
+        default=DEFAULT_CACHE_SIZE_MB,
+        help='Maximum prediction cache size in MB (LRU eviction)'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the prediction cache'
+    )
+
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only run the model on new or changed documents (manifest of content hashes and '
+             'model/config fingerprint); deleted documents are dropped, the others reuse stored results'
+    )
+
+    parser.add_argument(
+        '--state-dir',
+        type=Path,
+        help='Manifest and stored results for --incremental (default: <output-dir>/incremental, '
+             'or <output-dir>/incremental_shard<i>of<N> with --shard)'
+    )
+
+    parser.add_argument(
+        '--journal',
+        action='store_true',
+        help='Append each finished document to outputs/ner_journal_<timestamp>.jsonl (fsync per '
+             'document) so that an interrupted run can be resumed with --resume'
+    )
+
+    parser.add_argument(
+        '--resume',
+        nargs='?',
+        const='latest',
+        help='Resume an interrupted --journal run from its per-document journal (default: the newest '
+             'ner_journal_*.jsonl in --output-dir); journaled documents are not processed again and '
+             'the interrupted run\'s partial dataset is rewritten'
+    )
+
+    parser.add_argument(
+        '--shard',
+        type=str,
+        help="Only process shard i of N ('i/N', stable hash of the folder name); the shard's "
+             "dataset is suffixed _shard<i>of<N>, reports are built by the merge subcommand"
+    )
+
+    parser.add_argument(
+        '--results-format',
+        choices=RESULT_FORMATS,
+        default='jsonl',
+        help='Format of the results dataset written while the run progresses'
+    )
+
+    parser.add_argument(
+        '--no-excel',
+        action='store_true',
+        help='Only write the results dataset (build the Excel report later with --excel-from)'
+    )
+
+    parser.add_argument(
+        '--excel-engine',
+        choices=EXCEL_ENGINES,
+        default=DEFAULT_EXCEL_ENGINE,
+        help='Excel writer: xlsxwriter (constant memory, rows streamed to disk) or openpyxl '
+             '(whole workbook in memory)'
+    )
+
+    parser.add_argument(
+        '--metrics',
+        nargs='?',
+        const='default',
+        metavar='PATH',
+        help='Write throughput metrics (documents, chunks, tokens, entities per label, inference '
+             'latency, ETA) in the Prometheus text format, refreshed during the run '
+             '(default: <output-dir>/metrics/ner_pipeline.prom, for the node_exporter textfile collector)'
+    )
+
+    parser.add_argument(
+        '--progress',
+        action='store_true',
+        help='Live progress line (tqdm) with documents/s, chunks/s, tokens/s and ETA (not with --bucket-edges)'
+    )
+
+    parser.add_argument(
+        '--excel-from',
+        type=Path,
+        help='Build the Excel report (and evaluation) from an existing results dataset, '
+             'without running the model'
+    )
+
+    parser.add_argument(
+        '--sweep',
+        action='store_true',
+        help='Sweep per-label score thresholds against the gold standard on the raw predictions'
+    )
+
+    parser.add_argument(
+        '--sweep-grid',
+        type=str,
+        help="Threshold grid for --sweep, 'start:stop:step' or comma-separated values"
+    )
+
+    parser.add_argument(
+        '--trace-stages',
+        action='store_true',
+        help='Record wall/thread CPU time, calls and byte/token counts per stage and document, '
+             'written as a Chrome trace (outputs/profile_<timestamp>.json) plus a summary table'
+    )
+
     parser.add_argument(
         '--quiet',
         action='store_true',
@@ -316,7 +1517,41 @@ Examples:
 
     args = parser.parse_args()
 
+    # CPU profile from the tune subcommand: defaults for threads, workers and batch size
+    profile = None
+    if not args.no_profile:
+        from thread_tuner import load_profile
+        profile = load_profile(backend=args.backend)
+    apply_cpu_profile(args, profile)
+
     verbose = not args.quiet
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    if args.trace_stages:
+        stage_profiler.enable()
+    gold_standard_path = PROJECT_ROOT / "data" / "gold_standard_annotations.txt"
+
+    # Post-traitement seul : Excel (+ évaluation) depuis un dataset existant
+    if args.excel_from:
+        if not args.excel_from.exists():
+            print(f"Error: Results dataset not found: {args.excel_from}")
+            sys.exit(1)
+
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+        excel_path = args.output_dir / f"{args.excel_from.stem}.xlsx"
+        mentions_path = args.output_dir / f"{args.excel_from.stem.replace('ner_results', 'ner_mentions')}.xlsx"
+        deduplicated = build_reports(args.excel_from, excel_path, mentions_path, verbose, args.excel_engine)
+
+        if not args.no_eval:
+            eval_report_path = args.output_dir / f"evaluation_report_{timestamp}.txt"
+            run_evaluation(deduplicated, gold_standard_path, eval_report_path)
+
+        if args.sweep:
+            run_threshold_sweep(args.excel_from, gold_standard_path, args.sweep_grid)
+
+        if args.trace_stages:
+            write_profile(args.output_dir, timestamp)
+        return
 
     # Validate model path
     if not args.model.exists():
@@ -327,20 +1562,88 @@ Examples:
         print(f"Error: Data directory not found: {args.data_dir}")
         sys.exit(1)
 
+    if args.workers > 1 and args.bucket_edges:
+        print("Error: --bucket-edges is not supported with --workers > 1")
+        sys.exit(1)
+
+    if args.mmap_weights and args.backend != 'torch':
+        print("Error: --mmap-weights requires --backend torch")
+        sys.exit(1)
+
+    shard = None
+    suffix = ''
+    if args.shard:
+        from sharding import parse_shard, select_shard, shard_suffix
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        # Shard outputs (dataset, journal, profile) must not collide on the shared filesystem
+        suffix = shard_suffix(*shard)
+        # Reports and evaluation cover the whole corpus: built by the merge subcommand
+        args.no_excel = args.no_eval = True
+
+    if args.resume and args.incremental:
+        print("Error: --resume cannot be combined with --incremental")
+        sys.exit(1)
+
+    if args.cascade_audit and (not args.cascade or args.workers > 1):
+        print("Error: --cascade-audit requires --cascade and --workers 1")
+        sys.exit(1)
+
     # Create output directory
     args.output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Load model
+    cache_dir = None if args.no_cache else args.cache_dir
+
     if verbose:
         print("=" * 80)
         print("NER EXTRACTION PIPELINE")
         print("=" * 80)
-        print(f"\nLoading GLiNER model from: {args.model}")
+        if profile:
+            print(f"CPU profile: {profile['path']} ({args.workers} workers x "
+                  f"{args.threads or 'default'} threads, batch size {args.batch_size})")
+
+    # Load model (in multi-process mode, each worker loads its own copy)
+    if args.workers > 1:
+        model = None
+        cache = None
+        if cache_dir is not None:
+            cache = InferenceCache(cache_dir, backend_fingerprint(args.model, args.backend),
+                                   max_bytes=args.cache_size_mb * 1024 * 1024)
+        if args.backend == 'onnx':
+            # Export once before the workers load the ONNX session
+            ensure_onnx_model(args.model)
+        if args.mmap_weights:
+            # Export once before the workers map the weights file
+            ensure_mmap_weights(args.model)
+    else:
+        if args.threads:
+            import torch
+            torch.set_num_threads(args.threads)
 
-    model = GLiNER.from_pretrained(str(args.model))
+        if verbose:
+            print(f"\nLoading GLiNER model from: {args.model} ({args.backend} backend)")
 
-    if verbose:
-        print("Model loaded successfully\n")
+        model, cache = load_model(args.model, cache_dir, args.cache_size_mb, not args.no_daemon,
+                                  args.backend, args.mmap_weights)
+
+        if verbose:
+            print("Model loaded successfully\n")
+
+    # Chunk deduplication and gazetteer cascade (in multi-process mode, only used here for the counters)
+    dedup = None
+    if args.dedup_chunks:
+        dedup = DedupModel(model, args.near_dup_threshold)
+        if model is not None:
+            model = dedup
+
+    cascade = None
+    if args.cascade:
+        cascade = CascadeModel(model, load_gazetteer())
+        if model is not None:
+            model = cascade
 
     # Determine which folders to process
     if args.folder:
@@ -352,20 +1655,12 @@ Examples:
         folders = [folder_path]
     elif args.gold_only:
         # Load gold standard to get folder list
-        gold_standard_path = PROJECT_ROOT / "data" / "gold_standard_annotations.txt"
         if not gold_standard_path.exists():
             print(f"Error: Gold standard not found: {gold_standard_path}")
             sys.exit(1)
 
         # Parse gold standard for folder names
-        gold_folders = set()
-        with open(gold_standard_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.startswith('## DOSSIER:'):
-                    folder_name = line.split(':', 1)[1].strip()
-                    gold_folders.add(folder_name)
-
-        folders = [args.data_dir / fname for fname in gold_folders if (args.data_dir / fname).exists()]
+        folders = load_gold_folders(gold_standard_path, args.data_dir)
 
         if verbose:
             print(f"Processing {len(folders)} gold standard folders")
@@ -373,54 +1668,202 @@ Examples:
         # All folders
         folders = [f for f in args.data_dir.iterdir() if f.is_dir()]
 
+    if shard is not None:
+        folders = select_shard(folders, *shard)
+        if verbose:
+            print(f"Shard {shard[0]}/{shard[1]}: {len(folders)} folders")
+
     if verbose:
         print(f"Total folders to process: {len(folders)}\n")
 
-    # Process all folders
-    all_results = []
-    for folder_path in sorted(folders):
-        results = process_folder(folder_path, model, verbose)
-        all_results.extend(results)
+    # Incremental mode: only new or changed documents go through the model
+    bucket_edges = [int(edge) for edge in args.bucket_edges.split(',')] if args.bucket_edges else None
+    batching = batching_mode(args.workers, args.batch_size, bucket_edges)
+    fingerprint = run_fingerprint(run_config(args.model, args.backend, args.chunker, cascade, dedup,
+                                             args.batch_size, batching))
+    incremental = None
+    documents = None
+    process_folders = folders
+    if args.incremental:
+        state_dir = args.state_dir or args.output_dir / f"incremental{shard_suffix(*shard) if shard else ''}"
+        incremental = IncrementalState(state_dir, fingerprint)
+        plan = incremental.plan(folders, full_scope=not (args.folder or args.gold_only))
+        documents = plan.to_process
+        process_folders = sorted({md_file.parent for md_file in documents})
+        print(plan.summary())
+
+    # Per-document journal: an interrupted run resumes without reprocessing finished documents
+    resumed = None
+    if args.resume:
+        path = latest_journal(args.output_dir, suffix) if args.resume == 'latest' else Path(args.resume)
+        if path is None or not path.exists():
+            print(f"Error: No run journal to resume in {args.output_dir}" if path is None
+                  else f"Error: Run journal not found: {path}")
+            sys.exit(1)
+
+        journal = RunJournal(path, fingerprint)
+        try:
+            journaled = journal.load()
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        resumed = scan_documents(folders)
+        processed_keys = set(resumed) - set(journaled)
+        documents = {resumed[key] for key in processed_keys}
+        process_folders = sorted({md_file.parent for md_file in documents})
+        print(f"Resume: {len(journaled)} documents from {path}, {len(documents)} left to process")
+
+    # Results dataset, created before any document is processed
+    if resumed is not None and journal_timestamp(journal.path):
+        # The interrupted run's partial dataset is superseded by its journal: rewritten under its name
+        timestamp = journal_timestamp(journal.path)
+        for fmt in RESULT_FORMATS:
+            remove_dataset(dataset_path(args.output_dir, f"ner_results_{timestamp}", fmt))
+        writer = ResultsWriter(dataset_path(args.output_dir, f"ner_results_{timestamp}", args.results_format),
+                               args.results_format)
+    else:
+        # Created exclusively: a run started in the same second gets the next free name
+        timestamp, writer = create_results_dataset(args.output_dir, timestamp, args.results_format, suffix)
+        timestamp += suffix
+    results_path = writer.path
+
+    # Journal opened only when asked for; a resumed run keeps journaling, so it can be resumed in turn
+    if resumed is None:
+        journal = RunJournal(journal_path(args.output_dir, timestamp), fingerprint) if args.journal else None
+    if journal is not None:
+        journal.open()
+
+    # Finished-document hooks: journal, throughput metrics
+    document_hooks = [journal.record] if journal is not None else []
+
+    def on_document(folder, doc, results):
+        for hook in document_hooks:
+            hook(folder, doc, results)
+
+    # Throughput metrics (Prometheus textfile) and/or live progress line
+    metrics = None
+    if args.metrics or args.progress:
+        metrics_path = None
+        if args.metrics:
+            metrics_path = (args.output_dir / "metrics" / f"ner_pipeline{shard_suffix(*shard) if shard else ''}.prom"
+                            if args.metrics == 'default' else Path(args.metrics))
+        metrics = run_metrics.enable(metrics_path, {'shard': args.shard} if shard else None)
+        metrics.expected_documents = sum(len(select_documents(folder_path, documents))
+                                         for folder_path in process_folders)
+        if args.progress and bucket_edges:
+            # Documents only complete once every bucket is inferred: no meaningful docs/s or ETA
+            print("Warning: --progress is not supported with --bucket-edges, no progress line")
+        elif args.progress:
+            metrics.enable_progress()
+        document_hooks.append(lambda folder, doc, results: metrics.record_document(results))
+
+    # Process all folders, streaming each folder's results to the dataset
+    prefetch = None
+    if args.workers > 1:
+        folder_results = process_corpus_parallel(process_folders, args.model, args.workers, verbose,
+                                                 args.batch_size, cache, args.cache_size_mb,
+                                                 args.chunker, cascade, dedup,
+                                                 args.backend, args.threads, args.mmap_weights,
+                                                 documents, on_document)
+    elif bucket_edges:
+        folder_results = process_corpus(process_folders, model, verbose, args.batch_size, bucket_edges,
+                                        get_chunker(args.chunker, model), documents=documents,
+                                        on_document=on_document)
+    else:
+        chunker = get_chunker(args.chunker, model)
+        if args.prefetch > 0:
+            md_files = [md_file for folder_path in sorted(process_folders)
+                        for md_file in select_documents(folder_path, documents)]
+            prefetch = DocumentPrefetcher(md_files, partial(prepare_document, chunker=chunker),
+                                          args.prefetch, args.prefetch_threads)
+        folder_results = ((folder_path.name, process_folder(folder_path, model, verbose,
+                                                            args.batch_size, chunker,
+                                                            documents=documents,
+                                                            on_document=on_document,
+                                                            prefetch=prefetch))
+                          for folder_path in sorted(process_folders))
+
+    if incremental is not None:
+        # Stored results of unchanged documents merged back in, in full-run order
+        folder_results = incremental.merge(folder_results, plan)
+    elif resumed is not None:
+        # Journaled results of the interrupted run merged back in, in full-run order
+        folder_results = merge_documents(folder_results, resumed, processed_keys, journaled)
+
+    with writer:
+        for folder_name, results in folder_results:
+            with stage('write_results') as counts:
+                writer.write(results)
+            if counts is not None:
+                counts['items'] = len(results)
+
+    if incremental is not None:
+        incremental.commit(plan)
+    if journal is not None:
+        journal.remove()
+    if prefetch is not None:
+        prefetch.close()
+    if metrics is not None:
+        metrics.close()
 
     if verbose:
         print(f"\n" + "=" * 80)
-        print(f"Total entities extracted: {len(all_results)}")
+        print(f"Raw predictions written: {writer.rows}")
+        print(f"Results dataset saved: {results_path}")
 
-    # Deduplicate
-    deduplicated = deduplicate_results(all_results)
+    if cache is not None:
+        print(cache.summary())
 
-    if verbose:
-        print(f"After deduplication: {len(deduplicated)}")
-        print("=" * 80)
+    if cascade is not None:
+        print(cascade.summary())
 
-    # Create Excel report
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    excel_path = args.output_dir / f"ner_results_{timestamp}.xlsx"
-    create_excel_report(deduplicated, excel_path)
+    if dedup is not None:
+        print(dedup.summary())
+
+    if prefetch is not None:
+        print(prefetch.summary())
 
-    # Statistics
-    df = pd.DataFrame(deduplicated)
+    if metrics is not None:
+        print(metrics.summary())
+        if metrics.path is not None:
+            print(f"Metrics saved: {metrics.path}")
 
     if verbose:
-        print("\nStatistics by type:")
-        for entity_type, count in df['Type'].value_counts().items():
-            print(f"  {entity_type}: {count}")
+        print("=" * 80)
 
-    # Run evaluation if requested
+    # Create Excel report (post-processing of the results dataset)
+    excel_path = args.output_dir / f"ner_results_{timestamp}.xlsx"
+    deduplicated = None
+    if not args.no_excel:
+        mentions_path = args.output_dir / f"ner_mentions_{timestamp}.xlsx"
+        deduplicated = build_reports(results_path, excel_path, mentions_path, verbose, args.excel_engine)
+
+    # Run evaluation if requested (in-process, on the deduplicated results)
     if not args.no_eval:
-        gold_standard_path = PROJECT_ROOT / "data" / "gold_standard_annotations.txt"
+        if deduplicated is None:
+            deduplicated = deduplicate_dataset(results_path)
+
         eval_report_path = args.output_dir / f"evaluation_report_{timestamp}.txt"
+        run_evaluation(deduplicated, gold_standard_path, eval_report_path)
 
-        success = run_evaluation(excel_path, gold_standard_path, eval_report_path)
+    if args.sweep:
+        run_threshold_sweep(results_path, gold_standard_path, args.sweep_grid)
 
-        if success and verbose:
-            print(f"\nEvaluation report saved: {eval_report_path}")
+    if args.cascade_audit:
+        run_cascade_audit(read_results(results_path), folders, cascade, gold_standard_path,
+                          args.batch_size, get_chunker(args.chunker, model))
 
     if verbose:
+        own_rss, worker_rss = peak_rss_mb()
         print("\n" + "=" * 80)
         print("PIPELINE COMPLETED")
         print("=" * 80)
-        print(f"\nResults: {excel_path}")
+        print(f"\nResults: {results_path if args.no_excel else excel_path}")
+        print(f"Peak RSS: {own_rss:.0f} MB (main), {worker_rss:.0f} MB (largest worker)")
+
+    if args.trace_stages:
+        write_profile(args.output_dir, timestamp)
 
 
 if __name__ == '__main__':
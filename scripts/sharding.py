@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Runs NER répartis sur plusieurs machines (système de fichiers partagé)
+--shard i/N : sous-ensemble stable de dossiers (hash du nom de dossier), identique sur toutes
+les machines. Sous-commande merge : fusionne les datasets des shards dans l'ordre d'un run
+complet, puis rapport Excel et évaluation comme --excel-from.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import re
+import sys
+import hashlib
+import argparse
+from pathlib import Path
+from datetime import datetime
+from collections import defaultdict
+
+from excel_writer import EXCEL_ENGINES, DEFAULT_EXCEL_ENGINE
+from results_dataset import RESULT_FORMATS, create_results_dataset, read_results
+from run_ner_pipeline import (
+    OUTPUT_DIR,
+    PROJECT_ROOT,
+    deduplicate_dataset,
+    build_reports,
+    run_evaluation,
+)
+
+
+SHARD_RE = re.compile(r'^(\d+)/(\d+)$')
+SHARD_NAME_RE = re.compile(r'_shard(\d+)of(\d+)$')
+
+
+def parse_shard(value):
+    """'i/N' -> (i, N), 1 <= i <= N"""
+    match = SHARD_RE.match(value)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise ValueError(f"Invalid shard '{value}' (expected i/N with 1 <= i <= N)")
+    return int(match.group(1)), int(match.group(2))
+
+
+def shard_suffix(index, count):
+    """Suffixe des fichiers de sortie d'un shard (dataset, journal, profil)"""
+    return f"_shard{index}of{count}"
+
+
+def folder_shard(folder_name, count):
+    """Shard (1..count) d'un dossier : hash stable du nom, indépendant de la machine et du run"""
+    digest = hashlib.blake2b(folder_name.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count + 1
+
+
+def select_shard(folders, index, count):
+    """Dossiers du shard index/count"""
+    return [folder_path for folder_path in folders if folder_shard(folder_path.name, count) == index]
+
+
+def merge_datasets(paths, output_dir, timestamp, fmt='jsonl'):
+    """
+    Fusionne les datasets des shards : chaque dossier est écrit d'un bloc, dossiers triés,
+    lignes dans l'ordre de leur shard (même contenu et même ordre qu'un run sur une machine)
+    Dataset fusionné : ner_results_<horodatage> dans output_dir (create_results_dataset)
+    Raises: ValueError si un dossier apparaît dans plusieurs datasets
+    Returns: (horodatage retenu, ResultsWriter (path, rows, batches))
+    """
+    by_folder = {}
+    for path in paths:
+        shard_folders = defaultdict(list)
+        for result in read_results(path):
+            shard_folders[result['Folder']].append(result)
+
+        for folder_name, results in shard_folders.items():
+            if folder_name in by_folder:
+                raise ValueError(f"Folder {folder_name} appears in several datasets ({path})")
+            by_folder[folder_name] = results
+
+    timestamp, writer = create_results_dataset(output_dir, timestamp, fmt)
+    with writer:
+        for folder_name in sorted(by_folder):
+            writer.write(by_folder[folder_name])
+    return timestamp, writer
+
+
+def missing_shards(paths):
+    """Shards absents d'après les noms des datasets (..._shard<i>of<N>), liste vide si non déductible"""
+    shards = set()
+    counts = set()
+    for path in paths:
+        match = SHARD_NAME_RE.search(Path(path).name.split('.')[0])
+        if match is None:
+            return []
+        shards.add(int(match.group(1)))
+        counts.add(int(match.group(2)))
+
+    if len(counts) != 1:
+        return []
+    return sorted(set(range(1, counts.pop() + 1)) - shards)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='run_ner_pipeline.py merge',
+        description='Merge the per-shard results datasets of a --shard run, then build the Excel '
+                    'report and run the evaluation as for a single-node run',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example usage:
+  python run_ner_pipeline.py --shard 1/3     # on node 1 (and 2/3, 3/3 on the other nodes)
+  python run_ner_pipeline.py merge ../outputs/ner_results_*_shard*of3.jsonl
+        """
+    )
+
+    parser.add_argument('datasets', type=Path, nargs='+',
+                        help='Per-shard results datasets (JSONL files or Parquet directories)')
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR,
+                        help='Path to output directory')
+    parser.add_argument('--results-format', choices=RESULT_FORMATS, default='jsonl',
+                        help='Format of the merged results dataset')
+    parser.add_argument('--allow-missing', action='store_true',
+                        help='Merge even if dataset names show that some shards are missing')
+    parser.add_argument('--no-excel', action='store_true',
+                        help='Only write the merged results dataset')
+    parser.add_argument('--excel-engine', choices=EXCEL_ENGINES, default=DEFAULT_EXCEL_ENGINE,
+                        help='Excel writer: xlsxwriter (constant memory) or openpyxl')
+    parser.add_argument('--no-eval', action='store_true',
+                        help='Skip evaluation step')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Quiet mode (less verbose)')
+
+    args = parser.parse_args(argv)
+    verbose = not args.quiet
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    for path in args.datasets:
+        if not path.exists():
+            print(f"Error: Results dataset not found: {path}")
+            sys.exit(1)
+
+    missing = missing_shards(args.datasets)
+    if missing and not args.allow_missing:
+        print(f"Error: Missing shards: {', '.join(map(str, missing))} (use --allow-missing to merge anyway)")
+        sys.exit(1)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        timestamp, writer = merge_datasets(args.datasets, args.output_dir, timestamp, args.results_format)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    results_path = writer.path
+
+    if verbose:
+        print(f"Merged {len(args.datasets)} datasets: {writer.rows} raw predictions, {writer.batches} folders")
+        print(f"Results dataset saved: {results_path}")
+
+    if args.no_excel and args.no_eval:
+        return
+
+    excel_path = args.output_dir / f"ner_results_{timestamp}.xlsx"
+    mentions_path = args.output_dir / f"ner_mentions_{timestamp}.xlsx"
+    deduplicated = None
+    if not args.no_excel:
+        deduplicated = build_reports(results_path, excel_path, mentions_path, verbose, args.excel_engine)
+
+    if not args.no_eval:
+        if deduplicated is None:
+            deduplicated = deduplicate_dataset(results_path)
+
+        gold_standard_path = PROJECT_ROOT / "data" / "gold_standard_annotations.txt"
+        run_evaluation(deduplicated, gold_standard_path, args.output_dir / f"evaluation_report_{timestamp}.txt")
+
+
+if __name__ == '__main__':
+    main()
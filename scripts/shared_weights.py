@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Poids GLiNER partagés entre processus par mmap
+Les poids sont exportés une fois en safetensors à côté du checkpoint ; chaque worker construit
+le squelette du modèle sur le device meta (sans poids), mappe le fichier (MAP_PRIVATE, lecture
+seule en pratique) et ses paramètres pointent sur ces pages : le page cache est partagé par tous
+les workers. Le chargeur de la classe GLiNER concrète est remplacé, le checkpoint n'est pas lu.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import os
+import json
+import struct
+import inspect
+from pathlib import Path
+
+
+# Export safetensors, relatif au dossier du checkpoint (sous-dossier : n'entre pas dans model_fingerprint)
+MMAP_WEIGHTS_FILE = "mmap/model.safetensors"
+
+
+def mmap_weights_path(model_path):
+    return Path(model_path) / MMAP_WEIGHTS_FILE
+
+
+def ensure_mmap_weights(model_path):
+    """Exporte les poids du modèle en safetensors s'ils ne sont pas déjà à côté du checkpoint"""
+    weights_path = mmap_weights_path(model_path)
+    if not weights_path.exists():
+        from gliner import GLiNER
+        from safetensors.torch import save_model
+
+        print(f"Exporting safetensors weights to: {weights_path}")
+        model = GLiNER.from_pretrained(str(model_path))
+
+        weights_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = weights_path.with_suffix(f".{os.getpid()}.tmp")
+        # save_model gère les paramètres partagés (noms omis listés dans les métadonnées)
+        save_model(model.model, str(tmp))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, weights_path)
+    return weights_path
+
+
+def mmap_state_dict(weights_path):
+    """
+    State dict dont les tenseurs sont des vues sur le fichier safetensors mappé en mémoire
+    Format : 8 octets (taille de l'en-tête JSON), en-tête, puis les données brutes
+    """
+    import torch
+
+    dtypes = {
+        'F64': torch.float64, 'F32': torch.float32, 'F16': torch.float16, 'BF16': torch.bfloat16,
+        'I64': torch.int64, 'I32': torch.int32, 'I16': torch.int16, 'I8': torch.int8,
+        'U8': torch.uint8, 'BOOL': torch.bool,
+    }
+
+    weights_path = Path(weights_path)
+    with open(weights_path, 'rb') as f:
+        header_size = struct.unpack('<Q', f.read(8))[0]
+        header = json.loads(f.read(header_size))
+    metadata = header.pop('__metadata__', None) or {}
+
+    storage = torch.UntypedStorage.from_file(str(weights_path), shared=False,
+                                             nbytes=weights_path.stat().st_size)
+    data = torch.empty(0, dtype=torch.uint8).set_(storage)
+    base = 8 + header_size
+
+    state_dict = {}
+    for name, info in header.items():
+        dtype = dtypes[info['dtype']]
+        start, end = info['data_offsets']
+        raw = data[base + start:base + end]
+        if (base + start) % raw.new_empty(0, dtype=dtype).element_size():
+            # Tenseur non aligné : copie privée
+            raw = raw.clone()
+        state_dict[name] = raw.view(dtype).view(tuple(info['shape']))
+
+    # Paramètres partagés omis par save_model : metadata[nom omis] = nom enregistré
+    for omitted, saved in metadata.items():
+        if omitted not in state_dict and saved in state_dict:
+            state_dict[omitted] = state_dict[saved]
+
+    return state_dict
+
+
+def load_mmap_model(model_path):
+    """
+    GLiNER dont les paramètres sont des vues sur le fichier safetensors mappé
+    GLiNER.from_pretrained délègue à la classe concrète du checkpoint (UniEncoderSpanGLiNER...) :
+    c'est son chargeur de state dict qui est remplacé, le checkpoint n'est jamais lu.
+    Le squelette est construit sur le device meta (low_cpu_mem_usage) et reçoit directement
+    les vues mmap : le pic mémoire du chargement ne contient pas de copie des poids.
+    Les versions de gliner sans low_cpu_mem_usage initialisent des poids aléatoires, remplacés ensuite.
+    """
+    from gliner import GLiNER
+
+    state_dict = mmap_state_dict(ensure_mmap_weights(model_path))
+
+    with open(Path(model_path) / "gliner_config.json", 'r', encoding='utf-8') as f:
+        gliner_class = GLiNER._get_gliner_class(GLiNER._config_from_dict(json.load(f)))
+
+    class MmapGLiNER(gliner_class):
+        @classmethod
+        def _load_state_dict(cls, model_file, map_location='cpu', dtype=None):
+            # Lu par from_pretrained à la place du checkpoint
+            return dict(state_dict)
+
+    kwargs = {}
+    if 'low_cpu_mem_usage' in inspect.signature(gliner_class.from_pretrained).parameters:
+        kwargs['low_cpu_mem_usage'] = True
+    model = MmapGLiNER.from_pretrained(str(model_path), **kwargs)
+
+    # Sans effet si les paramètres sont déjà les vues mmap ; sinon (repli de gliner sur le
+    # chargement standard) les copies privées sont remplacées et libérées
+    model.model.load_state_dict(state_dict, assign=True)
+    return model
+
+
+def memory_usage_mb():
+    """
+    Mémoire du processus (Mo) : RSS, pic de RSS (VmHWM), PSS (pages partagées réparties entre
+    processus) et USS (pages privées), depuis /proc/self/smaps_rollup et /proc/self/status
+    """
+    usage = {}
+    try:
+        with open('/proc/self/smaps_rollup', 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('Rss', 'Pss', 'Private_Clean', 'Private_Dirty'):
+                    usage[key] = int(value.split()[0]) / 1024
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key == 'VmHWM':
+                    usage[key] = int(value.split()[0]) / 1024
+    except OSError:
+        return None
+
+    return {'rss': usage['Rss'], 'peak': usage['VmHWM'], 'pss': usage['Pss'],
+            'uss': usage['Private_Clean'] + usage['Private_Dirty']}
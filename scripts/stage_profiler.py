@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Profilage par étape du pipeline NER (--trace-stages)
+Temps réel et CPU, nombre d'appels, octets / tokens / éléments traités par étape et par document ;
+sortie au format Chrome trace-event (chrome://tracing, Perfetto) et tableau récapitulatif.
+Désactivé, stage() renvoie un context manager vide partagé : coût négligeable.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import os
+import json
+import time
+import threading
+from collections import defaultdict
+
+
+# Profiler actif du processus (None = profilage désactivé)
+_active = None
+
+
+class _NullStage:
+    """Étape non mesurée (profilage désactivé)"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Mesure d'une étape ; les compteurs (bytes, tokens, items) sont remplis par l'appelant"""
+    __slots__ = ('profiler', 'name', 'doc', 'counts', 'start', 'cpu_clock', 'cpu_start')
+
+    def __init__(self, profiler, name, doc):
+        self.profiler = profiler
+        self.name = name
+        self.doc = doc
+        self.counts = {}
+
+    def __enter__(self):
+        # Thread principal : CPU du processus, threads intra-op de torch compris (inférence).
+        # Threads de préchargement : CPU du thread seul, pour ne pas compter l'inférence en parallèle
+        if threading.current_thread() is threading.main_thread():
+            self.cpu_clock = time.process_time_ns
+        else:
+            self.cpu_clock = time.thread_time_ns
+        self.start = time.perf_counter_ns()
+        self.cpu_start = self.cpu_clock()
+        return self.counts
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        cpu = self.cpu_clock() - self.cpu_start
+        self.profiler.events.append((self.name, self.doc, self.start, end - self.start, cpu,
+                                     self.profiler.pid, threading.get_native_id(), self.counts))
+        return False
+
+
+def stage(name, doc=None):
+    """
+    Context manager mesurant une étape ; renvoie le dict des compteurs, ou None si désactivé
+    Usage : with stage('clean_markdown', doc) as counts: ... ; if counts is not None: counts['bytes'] = n
+    """
+    if _active is None:
+        return _NULL_STAGE
+    return _Stage(_active, name, doc)
+
+
+def enable():
+    """Active le profilage dans ce processus"""
+    global _active
+    if _active is None:
+        _active = StageProfiler()
+    return _active
+
+
+def active():
+    """Profiler actif, None si désactivé"""
+    return _active
+
+
+def drain():
+    """Événements enregistrés depuis le dernier appel (renvoyés par les workers au processus principal)"""
+    if _active is None:
+        return []
+    events, _active.events = _active.events, []
+    return events
+
+
+class StageProfiler:
+    """Événements (étape, document, début, durée, CPU, pid, thread, compteurs), en nanosecondes"""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.events = []
+        self.start = time.perf_counter_ns()
+
+    def add_events(self, events):
+        """Ajoute les événements d'un worker (perf_counter est monotone pour tout le système)"""
+        self.events.extend(events)
+
+    def stage_totals(self):
+        """Totaux par étape : calls, wall, cpu (ns), bytes, tokens, items"""
+        totals = defaultdict(lambda: defaultdict(int))
+        for name, _, _, wall, cpu, _, _, counts in self.events:
+            total = totals[name]
+            total['calls'] += 1
+            total['wall'] += wall
+            total['cpu'] += cpu
+            for key, value in counts.items():
+                total[key] += value
+        return totals
+
+    def document_totals(self):
+        """Temps réel par document (somme de ses étapes)"""
+        totals = defaultdict(int)
+        for name, doc, _, wall, _, _, _, _ in self.events:
+            if doc is not None:
+                totals[doc] += wall
+        return totals
+
+    def write_trace(self, output_path):
+        """Écrit les événements au format Chrome trace-event (durées en microsecondes)"""
+        origin = min([self.start] + [event[2] for event in self.events])
+        trace_events = []
+        for pid in sorted({event[5] for event in self.events} | {self.pid}):
+            trace_events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                                 'args': {'name': 'main' if pid == self.pid else f"worker {pid}"}})
+
+        for name, doc, start, wall, cpu, pid, tid, counts in self.events:
+            args = dict(counts, cpu_ms=round(cpu / 1e6, 3))
+            if doc is not None:
+                args['doc'] = doc
+            trace_events.append({'name': name, 'cat': 'stage', 'ph': 'X', 'pid': pid, 'tid': tid,
+                                 'ts': (start - origin) / 1e3, 'dur': wall / 1e3, 'args': args})
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+        return output_path
+
+    def summary(self, top_documents=10):
+        """Tableau récapitulatif par étape, puis les documents les plus lents"""
+        elapsed = time.perf_counter_ns() - self.start
+        lines = [f"{'Stage':<22} {'Calls':>7} {'Wall (s)':>9} {'Wall %':>7} {'CPU (s)':>9} "
+                 f"{'MB':>8} {'Tokens':>10} {'Items':>9}",
+                 "-" * 88]
+
+        totals = self.stage_totals()
+        for name, total in sorted(totals.items(), key=lambda item: -item[1]['wall']):
+            lines.append(f"{name:<22} {total['calls']:>7} {total['wall'] / 1e9:>9.2f} "
+                         f"{total['wall'] / elapsed:>7.1%} {total['cpu'] / 1e9:>9.2f} "
+                         f"{total['bytes'] / 1024 / 1024:>8.2f} {total['tokens']:>10} {total['items']:>9}")
+        lines.append("-" * 88)
+        lines.append(f"Run wall time: {elapsed / 1e9:.2f}s (worker stages overlap, "
+                     f"so percentages can exceed 100% with --workers)")
+
+        documents = sorted(self.document_totals().items(), key=lambda item: -item[1])[:top_documents]
+        if documents:
+            lines.append("\nSlowest documents:")
+            for doc, wall in documents:
+                lines.append(f"  {doc:<50} {wall / 1e9:>8.3f}s")
+
+        return "\n".join(lines)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Corpus OCR synthétique et modèle factice pour les benchmarks
+Reproduit l'arborescence du projet (data/annotated/ocr_results/<DOSSIER>/<DOSSIER>_docNN.md
+et outputs/{person,org,gpe}_FINAL_CLEAN.xlsx) : titres markdown, tableaux HTML, texte
+multilingue (FR/EN/DE/EO), à l'échelle 1x = 666 documents / 43 dossiers du corpus réel.
+Déterministe pour une graine donnée.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import re
+import time
+import random
+import hashlib
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+import pandas as pd
+
+
+# Taille du corpus réel (échelle 1x)
+BASE_DOCUMENTS = 666
+BASE_FOLDERS = 43
+
+# Taille des listes d'entités curées (échelle 1x)
+BASE_ENTITIES = {'PERSON': 832, 'ORGANIZATION': 300, 'GPE': 200}
+
+ENTITY_FILES = {
+    'PERSON': "outputs/person_FINAL_CLEAN.xlsx",
+    'ORGANIZATION': "outputs/org_FINAL_CLEAN.xlsx",
+    'GPE': "outputs/gpe_FINAL_CLEAN.xlsx",
+}
+
+CORPUS_SUBDIR = "data/annotated/ocr_results"
+
+# Biais du tirage des entités par document (1 = uniforme)
+ZIPF_EXPONENT = 2.5
+
+FIRST_NAMES = [
+    'Edmond', 'Hector', 'Albert', 'Marie', 'Ludwig', 'Inazo', 'Robert', 'Gilbert', 'Pierre', 'Anna',
+    'Henri', 'Eric', 'Lazare', 'Helen', 'Jean', 'Gustave', 'William', 'Hans', 'Louise', 'Paul',
+]
+TITLES = ['Dr.', 'M.', 'Prof.', 'Mr.', 'Mme', 'Herr', 'S-ro']
+SYLLABLES = [
+    'ba', 'ro', 'len', 'mar', 'ti', 'vat', 'hod', 'ler', 'zam', 'en', 'hof', 'pri', 'dru',
+    'mond', 'sel', 'kra', 'ni', 'tow', 'ber', 'ga', 'lu', 'schi', 'ova', 'ric', 'dan', 'vel',
+]
+REAL_PLACES = ['Genève', 'Geneva', 'Berne', 'London', 'Paris', 'Berlin', 'Tokyo', 'Praha', 'Wien',
+               'France', 'Suisse', 'Germany', 'Japan', 'Italia']
+ORG_PATTERNS = [
+    'Société des Nations', 'League of Nations', 'Bureau international du Travail',
+    'Universala Esperanto-Asocio', 'Comité de {place}', 'Association of {place}',
+    'Verein {place}', 'Esperanto-Societo de {place}', 'Chambre de commerce de {place}',
+    'University of {place}', 'Ministère des Affaires étrangères de {place}',
+]
+
+SENTENCES = {
+    'fr': [
+        "{person} a rencontré les délégués de {org} à {place}.",
+        "La lettre de {person} au secrétaire général de {org} est datée de {place}.",
+        "Le rapport présenté par {person} concerne l'enseignement de l'espéranto en {place}.",
+        "Les représentants de {org} ont discuté de la question avec {person}.",
+        "Il est entendu que la Commission examinera la proposition lors de sa prochaine session.",
+    ],
+    'en': [
+        "{person} attended the meeting of {org} held in {place}.",
+        "A memorandum from {person} was forwarded to {org} on the same day.",
+        "The delegation of {place} supported the resolution submitted by {person}.",
+        "The Secretariat has received several letters on this subject from {place}.",
+    ],
+    'de': [
+        "{person} hat im Namen von {org} an die Konferenz in {place} geschrieben.",
+        "Der Bericht von {person} wurde dem Ausschuss von {org} vorgelegt.",
+        "Die Regierung in {place} unterstützt den Vorschlag.",
+    ],
+    'eo': [
+        "{person} parolis pri la lingvo internacia en {place}.",
+        "La estraro de {org} salutas la laboron de {person}.",
+        "La kongreso okazos en {place} kun la helpo de {org}.",
+    ],
+}
+
+HEADERS = {
+    'fr': ["Société des Nations", "Secrétariat", "Note du Secrétaire général", "Procès-verbal"],
+    'en': ["League of Nations", "Information Section", "Memorandum", "Minutes"],
+    'de': ["Völkerbund", "Abschrift", "Bericht"],
+    'eo': ["Ligo de Nacioj", "Raporto", "Letero"],
+}
+
+
+def synthetic_word(rng, min_syllables=2, max_syllables=3):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(min_syllables, max_syllables)))
+
+
+def unique_names(rng, count, make):
+    """count noms distincts produits par make(rng)"""
+    names = []
+    seen = set()
+    while len(names) < count:
+        name = make(rng)
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+def make_entities(rng, scale):
+    """
+    Listes d'entités synthétiques : {type: [(nom canonique, [alias])]}
+    Les alias sont les formes effectivement écrites dans les documents
+    """
+    sizes = {entity_type: max(1, round(n * scale)) for entity_type, n in BASE_ENTITIES.items()}
+
+    places = REAL_PLACES + unique_names(
+        rng, max(0, sizes['GPE'] - len(REAL_PLACES)),
+        lambda r: synthetic_word(r).capitalize() + r.choice(['', 'burg', 'ville', 'stadt', 'ia']))
+    places = places[:sizes['GPE']]
+
+    persons = unique_names(
+        rng, sizes['PERSON'],
+        lambda r: f"{r.choice(FIRST_NAMES)} {synthetic_word(r).capitalize()}")
+
+    orgs = unique_names(
+        rng, sizes['ORGANIZATION'],
+        lambda r: r.choice(ORG_PATTERNS).format(place=r.choice(places)) if r.random() < 0.5
+        else f"{r.choice(['Comité', 'Union', 'Institut', 'Liga'])} {synthetic_word(r).capitalize()}")
+
+    entities = {
+        'PERSON': [(name, [f"{rng.choice(TITLES)} {name.split()[-1]}", f"{name[0]}. {name.split()[-1]}"])
+                   for name in persons],
+        'ORGANIZATION': [(name, [name.upper()] if rng.random() < 0.2 else []) for name in orgs],
+        'GPE': [(name, []) for name in places],
+    }
+    return entities
+
+
+def html_table(rng, persons, places):
+    """Tableau HTML comme ceux produits par l'OCR (listes de délégués, adresses)"""
+    rows = ["<tr><td>Nom</td><td>Ville</td><td>Date</td></tr>"]
+    for person, place in zip(persons, places):
+        rows.append(f"<tr><td>{person}</td><td>{place}</td>"
+                    f"<td>{rng.randint(1, 28)}.{rng.randint(1, 12)}.19{rng.randint(20, 39)}</td></tr>")
+    return "<table>" + "".join(rows) + "</table>"
+
+
+def pick(rng, pool, count):
+    """Tirage biaisé vers le début de la liste : quelques entités fréquentes, une longue traîne de rares"""
+    indices = {int(len(pool) * rng.random() ** ZIPF_EXPONENT) for _ in range(count)}
+    return [pool[i] for i in sorted(indices)]
+
+
+def make_document(rng, entities, doc_id, mentions):
+    """Un document OCR : titres, paragraphes multilingues, parfois un tableau HTML"""
+    language = rng.choice(list(SENTENCES))
+    persons = pick(rng, entities['PERSON'], rng.randint(2, 8))
+    orgs = pick(rng, entities['ORGANIZATION'], rng.randint(1, 4))
+    places = pick(rng, entities['GPE'], rng.randint(1, 4))
+
+    def mention(entity_type, entity):
+        name, aliases = entity
+        surface = rng.choice([name] + aliases)
+        mentions[entity_type][name][doc_id] += 1
+        return surface
+
+    lines = [f"# {rng.choice(HEADERS[language])}", ""]
+    for _ in range(rng.randint(2, 6)):
+        lines.append(f"## {rng.choice(HEADERS[language])} {rng.randint(1, 40)}")
+        lines.append("")
+        paragraph = []
+        for _ in range(rng.randint(3, 10)):
+            template = rng.choice(SENTENCES[language])
+            paragraph.append(template.format(
+                person=mention('PERSON', rng.choice(persons)) if '{person}' in template else '',
+                org=mention('ORGANIZATION', rng.choice(orgs)) if '{org}' in template else '',
+                place=mention('GPE', rng.choice(places)) if '{place}' in template else ''))
+        lines.append(" ".join(paragraph))
+        lines.append("")
+
+        if rng.random() < 0.3:
+            table_persons = [mention('PERSON', p) for p in persons[:3]]
+            table_places = [mention('GPE', rng.choice(places)) for _ in table_persons]
+            lines.append(html_table(rng, table_persons, table_places))
+            lines.append("")
+
+    return "\n".join(lines)
+
+
+def folder_names(rng, count):
+    return unique_names(rng, count,
+                        lambda r: f"R{r.choice([1048, 1049])}-13C-{r.randint(10000, 59999)}-23516")
+
+
+def entity_frames(entities, mentions):
+    """DataFrames au format des listes curées (entity_normalized, aliases, documents, nb_occurrences)"""
+    frames = {}
+    for entity_type, entity_list in entities.items():
+        rows = []
+        for name, aliases in entity_list:
+            documents = mentions[entity_type].get(name)
+            if not documents:
+                continue
+            rows.append({
+                'entity_normalized': name,
+                'aliases': ', '.join(aliases) if aliases else None,
+                'documents': ', '.join(documents),
+                'nb_occurrences': sum(documents.values()),
+            })
+        frames[entity_type] = pd.DataFrame(rows, columns=['entity_normalized', 'aliases', 'documents',
+                                                          'nb_occurrences'])
+    return frames
+
+
+def generate_corpus(output_dir, scale=1.0, seed=42):
+    """
+    Écrit le corpus synthétique et les listes d'entités sous output_dir
+    Returns: (dossier des documents OCR, {type: DataFrame des entités})
+    """
+    rng = random.Random(seed)
+    output_dir = Path(output_dir)
+    corpus_dir = output_dir / CORPUS_SUBDIR
+
+    n_docs = max(1, round(BASE_DOCUMENTS * scale))
+    n_folders = min(n_docs, max(1, round(BASE_FOLDERS * scale)))
+
+    entities = make_entities(rng, scale)
+    # mentions[type][nom canonique][doc_id] = nombre d'occurrences
+    mentions = {entity_type: defaultdict(lambda: defaultdict(int)) for entity_type in entities}
+
+    for i, folder in enumerate(folder_names(rng, n_folders)):
+        folder_dir = corpus_dir / folder
+        folder_dir.mkdir(parents=True, exist_ok=True)
+        folder_docs = n_docs // n_folders + (1 if i < n_docs % n_folders else 0)
+        for n in range(1, folder_docs + 1):
+            doc_id = f"{folder}_doc{n:02d}"
+            text = make_document(rng, entities, doc_id, mentions)
+            (folder_dir / f"{doc_id}.md").write_text(text, encoding='utf-8')
+
+    frames = entity_frames(entities, mentions)
+    for entity_type, df in frames.items():
+        path = output_dir / ENTITY_FILES[entity_type]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_excel(path, index=False)
+
+    return corpus_dir, frames
+
+
+class StubModel:
+    """
+    Modèle factice déterministe (même interface que GLiNER) : les suites de mots capitalisés
+    sont des entités, label et score tirés d'un hash du texte. Coût négligeable devant le
+    reste du pipeline ; le temps passé dans le modèle est compté (calls, seconds).
+    """
+
+    SPAN_RE = re.compile(r"[A-ZÀ-Ý][\w'-]+(?:\s+[A-ZÀ-Ý][\w'-]+)*")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+
+    def predict_entities(self, text, labels, threshold=0.5, **kwargs):
+        start = time.perf_counter()
+        entities = []
+        for match in self.SPAN_RE.finditer(text):
+            digest = hashlib.blake2b(match.group().encode('utf-8'), digest_size=2).digest()
+            score = 0.35 + digest[1] / 255 * 0.64
+            if score >= threshold:
+                entities.append({'start': match.start(), 'end': match.end(), 'text': match.group(),
+                                 'label': labels[digest[0] % len(labels)], 'score': score})
+        self.calls += 1
+        self.seconds += time.perf_counter() - start
+        return entities
+
+    def batch_predict_entities(self, texts, labels, threshold=0.5, **kwargs):
+        return [self.predict_entities(text, labels, threshold) for text in texts]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate a synthetic OCR corpus (project layout) for benchmarks'
+    )
+
+    parser.add_argument('--output-dir', type=Path, required=True,
+                        help='Root of the synthetic project (data/annotated/ocr_results and outputs/ are created)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help=f'Corpus size relative to the real corpus ({BASE_DOCUMENTS} documents)')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Random seed (same seed, same corpus)')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    corpus_dir, frames = generate_corpus(args.output_dir, args.scale, args.seed)
+    n_docs = sum(1 for _ in corpus_dir.glob("*/*.md"))
+
+    print(f"Documents: {n_docs} in {corpus_dir} ({time.perf_counter() - start:.1f}s)")
+    for entity_type, df in frames.items():
+        print(f"  {entity_type}: {len(df)} entities -> {args.output_dir / ENTITY_FILES[entity_type]}")
+
+
+if __name__ == '__main__':
+    main()
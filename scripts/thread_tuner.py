@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Auto-tuning CPU : threads torch x workers x taille de batch
+Mesure le débit (chunks/s) sur un échantillon de chunks réels pour chaque configuration
+et écrit la meilleure dans un profil (models/configs/cpu_profile_<machine>.json),
+chargé automatiquement au démarrage de run_ner_pipeline.py
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import multiprocessing
+from pathlib import Path
+from datetime import datetime
+
+from inference_backends import BACKENDS, DEFAULT_BACKEND, load_backend, ensure_onnx_model
+from run_ner_pipeline import (
+    DEFAULT_MODEL_PATH,
+    PROJECT_ROOT,
+    DATA_DIR,
+    prepare_document,
+    predict_chunks,
+)
+
+
+PROFILE_DIR = PROJECT_ROOT / "models/configs"
+
+
+def profile_path(profile_dir=PROFILE_DIR):
+    """Profil de la machine courante (le meilleur réglage dépend du CPU)"""
+    return Path(profile_dir) / f"cpu_profile_{socket.gethostname()}.json"
+
+
+def load_profile(path=None, backend=None):
+    """
+    Profil CPU de la machine, None s'il n'existe pas
+    ou s'il a été mesuré avec un autre backend que backend (le meilleur réglage en dépend)
+    """
+    path = Path(path) if path else profile_path()
+    if not path.exists():
+        return None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        profile = json.load(f)
+
+    if profile.get('cpu_count') != os.cpu_count():
+        print(f"Warning: CPU profile {path} was tuned for {profile.get('cpu_count')} CPUs, ignoring it")
+        return None
+
+    if backend is not None and profile.get('backend', DEFAULT_BACKEND) != backend:
+        print(f"Warning: CPU profile {path} was tuned for the {profile.get('backend')} backend, "
+              f"not {backend}, ignoring it")
+        return None
+
+    profile['path'] = str(path)
+    return profile
+
+
+def save_profile(best, model_path, backend, n_chunks, path=None):
+    """Écrit le meilleur réglage"""
+    path = Path(path) if path else profile_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    profile = {
+        'threads': best['threads'],
+        'workers': best['workers'],
+        'batch_size': best['batch_size'],
+        'chunks_per_s': round(best['rate'], 2),
+        'backend': backend,
+        'model': str(model_path),
+        'sample_chunks': n_chunks,
+        'cpu_count': os.cpu_count(),
+        'host': socket.gethostname(),
+        'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+    return path
+
+
+def collect_chunks(data_dir, max_chunks):
+    """Échantillon de chunks réels du corpus OCR"""
+    chunks = []
+    for md_file in sorted(data_dir.glob("*/*.md")):
+        _, doc_chunks, _ = prepare_document(md_file)
+        chunks.extend(doc_chunks)
+        if len(chunks) >= max_chunks:
+            break
+    return chunks[:max_chunks]
+
+
+# Modèle du processus de benchmark
+_tune_state = {}
+
+
+def init_tune_worker(model_path, backend, num_threads):
+    import torch
+
+    torch.set_num_threads(num_threads)
+    torch.set_num_interop_threads(1)
+    _tune_state['model'] = load_backend(model_path, backend)
+
+
+def predict_task(task):
+    chunks, batch_size = task
+    predict_chunks(_tune_state['model'], chunks, batch_size)
+    return len(chunks)
+
+
+def measure(pool, workers, chunks, batch_size):
+    """Débit (chunks/s) de l'échantillon réparti sur les workers"""
+    # Warmup : un petit batch par worker
+    pool.map(predict_task, [(chunks[:batch_size], batch_size)] * workers, chunksize=1)
+
+    shards = [(chunks[i::workers], batch_size) for i in range(workers)]
+    start = time.perf_counter()
+    pool.map(predict_task, shards, chunksize=1)
+    return len(chunks) / (time.perf_counter() - start)
+
+
+def default_grid(cpu_count):
+    """Puissances de 2 jusqu'au nombre de coeurs"""
+    values = []
+    n = 1
+    while n <= cpu_count:
+        values.append(n)
+        n *= 2
+    return values
+
+
+def run_tuning(model_path, chunks, threads_grid, workers_grid, batch_sizes, backend=DEFAULT_BACKEND):
+    """
+    Benchmark de toutes les configurations threads x workers x batch (sans sur-souscription)
+    Returns: liste de dicts (threads, workers, batch_size, rate)
+    """
+    cpu_count = os.cpu_count() or 1
+    ctx = multiprocessing.get_context('spawn')
+
+    if backend == 'onnx':
+        ensure_onnx_model(model_path)
+
+    print(f"{'Workers':>8} {'Threads':>8} {'Batch':>6} {'Chunks/s':>10}")
+    print("-" * 36)
+
+    results = []
+    for workers in workers_grid:
+        for threads in threads_grid:
+            if workers * threads > cpu_count:
+                continue
+
+            # Un pool (chargement du modèle) par couple workers x threads
+            with ctx.Pool(workers, initializer=init_tune_worker,
+                          initargs=(model_path, backend, threads)) as pool:
+                for batch_size in batch_sizes:
+                    rate = measure(pool, workers, chunks, batch_size)
+                    results.append({'threads': threads, 'workers': workers,
+                                    'batch_size': batch_size, 'rate': rate})
+                    print(f"{workers:>8} {threads:>8} {batch_size:>6} {rate:>10.2f}")
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='run_ner_pipeline.py tune',
+        description='Benchmark torch threads x worker processes x batch size on real chunks '
+                    'and save the best configuration as this machine\'s CPU profile',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example usage:
+  python run_ner_pipeline.py tune --chunks 128 --batch-sizes 1,8,16
+  python run_ner_pipeline.py --gold-only      # picks up models/configs/cpu_profile_<host>.json
+        """
+    )
+
+    parser.add_argument('--model', type=Path, default=Path(DEFAULT_MODEL_PATH),
+                        help='Path to GLiNER model')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR,
+                        help='Path to data directory containing OCR results')
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help='Inference backend to tune')
+    parser.add_argument('--chunks', type=int, default=128,
+                        help='Number of corpus chunks in the benchmark sample')
+    parser.add_argument('--threads', type=str,
+                        help='Comma-separated torch thread counts (default: powers of 2 up to the CPU count)')
+    parser.add_argument('--workers', type=str,
+                        help='Comma-separated worker counts (default: powers of 2 up to the CPU count)')
+    parser.add_argument('--batch-sizes', type=str, default='1,8,16',
+                        help='Comma-separated batch sizes')
+    parser.add_argument('--output', type=Path, default=None,
+                        help='Profile file (default: models/configs/cpu_profile_<host>.json)')
+
+    args = parser.parse_args(argv)
+
+    if not args.model.exists():
+        print(f"Error: Model not found: {args.model}")
+        sys.exit(1)
+
+    chunks = collect_chunks(args.data_dir, args.chunks)
+    if not chunks:
+        print(f"Error: No chunks found in: {args.data_dir}")
+        sys.exit(1)
+
+    cpu_count = os.cpu_count() or 1
+    threads_grid = [int(t) for t in args.threads.split(',')] if args.threads else default_grid(cpu_count)
+    workers_grid = [int(w) for w in args.workers.split(',')] if args.workers else default_grid(cpu_count)
+    batch_sizes = [int(b) for b in args.batch_sizes.split(',')]
+
+    print(f"Tuning on {len(chunks)} chunks, {cpu_count} CPUs, {args.backend} backend\n")
+    results = run_tuning(args.model, chunks, threads_grid, workers_grid, batch_sizes, args.backend)
+
+    if not results:
+        print("Error: No configuration fits the CPU count")
+        sys.exit(1)
+
+    best = max(results, key=lambda r: r['rate'])
+    path = save_profile(best, args.model, args.backend, len(chunks), args.output)
+
+    print("-" * 36)
+    print(f"Best: {best['workers']} workers x {best['threads']} threads, batch size {best['batch_size']} "
+          f"({best['rate']:.2f} chunks/s)")
+    print(f"CPU profile saved: {path}")
+
+
+if __name__ == '__main__':
+    main()
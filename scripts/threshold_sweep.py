@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Balayage des seuils de score par label (MIN_SCORE_PERSON/ORG/LOC)
+Réutilise les prédictions brutes d'un run (scores >= seuil d'inférence) : aucune ré-inférence.
+Après déduplication, une entité (Folder, Document, Type, texte normalisé) est prédite au seuil t
+si son meilleur score est >= t : précision et rappel se calculent pour toute la grille
+avec NumPy sur les tableaux de scores.
+Author: Claude Code
+Date: 2025-11-16
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from collections import defaultdict
+import numpy as np
+
+from evaluate_ner import GoldStandardLoader, NERAnnotation, TYPE_MAPPING
+from results_dataset import read_results
+
+
+# Grille par défaut : de 0.35 (seuil d'inférence) à 0.95
+DEFAULT_GRID = np.round(np.arange(0.35, 0.951, 0.05), 2)
+
+
+def parse_grid(spec):
+    """Parse 'start:stop:step' ou une liste '0.5,0.6,0.7'"""
+    if ':' in spec:
+        start, stop, step = (float(x) for x in spec.split(':'))
+        return np.round(np.arange(start, stop + step / 2, step), 4)
+    return np.array(sorted(float(x) for x in spec.split(',')))
+
+
+def normalize_document(document):
+    """'R1048-13C-23516-23516_doc01' -> 'doc01' (même règle que evaluate_ner)"""
+    if '_doc' in document:
+        return 'doc' + document.split('_doc')[1]
+    return document
+
+
+def build_candidates(results, gold_annotations):
+    """
+    Regroupe les prédictions brutes par entité dédupliquée, sur les dossiers du gold standard
+    Returns: dict type gold -> (scores max, appartenance au gold, nb d'entités gold)
+    """
+    gold_keys = defaultdict(set)
+    for annotations in gold_annotations.values():
+        for ann in annotations:
+            gold_keys[ann.entity_type].add(
+                (ann.folder, ann.document, NERAnnotation.normalize(ann.entity_text))
+            )
+
+    best = defaultdict(dict)
+    for result in results:
+        folder = str(result['Folder'])
+        entity_type = TYPE_MAPPING.get(result['Type'])
+        if folder not in gold_annotations or entity_type is None:
+            continue
+
+        key = (folder, normalize_document(str(result['Document'])),
+               NERAnnotation.normalize(str(result['Entity'])))
+        score = result['Score']
+        if score > best[entity_type].get(key, -1.0):
+            best[entity_type][key] = score
+
+    candidates = {}
+    for entity_type in ['PERSON', 'ORGANIZATION', 'LOCATION']:
+        keys = list(best[entity_type])
+        scores = np.array([best[entity_type][k] for k in keys], dtype=float)
+        is_gold = np.array([k in gold_keys[entity_type] for k in keys], dtype=bool)
+        candidates[entity_type] = (scores, is_gold, len(gold_keys[entity_type]))
+
+    return candidates
+
+
+def sweep(scores, is_gold, n_gold, thresholds):
+    """
+    Précision / rappel / F1 pour chaque seuil de la grille (vectorisé)
+    Returns: dict de tableaux alignés sur thresholds
+    """
+    gold_scores = np.sort(scores[is_gold])
+    other_scores = np.sort(scores[~is_gold])
+
+    # Nombre de scores >= t pour chaque t
+    tp = len(gold_scores) - np.searchsorted(gold_scores, thresholds, side='left')
+    fp = len(other_scores) - np.searchsorted(other_scores, thresholds, side='left')
+    fn = n_gold - tp
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(n_gold > 0, tp / max(n_gold, 1), 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+    return {'threshold': thresholds, 'precision': precision, 'recall': recall, 'f1': f1,
+            'tp': tp, 'fp': fp, 'fn': fn}
+
+
+def pareto_front(precision, recall):
+    """Indices des seuils non dominés en (précision, rappel)"""
+    p_ge = precision[None, :] >= precision[:, None]
+    r_ge = recall[None, :] >= recall[:, None]
+    strict = (precision[None, :] > precision[:, None]) | (recall[None, :] > recall[:, None])
+    dominated = (p_ge & r_ge & strict).any(axis=1)
+    return np.flatnonzero(~dominated)
+
+
+def print_sweep(entity_type, metrics, current=None):
+    """Affiche le front de Pareto d'un label"""
+    front = pareto_front(metrics['precision'], metrics['recall'])
+    best = int(np.argmax(metrics['f1']))
+
+    print("\n" + "=" * 80)
+    print(f"{entity_type} - Pareto front (precision vs recall)")
+    print("=" * 80)
+    print(f"{'Threshold':>10} {'Precision':>10} {'Recall':>10} {'F1':>10} {'TP':>6} {'FP':>6} {'FN':>6}")
+    print("-" * 80)
+
+    for i in front[np.argsort(metrics['threshold'][front])]:
+        marks = []
+        if i == best:
+            marks.append("best F1")
+        if current is not None and np.isclose(metrics['threshold'][i], current):
+            marks.append("current")
+        print(f"{metrics['threshold'][i]:>10.2f} {metrics['precision'][i]:>10.3f} {metrics['recall'][i]:>10.3f} "
+              f"{metrics['f1'][i]:>10.3f} {metrics['tp'][i]:>6} {metrics['fp'][i]:>6} {metrics['fn'][i]:>6}"
+              f"  {', '.join(marks)}")
+
+
+def run_sweep(results, gold_standard_path, thresholds=DEFAULT_GRID, current=None):
+    """
+    Balaye la grille de seuils pour chaque label
+    results: prédictions brutes (liste de dicts) ; current: seuils actuels par type gold
+    Returns: dict type gold -> métriques par seuil
+    """
+    gold_annotations = GoldStandardLoader.load(gold_standard_path)
+    candidates = build_candidates(results, gold_annotations)
+
+    all_metrics = {}
+    for entity_type, (scores, is_gold, n_gold) in candidates.items():
+        metrics = sweep(scores, is_gold, n_gold, np.asarray(thresholds, dtype=float))
+        all_metrics[entity_type] = metrics
+        print_sweep(entity_type, metrics, (current or {}).get(entity_type))
+
+    return all_metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Sweep per-label score thresholds on stored raw predictions',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example usage:
+  python threshold_sweep.py \\
+    --results outputs/ner_results_20251116_151224.jsonl \\
+    --grid 0.35:0.95:0.05
+        """
+    )
+
+    parser.add_argument('--results', type=Path, required=True,
+                        help='Raw predictions dataset written by run_ner_pipeline.py (JSONL or Parquet)')
+    parser.add_argument('--gold', type=Path, default=Path('data/gold_standard_annotations.txt'),
+                        help='Path to gold standard annotations file')
+    parser.add_argument('--grid', type=str, default=None,
+                        help="Threshold grid, 'start:stop:step' or comma-separated values")
+
+    args = parser.parse_args()
+
+    if not args.results.exists():
+        print(f"Error: Results dataset not found: {args.results}")
+        sys.exit(1)
+
+    if not args.gold.exists():
+        print(f"Error: Gold standard file not found: {args.gold}")
+        sys.exit(1)
+
+    thresholds = parse_grid(args.grid) if args.grid else DEFAULT_GRID
+    run_sweep(read_results(args.results), args.gold, thresholds)
+
+
+if __name__ == '__main__':
+    main()
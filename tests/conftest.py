@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Fixtures partagées : petit corpus synthétique (synthetic_corpus) et run du pipeline avec le
+modèle factice déterministe, sans modèle GLiNER ni corpus privé
+"""
+
+import sys
+import shutil
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from synthetic_corpus import StubModel, generate_corpus
+from run_ner_pipeline import make_token_chunker, process_folder
+
+
+# Chunks courts : plusieurs chunks (et overlaps) par document
+MAX_TOKENS = 60
+
+
+@pytest.fixture(scope='session')
+def synthetic(tmp_path_factory):
+    """(dossier des documents, {type: entités}) d'un corpus de 67 documents en 4 dossiers"""
+    return generate_corpus(tmp_path_factory.mktemp('synthetic'), scale=0.1)
+
+
+@pytest.fixture
+def corpus(synthetic, tmp_path):
+    """Copie modifiable des documents du corpus synthétique"""
+    return Path(shutil.copytree(synthetic[0], tmp_path / "ocr_results"))
+
+
+@pytest.fixture(scope='session')
+def chunker():
+    return make_token_chunker(StubModel(), max_tokens=MAX_TOKENS)
+
+
+@pytest.fixture
+def run_folders(chunker):
+    """
+    Run mono-processus du pipeline (StubModel, chunker tokens, batchs par dossier)
+    Returns: fonction (dossiers, documents=None, on_document=None) -> [(dossier, résultats)]
+    """
+    def run(folders, documents=None, on_document=None):
+        model = StubModel()
+        return [(folder_path.name, process_folder(folder_path, model, False, 4, chunker,
+                                                  documents=documents, on_document=on_document))
+                for folder_path in sorted(folders)]
+
+    return run
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests du dédoublonnage des chunks (scripts/chunk_dedup.py)
+"""
+
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from chunk_dedup import DedupModel, normalize_chunk, normalize_with_offsets
+
+
+class NameModel:
+    """Modèle factice : une mention 'person' par nom propre connu, appels comptés"""
+
+    NAMES = re.compile(r"(?:Jean|Ren\S*)\s+Dupont|Pierre\s+Martin")
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict_entities(self, text, labels, threshold=0.5):
+        self.calls += 1
+        return [{'start': m.start(), 'end': m.end(), 'text': m.group(), 'label': 'person', 'score': 0.9}
+                for m in self.NAMES.finditer(text)]
+
+    def batch_predict_entities(self, texts, labels, threshold=0.5):
+        return [self.predict_entities(text, labels, threshold) for text in texts]
+
+
+HEADER = "Département politique fédéral, Berne. Le chef de division Jean Dupont au Conseil fédéral."
+
+
+def test_normalize_with_offsets_matches_normalize_chunk():
+    text = "  Le\u00a0chef\n\nde  divi\ufb01on e\u0301te\u00a0 "
+    normalized, starts, ends = normalize_with_offsets(text)
+    assert normalized == ' '.join(unicodedata.normalize('NFKC', text).split())
+    assert normalized == normalize_chunk(text)
+    assert len(starts) == len(ends) == len(normalized)
+
+
+def test_exact_copy_with_other_whitespace_keeps_mentions():
+    model = NameModel()
+    dedup = DedupModel(model)
+    copy = HEADER.replace("Jean Dupont", "Jean\n  Dupont").replace(" Berne", "\u00a0Berne")
+
+    first, second = dedup.batch_predict_entities([HEADER, copy], ['person'])
+    assert model.calls == 1 and dedup.exact == 1
+    assert [e['text'] for e in first] == ["Jean Dupont"]
+    assert [(copy[e['start']:e['end']], e['text']) for e in second] == [("Jean\n  Dupont", "Jean\n  Dupont")]
+
+
+def test_unicode_variant_copy_keeps_mentions():
+    model = NameModel()
+    dedup = DedupModel(model)
+    composed = HEADER.replace("Jean", "Ren\u00e9")
+    decomposed = composed.replace("\u00e9", "e\u0301")
+
+    dedup.predict_entities(composed, ['person'])
+    entities = dedup.predict_entities(decomposed, ['person'])
+    assert model.calls == 1
+    assert [decomposed[e['start']:e['end']] for e in entities] == ["Rene\u0301 Dupont"]
+
+
+def test_near_duplicate_missing_mention_runs_the_model():
+    model = NameModel()
+    dedup = DedupModel(model, threshold=0.5)
+    words = ("Département politique fédéral à Berne, rapport mensuel de la division des affaires "
+             "étrangères sur les réfugiés et les transferts de fonds vers la Suisse").split()
+    representative = ' '.join(words) + " signé Jean Dupont."
+    near = ' '.join(words) + " signé Pierre Martin."
+
+    dedup.predict_entities(representative, ['person'])
+    entities = dedup.predict_entities(near, ['person'])
+    assert model.calls == 2 and dedup.near == 0
+    assert [e['text'] for e in entities] == ["Pierre Martin"]
+
+
+def test_near_duplicate_with_its_own_entity_runs_the_model():
+    model = NameModel()
+    dedup = DedupModel(model, threshold=0.5)
+    words = ("Département politique fédéral à Berne, rapport mensuel de la division des affaires "
+             "étrangères sur les réfugiés et les transferts de fonds vers la Suisse").split()
+    representative = ' '.join(words) + " signé par le chef."
+    near = ' '.join(words) + " signé Pierre Martin."
+
+    assert dedup.predict_entities(representative, ['person']) == []
+    entities = dedup.predict_entities(near, ['person'])
+    assert model.calls == 2 and dedup.near == 0
+    assert [e['text'] for e in entities] == ["Pierre Martin"]
+
+
+def test_near_duplicate_reuses_mentions():
+    model = NameModel()
+    dedup = DedupModel(model, threshold=0.5)
+    words = ("Département politique fédéral à Berne, rapport mensuel de la division des affaires "
+             "étrangères sur les réfugiés et les transferts de fonds vers la Suisse").split()
+    representative = ' '.join(words) + " signé Jean Dupont."
+    # Variante OCR : un mot en minuscules en plus, mêmes mots capitalisés
+    near = ' '.join(words) + " copie signée Jean Dupont."
+
+    dedup.predict_entities(representative, ['person'])
+    entities = dedup.predict_entities(near, ['person'])
+    assert model.calls == 1 and dedup.near == 1
+    assert [near[e['start']:e['end']] for e in entities] == ["Jean Dupont"]
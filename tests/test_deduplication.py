@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests de la déduplication par blocs (deduplicate_dataset) contre la version en mémoire
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from benchmark_dedup import synthetic_results
+from results_dataset import ResultsWriter, read_results
+from run_ner_pipeline import deduplicate_dataset, deduplicate_results, filter_results
+
+
+@pytest.fixture(params=['jsonl', 'parquet'])
+def dataset(request, tmp_path):
+    """Dataset de 2000 prédictions brutes (lots de 300 lignes), répétitions et égalités de score"""
+    path = tmp_path / f"ner_results.{request.param}"
+    with ResultsWriter(path, request.param) as writer:
+        for chunk in synthetic_results(2000, seed=3, chunk_rows=300):
+            # Scores arrondis : beaucoup d'égalités, départagées par l'ordre d'apparition
+            writer.write([dict(result, Score=round(result['Score'], 2)) for result in chunk])
+    return path
+
+
+@pytest.mark.parametrize('chunk_rows', [2, 7, 299, 300, 1000, 10 ** 6])
+def test_deduplicate_dataset_matches_in_memory(dataset, chunk_rows):
+    expected = deduplicate_results(filter_results(read_results(dataset)))
+    assert deduplicate_dataset(dataset, chunk_rows=chunk_rows) == expected
+
+
+def test_deduplicate_dataset_with_custom_thresholds(dataset):
+    min_scores = [0.9, 0.5, 0.7]
+    expected = deduplicate_results(filter_results(read_results(dataset), min_scores))
+    assert deduplicate_dataset(dataset, min_scores, chunk_rows=13) == expected
+
+
+def test_deduplicate_results_keeps_first_best_row():
+    results = [
+        {'Folder': 'F1', 'Document': 'doc1', 'Entity': 'Jean Dupont', 'Type': 'PERSON', 'Score': 0.8},
+        {'Folder': 'F1', 'Document': 'doc1', 'Entity': ' JEAN DUPONT', 'Type': 'PERSON', 'Score': 0.9},
+        {'Folder': 'F1', 'Document': 'doc1', 'Entity': 'jean dupont', 'Type': 'PERSON', 'Score': 0.9},
+        {'Folder': 'F1', 'Document': 'doc2', 'Entity': 'Jean Dupont', 'Type': 'PERSON', 'Score': 0.7},
+    ]
+    assert deduplicate_results(results) == [results[1], results[3]]
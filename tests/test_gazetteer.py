@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests du gazetteer (Aho-Corasick) : positions des mentions dans le texte d'origine
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from gazetteer import Gazetteer, fold_case, load_gazetteer
+from synthetic_corpus import ENTITY_FILES
+
+
+ALIASES = [
+    ("Jean Dupont", 'person'),
+    ("Dupont", 'person'),
+    ("Banque de France", 'organization'),
+    ("Genève", 'location'),
+    ("İzmir", 'location'),
+    ("ONU", 'organization'),
+]
+
+
+def spans(text):
+    entities, _ = Gazetteer(ALIASES).tag(text)
+    return [(e['text'], e['label']) for e in entities]
+
+
+def test_offsets_are_slices_of_original_text():
+    text = "À İzmir, JEAN DUPONT écrit à la banque de France, puis à Genève."
+    entities, _ = Gazetteer(ALIASES).tag(text)
+    assert [(e['start'], e['end']) for e in entities] == [(2, 7), (9, 20), (32, 48), (57, 63)]
+    for entity in entities:
+        assert text[entity['start']:entity['end']] == entity['text']
+
+
+def test_fold_case_keeps_positions():
+    # 'İ'.lower() fait deux caractères : gardé tel quel
+    text = "İzmir ÉCOLE Straße"
+    assert len(fold_case(text)) == len(text)
+    assert fold_case(text) == "İzmir école straße"
+
+
+def test_longest_leftmost_on_word_boundaries():
+    assert spans("Jean Dupont et M. Dupont") == [("Jean Dupont", 'person'), ("Dupont", 'person')]
+    assert spans("Duponts, Dupontel, ONUSIDA") == []
+    assert spans("LaDupont, FONU, MiniGenève") == []
+    # Entièrement en minuscules : pas une entité
+    assert spans("la banque de france") == []
+
+
+def test_coverage_of_capitalized_words():
+    # Mots-outils capitalisés (début de phrase) ignorés
+    assert Gazetteer(ALIASES).tag("Le banquier Jean Dupont écrit. Dans Genève, rien.")[1]
+    assert not Gazetteer(ALIASES).tag("Le banquier Jean Dupont écrit à Pierre Martin.")[1]
+
+
+def test_curated_lists_of_synthetic_corpus(synthetic):
+    corpus_dir = synthetic[0]
+    root = corpus_dir.parents[2]
+    gazetteer = load_gazetteer({label: root / ENTITY_FILES[entity_type]
+                                for label, entity_type in (('person', 'PERSON'),
+                                                           ('organization', 'ORGANIZATION'),
+                                                           ('location', 'GPE'))})
+    assert gazetteer.size > 0
+
+    mentions = 0
+    for md_file in sorted(corpus_dir.glob("*/*.md")):
+        text = md_file.read_text(encoding='utf-8')
+        for entity in gazetteer.tag(text)[0]:
+            assert text[entity['start']:entity['end']] == entity['text']
+            mentions += 1
+    assert mentions > 0
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests du mode incrémental : un run qui ne retraite que les documents modifiés produit
+les mêmes résultats qu'un run complet
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from incremental import IncrementalState
+
+
+def incremental_run(state_dir, fingerprint, folders, run_folders, full_scope=True):
+    """Run incrémental complet (plan, traitement, fusion, commit) ; Returns: (plan, résultats)"""
+    state = IncrementalState(state_dir, fingerprint)
+    plan = state.plan(folders, full_scope)
+    documents = plan.to_process
+    folder_results = run_folders(sorted({md_file.parent for md_file in documents}), documents)
+    merged = list(state.merge(folder_results, plan))
+    state.commit(plan)
+    return plan, merged
+
+
+def test_unchanged_corpus_reuses_everything(corpus, run_folders, tmp_path):
+    folders = sorted(corpus.iterdir())
+    plan, first = incremental_run(tmp_path / "state", 'abc', folders, run_folders)
+    assert (plan.new, len(plan.changed)) == (67, 67)
+    assert first == run_folders(folders)
+
+    plan, second = incremental_run(tmp_path / "state", 'abc', folders, run_folders)
+    assert (plan.new, len(plan.changed), plan.deleted) == (0, 0, [])
+    assert second == first
+
+
+def test_changed_new_and_deleted_documents(corpus, run_folders, tmp_path):
+    folders = sorted(corpus.iterdir())
+    incremental_run(tmp_path / "state", 'abc', folders, run_folders)
+
+    md_files = sorted(corpus.glob("*/*.md"))
+    md_files[3].write_text(md_files[3].read_text(encoding='utf-8') + "\nPost-scriptum de Marie Curie.",
+                           encoding='utf-8')
+    md_files[10].unlink()
+    new_file = folders[2] / f"{folders[2].name}_doc99.md"
+    new_file.write_text("Lettre de Jean Dupont à Genève.", encoding='utf-8')
+
+    plan, merged = incremental_run(tmp_path / "state", 'abc', folders, run_folders)
+    assert (plan.new, len(plan.changed) - plan.new, len(plan.deleted)) == (1, 1, 1)
+    assert merged == run_folders(folders)
+
+
+def test_new_fingerprint_reprocesses_everything(corpus, run_folders, tmp_path):
+    folders = sorted(corpus.iterdir())
+    incremental_run(tmp_path / "state", 'abc', folders, run_folders)
+
+    plan, merged = incremental_run(tmp_path / "state", 'def', folders, run_folders)
+    assert (plan.new, len(plan.changed)) == (0, 67)
+    assert merged == run_folders(folders)
+
+
+def test_folder_run_keeps_other_folders(corpus, run_folders, tmp_path):
+    folders = sorted(corpus.iterdir())
+    incremental_run(tmp_path / "state", 'abc', folders, run_folders)
+
+    # --folder : seul ce dossier est planifié, l'état garde les autres
+    md_file = sorted(folders[0].glob("*.md"))[0]
+    md_file.write_text("Lettre de Jean Dupont.", encoding='utf-8')
+    plan, merged = incremental_run(tmp_path / "state", 'abc', folders[:1], run_folders, full_scope=False)
+    assert (len(plan.changed), plan.deleted) == (1, [])
+    assert merged == run_folders(folders[:1])
+
+    plan, merged = incremental_run(tmp_path / "state", 'abc', folders, run_folders)
+    assert len(plan.changed) == 0
+    assert merged == run_folders(folders)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests du cache disque partagé entre processus (scripts/inference_cache.py)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import inference_cache
+from inference_cache import InferenceCache
+
+
+def test_hit_survives_concurrent_eviction(tmp_path, monkeypatch):
+    cache = InferenceCache(tmp_path, 'model')
+    key = cache.key("texte", ['person'], 0.35)
+    cache.put(key, [{'text': 'Jean', 'label': 'person'}])
+
+    # Un autre processus évince l'entrée entre la lecture et la mise à jour de la date d'accès
+    def evicted(path):
+        Path(path).unlink()
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(inference_cache.os, 'utime', evicted)
+    assert cache.get(key) == [{'text': 'Jean', 'label': 'person'}]
+    assert cache.get(key) is None
+
+
+def test_evict_skips_entries_already_gone(tmp_path, monkeypatch):
+    cache = InferenceCache(tmp_path, 'model', max_bytes=10_000)
+    for i in range(50):
+        cache.put(cache.key(f"chunk {i}", ['person'], 0.35), [{'text': 'x' * 200}])
+
+    # La moitié des entrées disparaît entre le glob et le stat (éviction d'un autre processus)
+    real_glob = Path.glob
+
+    def racing_glob(self, pattern):
+        for i, path in enumerate(real_glob(self, pattern)):
+            if i % 2:
+                path.unlink()
+            yield path
+
+    monkeypatch.setattr(Path, 'glob', racing_glob)
+    cache.evict()
+    monkeypatch.undo()
+
+    assert cache.total_bytes <= 9_000
+    cache.rescan()
+    assert cache.total_bytes <= 9_000
@@ -5,9 +5,13 @@ Teste sur un échantillon de 5 documents
 """
 
 import re
+import sys
 from pathlib import Path
 import pandas as pd
-from gliner import GLiNER
+
+# Daemon GLiNER local si disponible (scripts/gliner_daemon.py), sinon chargement en local
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from gliner_daemon import load_gliner
 
 
 # Configuration
@@ -163,7 +167,7 @@ def main():
     # Charger le modèle (utiliser le chemin absolu direct)
     model_path_abs = "/home/steeven/PycharmProjects/gliner2Tests/models/checkpoints/gliner_multi-v2.1"
     print(f"\n📦 Chargement du modèle: {model_path_abs}")
-    model = GLiNER.from_pretrained(model_path_abs)
+    model = load_gliner(model_path_abs)
     print("✅ Modèle chargé")
 
     # Sélectionner 5 documents de test
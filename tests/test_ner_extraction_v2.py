@@ -5,10 +5,14 @@ Version 2: Titres diplomatiques, filtrage, déduplication, chunking
 """
 
 import re
+import sys
 from pathlib import Path
 from collections import defaultdict
 import pandas as pd
-from gliner import GLiNER
+
+# Daemon GLiNER local si disponible (scripts/gliner_daemon.py), sinon chargement en local
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from gliner_daemon import load_gliner
 
 
 # Configuration
@@ -445,7 +449,7 @@ def main():
     # Charger le modèle
     model_path = "/home/steeven/PycharmProjects/gliner2Tests/models/checkpoints/gliner_multi-v2.1"
     print(f"\n📦 Chargement du modèle GLiNER2...")
-    model = GLiNER.from_pretrained(model_path)
+    model = load_gliner(model_path)
     print("✅ Modèle chargé")
 
     # Sélectionner documents de test
@@ -5,9 +5,13 @@ Garde TOUTES les mentions dans CHAQUE document
 """
 
 import re
+import sys
 from pathlib import Path
 import pandas as pd
-from gliner import GLiNER
+
+# Daemon GLiNER local si disponible (scripts/gliner_daemon.py), sinon chargement en local
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from gliner_daemon import load_gliner
 
 
 # Configuration
@@ -138,7 +142,7 @@ def main():
     # Charger le modèle
     model_path = "/home/steeven/PycharmProjects/gliner2Tests/models/checkpoints/gliner_multi-v2.1"
     print(f"\n📦 Chargement du modèle...")
-    model = GLiNER.from_pretrained(model_path)
+    model = load_gliner(model_path)
     print("✅ Modèle chargé")
 
     # Documents de test - NOUVEAU DOSSIER
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests du journal par document (--journal / --resume)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from incremental import document_key, merge_documents, scan_documents
+from run_journal import RunJournal, journal_path, journal_timestamp, latest_journal
+
+
+class Crash(Exception):
+    pass
+
+
+def crashing_journal(journal, after):
+    """Hook on_document qui journalise puis interrompt le run après `after` documents"""
+    def on_document(folder_name, document, results):
+        journal.record(folder_name, document, results)
+        if len(journal.path.read_text(encoding='utf-8').splitlines()) > after:
+            raise Crash()
+    return on_document
+
+
+def test_torn_last_line_is_ignored_then_cut(tmp_path):
+    journal = RunJournal(tmp_path / "ner_journal_20251116_151224.jsonl", 'abc').open()
+    journal.record('F1', 'doc1', [{'Entity': 'Jean Dupont'}])
+    journal.record('F1', 'doc2', [])
+    journal.close()
+    valid_size = journal.path.stat().st_size
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"folder": "F1", "document": "doc3", "resu')
+
+    reloaded = RunJournal(journal.path, 'abc')
+    assert reloaded.load() == {'F1/doc1.md': [{'Entity': 'Jean Dupont'}], 'F1/doc2.md': []}
+    assert journal.path.stat().st_size == valid_size
+
+    # La reprise continue le même journal
+    reloaded.open().record('F1', 'doc3', [])
+    reloaded.close()
+    assert set(RunJournal(journal.path, 'abc').load()) == {'F1/doc1.md', 'F1/doc2.md', 'F1/doc3.md'}
+
+
+def test_journal_of_another_config_is_refused(tmp_path):
+    RunJournal(tmp_path / "ner_journal_x.jsonl", 'abc').open().close()
+    with pytest.raises(ValueError, match="another model/config"):
+        RunJournal(tmp_path / "ner_journal_x.jsonl", 'def').load()
+
+
+def test_latest_journal_per_shard(tmp_path):
+    for stamp in ("20251116_151224", "20251116_151224_2", "20251116_160000_shard1of2", "20251116_090000"):
+        journal_path(tmp_path, stamp).touch()
+
+    assert latest_journal(tmp_path) == journal_path(tmp_path, "20251116_151224_2")
+    assert latest_journal(tmp_path, "_shard1of2") == journal_path(tmp_path, "20251116_160000_shard1of2")
+    assert latest_journal(tmp_path, "_shard2of2") is None
+    assert journal_timestamp(latest_journal(tmp_path)) == "20251116_151224_2"
+    assert journal_timestamp(tmp_path / "my_journal.jsonl") is None
+
+
+@pytest.mark.parametrize('crash_after', [1, 20, 40])
+def test_resume_gives_same_results_as_full_run(corpus, run_folders, tmp_path, crash_after):
+    folders = sorted(corpus.iterdir())
+    full = run_folders(folders)
+
+    journal = RunJournal(journal_path(tmp_path, "20251116_151224"), 'abc').open()
+    with pytest.raises(Crash):
+        run_folders(folders, on_document=crashing_journal(journal, crash_after))
+    journal.close()
+
+    # Reprise : seuls les documents absents du journal repassent dans le modèle
+    journal = RunJournal(latest_journal(tmp_path), 'abc')
+    journaled = journal.load()
+    assert len(journaled) == crash_after
+
+    resumed = scan_documents(folders)
+    processed_keys = set(resumed) - set(journaled)
+    documents = {resumed[key] for key in processed_keys}
+    process_folders = sorted({md_file.parent for md_file in documents})
+
+    processed = []
+    folder_results = run_folders(process_folders, documents,
+                                 on_document=lambda folder, doc, results: processed.append(
+                                     document_key(folder, doc)))
+    assert sorted(processed) == sorted(processed_keys)
+
+    assert list(merge_documents(folder_results, resumed, processed_keys, journaled)) == full
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests du post-traitement des prédictions (scripts/run_ner_pipeline.py)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from gazetteer import gazetteer_fingerprint
+from run_ner_pipeline import DocumentStore, batching_mode, build_results, filter_results
+
+
+TEXT = "Jean Dupont, Banque de France"
+
+
+def build(chunk_predictions, offsets):
+    store = DocumentStore()
+    doc_id = store.add('F1', 'doc1', TEXT, None, offsets)
+    return build_results(chunk_predictions, store, doc_id, offsets)
+
+
+def test_overlap_of_other_label_does_not_hide_span():
+    # PERSON 0-10 (0.62 >= MIN_SCORE_PERSON) chevauché par ORGANIZATION 5-12 (0.68 < MIN_SCORE_ORG)
+    predictions = [[{'start': 0, 'end': 10, 'label': 'person', 'score': 0.62},
+                    {'start': 5, 'end': 12, 'label': 'organization', 'score': 0.68}]]
+    results = filter_results(build(predictions, [0]))
+    assert [(r['Type'], r['Start'], r['End'], r['Score']) for r in results] == [('PERSON', 0, 10, 0.62)]
+
+
+def test_overlap_duplicates_of_same_label_are_merged():
+    # Même mention prédite dans deux chunks qui se recouvrent (le second commence au caractère 5) :
+    # le span tronqué "Dupont", mieux noté, ne remplace pas "Jean Dupont"
+    predictions = [[{'start': 0, 'end': 11, 'label': 'person', 'score': 0.81}],
+                   [{'start': 0, 'end': 6, 'label': 'person', 'score': 0.90}]]
+    results = filter_results(build(predictions, [0, 5]))
+    assert [(r['Entity'], r['Start'], r['End'], r['Score']) for r in results] == [
+        ("Jean Dupont", 0, 11, 0.9)]
+
+
+def test_overlapping_spans_are_merged_into_their_union():
+    # "Jean Dupont" (0-11), "Dupont" contenu (5-11), puis "Dupont, Banque" qui déborde (5-19)
+    predictions = [[{'start': 0, 'end': 11, 'label': 'person', 'score': 0.7},
+                    {'start': 5, 'end': 11, 'label': 'person', 'score': 0.9},
+                    {'start': 5, 'end': 19, 'label': 'person', 'score': 0.6},
+                    {'start': 21, 'end': 29, 'label': 'person', 'score': 0.8}]]
+    results = filter_results(build(predictions, [0]))
+    assert [(r['Start'], r['End'], r['Score']) for r in results] == [(0, 19, 0.9), (21, 29, 0.8)]
+
+
+def test_batching_mode_follows_how_chunks_are_grouped():
+    assert batching_mode(1, 8) == 'folder'
+    assert batching_mode(4, 8) == 'document'
+    assert batching_mode(1, 8, [256, 64]) == 'buckets:64,256'
+    assert batching_mode(4, 1) == batching_mode(1, 1) == 'chunk'
+
+
+def test_gazetteer_fingerprint_changes_with_file_contents(tmp_path):
+    files = {'person': tmp_path / "person.xlsx", 'organization': tmp_path / "org.xlsx"}
+    files['person'].write_bytes(b"v1")
+    before = gazetteer_fingerprint(files)
+    assert gazetteer_fingerprint(files) == before
+
+    files['person'].write_bytes(b"v2")
+    assert gazetteer_fingerprint(files) != before
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests des runs répartis (--shard) : la fusion des shards redonne le dataset d'un run complet
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from excel_writer import xlsxwriter
+from results_dataset import ResultsWriter, read_results, dataset_path
+from run_ner_pipeline import build_reports
+from sharding import folder_shard, merge_datasets, missing_shards, select_shard, shard_suffix
+
+
+def write_dataset(path, folder_results, fmt):
+    with ResultsWriter(path, fmt) as writer:
+        for _, results in folder_results:
+            writer.write(results)
+    return path
+
+
+def test_shards_partition_folders(corpus):
+    folders = sorted(corpus.iterdir())
+    for count in (1, 2, 3, 7):
+        shards = [select_shard(folders, index, count) for index in range(1, count + 1)]
+        assert sorted(folder for shard in shards for folder in shard) == folders
+        for index, shard in enumerate(shards, 1):
+            assert all(folder_shard(folder.name, count) == index for folder in shard)
+
+
+@pytest.mark.parametrize('fmt', ['jsonl', 'parquet'])
+def test_merge_is_identical_to_single_node_run(corpus, run_folders, tmp_path, fmt):
+    folders = sorted(corpus.iterdir())
+    full = write_dataset(tmp_path / f"full.{fmt}", run_folders(folders), fmt)
+
+    count = 3
+    paths = []
+    for index in range(1, count + 1):
+        name = f"ner_results_20251116_151224{shard_suffix(index, count)}"
+        paths.append(write_dataset(dataset_path(tmp_path, name, fmt),
+                                   run_folders(select_shard(folders, index, count)), fmt))
+    assert missing_shards(paths) == []
+
+    # Ordre des datasets sur la ligne de commande sans effet
+    timestamp, writer = merge_datasets(paths[::-1], tmp_path / "merged", "20251116_160000", fmt)
+    assert timestamp == "20251116_160000"
+
+    if fmt == 'jsonl':
+        assert writer.path.read_bytes() == full.read_bytes()
+    else:
+        assert read_results(writer.path) == read_results(full)
+    assert writer.batches == len(folders)
+
+
+@pytest.mark.skipif(xlsxwriter is None, reason="xlsxwriter not installed")
+def test_merged_excel_report_is_identical(corpus, run_folders, tmp_path):
+    folders = sorted(corpus.iterdir())
+    full = write_dataset(tmp_path / "full.jsonl", run_folders(folders), 'jsonl')
+    paths = [write_dataset(tmp_path / f"ner_results_x{shard_suffix(index, 2)}.jsonl",
+                           run_folders(select_shard(folders, index, 2)), 'jsonl')
+             for index in (1, 2)]
+    _, writer = merge_datasets(paths, tmp_path / "merged", "20251116_160000")
+
+    reports = []
+    for path in (full, writer.path):
+        reports.append(path.with_suffix(".xlsx"))
+        build_reports(path, reports[-1], verbose=False, engine='xlsxwriter')
+    assert reports[0].read_bytes() == reports[1].read_bytes()
+
+
+def test_merge_takes_next_free_name(corpus, run_folders, tmp_path):
+    path = write_dataset(tmp_path / "ner_results_x_shard1of1.jsonl", run_folders(sorted(corpus.iterdir())),
+                         'jsonl')
+    first, _ = merge_datasets([path], tmp_path, "20251116_160000")
+    second, writer = merge_datasets([path], tmp_path, "20251116_160000")
+
+    assert (first, second) == ("20251116_160000", "20251116_160000_2")
+    assert writer.path.read_bytes() == path.read_bytes()
+
+
+def test_merge_rejects_folder_in_several_datasets(corpus, run_folders, tmp_path):
+    folder_results = run_folders(sorted(corpus.iterdir())[:1])
+    paths = [write_dataset(tmp_path / f"ner_results_x_shard{i}of2.jsonl", folder_results, 'jsonl')
+             for i in (1, 2)]
+
+    with pytest.raises(ValueError, match="appears in several datasets"):
+        merge_datasets(paths, tmp_path / "merged", "20251116_160000")
+    assert not (tmp_path / "merged").exists()
+
+
+def test_missing_shards_from_names():
+    paths = [Path("ner_results_20251116_151224_shard1of3.jsonl"),
+             Path("ner_results_20251116_151224_2_shard3of3.parquet")]
+    assert missing_shards(paths) == [2]
+    assert missing_shards([Path("ner_results_20251116_151224.jsonl")]) == []
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests du chargement mmap (--mmap-weights) sur un petit GLiNER construit hors ligne :
+le checkpoint n'est pas lu, les paramètres sont des vues sur le fichier safetensors
+"""
+
+import sys
+import string
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from shared_weights import ensure_mmap_weights, load_mmap_model, mmap_weights_path
+
+torch = pytest.importorskip('torch')
+gliner = pytest.importorskip('gliner')
+
+LABELS = ['person', 'organization', 'location']
+TEXT = "Jean Dupont écrit à la Banque de France depuis Genève."
+
+
+@pytest.fixture(scope='module')
+def tiny_gliner(tmp_path_factory):
+    """Checkpoint GLiNER minuscule (encodeur BERT 2 couches, vocabulaire WordPiece caractère)"""
+    from tokenizers import Tokenizer, models, pre_tokenizers, processors
+    from transformers import AutoTokenizer, BertConfig, BertModel, PreTrainedTokenizerFast
+    from gliner import GLiNER, GLiNERConfig
+
+    root = tmp_path_factory.mktemp('gliner')
+    encoder_dir, model_dir = root / "encoder", root / "model"
+
+    tokens = ['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]']
+    tokens += list(string.ascii_letters + string.digits + string.punctuation + "éèàç")
+    tokens += ['##' + c for c in string.ascii_lowercase + "éèàç"]
+    vocab = {token: index for index, token in enumerate(dict.fromkeys(tokens))}
+
+    tokenizer = Tokenizer(models.WordPiece(vocab, unk_token='[UNK]'))
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", pair="[CLS] $A [SEP] $B [SEP]",
+        special_tokens=[("[CLS]", vocab['[CLS]']), ("[SEP]", vocab['[SEP]'])])
+    PreTrainedTokenizerFast(tokenizer_object=tokenizer, unk_token='[UNK]', pad_token='[PAD]',
+                            cls_token='[CLS]', sep_token='[SEP]',
+                            mask_token='[MASK]').save_pretrained(encoder_dir)
+
+    torch.manual_seed(0)
+    BertModel(BertConfig(vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2,
+                         num_attention_heads=2, intermediate_size=64)).save_pretrained(encoder_dir)
+
+    config = GLiNERConfig(model_name=str(encoder_dir), max_width=12, hidden_size=32,
+                          span_mode='markerV0', max_len=384)
+    gliner_class = GLiNER._get_gliner_class(config)
+    model = gliner_class(config, tokenizer=AutoTokenizer.from_pretrained(encoder_dir))
+    gliner_class._resize_token_embeddings(model, model.config, model.data_processor.transformer_tokenizer)
+    model.save_pretrained(model_dir)
+    return model_dir
+
+
+def test_checkpoint_is_not_read(tiny_gliner, monkeypatch):
+    from gliner import GLiNER
+    from gliner.model import BaseGLiNER
+
+    reference = GLiNER.from_pretrained(str(tiny_gliner))
+    # Export safetensors (une fois par checkpoint) : lit le checkpoint, hors du chargement testé
+    ensure_mmap_weights(tiny_gliner)
+
+    # Le chargeur du checkpoint de la classe concrète ne doit plus être appelé
+    def fail(cls, *args, **kwargs):
+        raise AssertionError("checkpoint read instead of the mmap weights")
+    monkeypatch.setattr(BaseGLiNER, '_load_state_dict', classmethod(fail))
+
+    model = load_mmap_model(tiny_gliner)
+    assert isinstance(model, type(reference))
+    assert model.predict_entities(TEXT, LABELS, threshold=0.0) == \
+        reference.predict_entities(TEXT, LABELS, threshold=0.0)
+
+
+def test_parameters_are_views_on_the_mapped_file(tiny_gliner):
+    model = load_mmap_model(tiny_gliner)
+
+    # Un seul stockage pour tous les paramètres : le fichier safetensors entier
+    storages = {(parameter.untyped_storage().data_ptr(), parameter.untyped_storage().nbytes())
+                for parameter in model.model.parameters()}
+    assert [nbytes for _, nbytes in storages] == [mmap_weights_path(tiny_gliner).stat().st_size]
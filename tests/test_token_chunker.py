@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests du chunker aligné sur le tokenizer (token_chunk) et des positions absolues des mentions
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from conftest import MAX_TOKENS
+from synthetic_corpus import StubModel
+from run_ner_pipeline import GLINER_WORD_RE, prepare_document, process_document, token_chunk
+
+
+def count_tokens(text):
+    return len(GLINER_WORD_RE.findall(text))
+
+
+TEXTS = [
+    "Jean Dupont écrit à Genève. La Banque de France répond ! Qui signe ? Marie Curie.",
+    "  Espaces en tête.\n\nPuis un paragraphe.   Et des espaces en fin.  ",
+    # Phrase unique plus longue que max_tokens : redécoupée au niveau des mots
+    " ".join(f"Mot{i}" for i in range(250)),
+    "Une phrase courte. " + "x " * 130 + "Fin du document.",
+    "",
+]
+
+
+@pytest.mark.parametrize('text', TEXTS)
+@pytest.mark.parametrize('max_tokens,overlap', [(8, 3), (40, 10), (384, 50)])
+def test_chunks_are_exact_slices_within_limit(text, max_tokens, overlap):
+    chunks, offsets = token_chunk(text, count_tokens, max_tokens, overlap)
+
+    assert len(chunks) == len(offsets)
+    assert offsets == sorted(offsets)
+    for chunk, offset in zip(chunks, offsets):
+        assert text[offset:offset + len(chunk)] == chunk
+        assert count_tokens(chunk) <= max_tokens
+
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_chunks_cover_every_word(text):
+    chunks, offsets = token_chunk(text, count_tokens, 8, 3)
+    covered = set()
+    for chunk, offset in zip(chunks, offsets):
+        covered.update(range(offset, offset + len(chunk)))
+
+    for m in GLINER_WORD_RE.finditer(text):
+        assert set(range(m.start(), m.end())) <= covered
+
+
+def test_mention_offsets_point_into_clean_text(synthetic, chunker):
+    corpus_dir = synthetic[0]
+    model = StubModel()
+    documents = 0
+    for md_file in sorted(corpus_dir.glob("*/*.md")):
+        text_clean, chunks, offsets = prepare_document(md_file, chunker)
+        assert len(chunks) > 1 or count_tokens(text_clean) <= MAX_TOKENS
+
+        results = process_document(md_file, md_file.parent.name, model, verbose=False, batch_size=4,
+                                   chunker=chunker)
+        for result in results:
+            assert text_clean[result['Start']:result['End']] == result['Entity']
+        documents += bool(results)
+
+    assert documents > 0